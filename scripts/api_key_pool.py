@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Manage the extra API keys WhisperOSS spreads requests across.
+
+Usage:
+  python3 scripts/api_key_pool.py list
+  python3 scripts/api_key_pool.py add gsk_...
+  python3 scripts/api_key_pool.py remove 2
+  python3 scripts/api_key_pool.py --provider gemini add AIza...
+
+The key set in the app's settings is key 1; the keys managed here are
+2, 3, ... They are stored in the OS credential store when available, and the
+app picks them up on its next start. Per-key usage is logged when it quits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.config_manager import ConfigManager  # noqa: E402
+from src.key_pool import mask_key  # noqa: E402
+
+KEY_NAMES = {"groq": "api_key", "gemini": "gemini_api_key"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provider", choices=sorted(KEY_NAMES), default="groq")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show the pooled keys (masked)")
+    add = commands.add_parser("add", help="Add a key to the pool")
+    add.add_argument("key")
+    remove = commands.add_parser("remove", help="Remove key N (2 or higher) from the pool")
+    remove.add_argument("number", type=int)
+    args = parser.parse_args()
+
+    config = ConfigManager()
+    key_name = KEY_NAMES[args.provider]
+    pool = config.get_key_pool(key_name)
+
+    if args.command == "add":
+        if args.key.strip() in pool or args.key.strip() == config.get(key_name):
+            print("That key is already in use.")
+            return 1
+        pool.append(args.key)
+    elif args.command == "remove":
+        if not 2 <= args.number <= len(pool) + 1:
+            print(f"No key {args.number}; the pool has keys 2-{len(pool) + 1}.")
+            return 1
+        del pool[args.number - 2]
+
+    if args.command != "list":
+        config.set_key_pool(key_name, pool)
+        config.save()
+
+    primary = config.get(key_name)
+    print(f"1: {mask_key(primary) if primary else '(not set)'} (settings)")
+    for number, key in enumerate(pool, start=2):
+        print(f"{number}: {mask_key(key)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
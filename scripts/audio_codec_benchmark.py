@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare upload codecs: encode time vs bytes saved vs upload time.
+
+Usage:
+  python3 scripts/audio_codec_benchmark.py
+  python3 scripts/audio_codec_benchmark.py --wav recording.wav --rate 16000
+  python3 scripts/audio_codec_benchmark.py --seconds 60 --links 1,5,20,100
+
+Without --wav a speech-like synthetic signal (voiced harmonics with syllable
+envelopes and pauses over a noise floor) is used. Upload time is estimated as
+bytes / link speed, so it ignores latency and TLS setup; it is the part of the
+round trip the codec can actually change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import wave
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.audio_encoding import available_codecs, create_encoder  # noqa: E402
+from src.audio_resample import StreamingResampler  # noqa: E402
+
+
+def _synthetic_speech(seconds: float, rate: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate)
+    t = np.arange(n) / rate
+    pitch = 140.0 + 30.0 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None) ** 2
+    pauses = (np.sin(2 * np.pi * 0.25 * t) > -0.6).astype(np.float64)
+    signal = voiced * syllables * pauses * 6000.0 + rng.normal(0, 60.0, n)
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+def _load_wav(path: Path, rate: int) -> np.ndarray:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise SystemExit("Only 16-bit PCM WAV input is supported.")
+        channels = wf.getnchannels()
+        source_rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    samples = samples.reshape(-1, channels)
+    resampler = StreamingResampler(source_rate, rate)
+    return np.concatenate((resampler.process(samples), resampler.flush()))
+
+
+def _parse_links(value: str) -> List[float]:
+    return [float(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wav", type=Path, help="16-bit PCM WAV to encode instead of synthetic audio")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic clip length")
+    parser.add_argument("--rate", type=int, default=16000, help="Upload sample rate")
+    parser.add_argument("--links", type=_parse_links, default=[1.0, 5.0, 20.0, 100.0],
+                        help="Comma-separated uplink speeds in Mbit/s")
+    parser.add_argument("--repeat", type=int, default=5, help="Encode runs per codec (best is kept)")
+    args = parser.parse_args()
+
+    samples = _load_wav(args.wav, args.rate) if args.wav else _synthetic_speech(args.seconds, args.rate)
+    duration = samples.shape[0] / args.rate
+    print(f"clip: {duration:.1f}s @ {args.rate} Hz, codecs available: {', '.join(available_codecs())}")
+
+    header = f"{'codec':<6} {'encode ms':>10} {'bytes':>10} {'vs wav':>7}"
+    header += "".join(f" {f'{mbps:g} Mbps':>10}" for mbps in args.links)
+    print(header)
+
+    wav_bytes = None
+    for codec in available_codecs():
+        best = float("inf")
+        nbytes = 0
+        for _ in range(max(1, args.repeat)):
+            encoder = create_encoder(codec, args.rate, initial_seconds=duration + 1)
+            encoder.write(samples)
+            start = time.perf_counter()
+            audio = encoder.finalize()
+            best = min(best, time.perf_counter() - start)
+            nbytes = audio.nbytes
+        if wav_bytes is None:
+            wav_bytes = nbytes
+        row = f"{codec:<6} {best * 1000:>10.2f} {nbytes:>10d} {nbytes / wav_bytes:>6.0%}"
+        for mbps in args.links:
+            upload_ms = nbytes * 8 / (mbps * 1_000_000) * 1000
+            row += f" {best * 1000 + upload_ms:>8.0f}ms"
+        print(row)
+
+    print("link columns: encode + estimated upload time")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Check the local formatter fast path against the live LLM formatter.
+
+Usage:
+  python3 scripts/formatter_parity.py --api-key gsk_...
+  python3 scripts/formatter_parity.py --api-key gsk_... --update
+
+Every entry in tests/formatter_parity_corpus.json is sent to format_text
+with the Default prompt. For entries the classifier would serve locally, the
+local output is compared with the LLM's, and mismatches are listed. --update
+rewrites each entry's "llm" field with today's LLM output, so the unit test
+keeps checking parity offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.groq_client import GroqClient  # noqa: E402
+from src.local_formatter import format_locally, llm_needed  # noqa: E402
+from src.math_formatting import normalize_math_dictation  # noqa: E402
+from src.prompts import SYSTEM_PROMPT_DEFAULT  # noqa: E402
+
+CORPUS = REPO_ROOT / "tests" / "formatter_parity_corpus.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-key", required=True)
+    parser.add_argument("--model", default="openai/gpt-oss-120b")
+    parser.add_argument("--update", action="store_true", help="Store the LLM outputs in the corpus")
+    args = parser.parse_args()
+
+    client = GroqClient(args.api_key)
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    local_count = matches = 0
+    llm_seconds = 0.0
+    for case in corpus:
+        started = time.perf_counter()
+        llm = normalize_math_dictation(client.format_text(case["raw"], args.model, SYSTEM_PROMPT_DEFAULT)).strip()
+        llm_seconds += time.perf_counter() - started
+        reason = llm_needed(case["raw"])
+        if reason is None:
+            local_count += 1
+            local = format_locally(case["raw"])
+            if local == llm:
+                matches += 1
+            else:
+                print(f"MISMATCH {case['raw']!r}\n  local: {local!r}\n  llm:   {llm!r}")
+        if args.update:
+            case["llm"] = llm
+
+    print(f"served locally: {local_count}/{len(corpus)}, parity {matches}/{local_count}")
+    if corpus:
+        print(f"mean LLM format latency: {llm_seconds / len(corpus) * 1000:.0f} ms "
+              f"(~{llm_seconds / len(corpus) * local_count:.1f}s saved on this corpus)")
+    if args.update:
+        CORPUS.write_text(json.dumps(corpus, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 0 if matches == local_count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Run concurrent simulated dictations and searches against the provider simulator.
+
+Usage:
+  python3 scripts/load_test.py --dictations 50 --searches 10
+  python3 scripts/load_test.py --dictations 50 --rate-429 0.1 --rate-5xx 0.05 --stall-rate 0.02 --stall-seconds 5
+  python3 scripts/load_test.py --dictations 20 --stream-format --json
+
+Starts scripts/provider_simulator.py in-process and points the real Groq and
+Gemini SDK clients at it. Every job is started at once on one PipelineEngine,
+the same way the app runs them. TranscriptionWorker transcribes a synthetic
+recording and formats it, and SearchWorker transcribes and asks Gemini. The
+report gives end-to-end latency percentiles per job type, errors, the request
+policy's retries/hedges, and what the simulator injected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from scripts.provider_simulator import (  # noqa: E402
+    ProviderSimulator,
+    SimulatorProfile,
+    add_profile_arguments,
+    profile_from_args,
+)
+from src.audio_encoding import WavStreamEncoder  # noqa: E402
+from src.gemini_client import GeminiClient  # noqa: E402
+from src.groq_client import GroqClient  # noqa: E402
+from src.http_transport import ConnectionManager  # noqa: E402
+from src.pipeline_engine import PipelineEngine  # noqa: E402
+from src.rate_limiter import RateLimitScheduler  # noqa: E402
+from src.request_policy import RequestPolicy  # noqa: E402
+from src.segmented_transcription import SegmentedTranscriber  # noqa: E402
+from src.services.groq_service import SearchWorker, TranscriptionWorker  # noqa: E402
+
+
+def _recording(seconds: float, seed: int) -> Any:
+    samples = np.random.default_rng(seed).integers(-3000, 3000, int(16000 * seconds)).astype(np.int16)
+    encoder = WavStreamEncoder(16000, initial_seconds=seconds)
+    encoder.write(samples)
+    return encoder.finalize()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load_test(
+    dictations: int = 20,
+    searches: int = 5,
+    profile: Optional[SimulatorProfile] = None,
+    recording_seconds: float = 3.0,
+    stream_format: bool = False,
+    request_timeout_seconds: float = 10.0,
+    max_attempts: int = 3,
+    deadline_seconds: float = 120.0,
+) -> Dict[str, Any]:
+    """Run the jobs to completion (or ``deadline_seconds``) and return a report."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    simulator = ProviderSimulator(profile).start()
+    saved_env = {name: os.environ.get(name) for name in simulator.environment()}
+    os.environ.update(simulator.environment())
+
+    connections = ConnectionManager()
+    engine = PipelineEngine(name="load-test")
+    connections.attach_loop(engine.loop)
+    policy = RequestPolicy(timeout_seconds=request_timeout_seconds, max_attempts=max_attempts)
+    groq = GroqClient("sim-key", connections=connections, policy=policy, scheduler=RateLimitScheduler(max_wait_seconds=2))
+    gemini = GeminiClient("sim-key", connections=connections)
+
+    latencies: Dict[str, List[float]] = {"dictation": [], "search": []}
+    errors: List[str] = []
+    jobs: List[Any] = []
+    total = dictations + searches
+
+    def done(kind: str, started: float, error: Optional[str] = None) -> None:
+        if error is None:
+            latencies[kind].append(time.perf_counter() - started)
+        else:
+            errors.append(f"{kind}: {error}")
+        if len(errors) + sum(len(values) for values in latencies.values()) == total:
+            app.quit()
+
+    def start(worker: Any, kind: str) -> None:
+        started = time.perf_counter()
+        worker.finished.connect(lambda *_: done(kind, started))
+        worker.error.connect(lambda message: done(kind, started, message))
+        jobs.append(worker)
+        worker.start()
+
+    wall_started = time.perf_counter()
+    try:
+        for index in range(dictations):
+            audio = _recording(recording_seconds, seed=index)
+            start(TranscriptionWorker(
+                groq, audio, True, "openai/gpt-oss-120b",
+                transcriber=SegmentedTranscriber(groq), engine=engine, stream_format=stream_format,
+            ), "dictation")
+        for index in range(searches):
+            audio = _recording(recording_seconds, seed=dictations + index)
+            start(SearchWorker(
+                groq, audio, gemini_client=gemini, gemini_model_id="models/gemini-sim",
+                transcriber=SegmentedTranscriber(groq), engine=engine,
+            ), "search")
+        if total:
+            QTimer.singleShot(int(deadline_seconds * 1000), app.quit)
+            app.exec()
+    finally:
+        wall_seconds = time.perf_counter() - wall_started
+        for job in jobs:
+            job.cancel()
+        engine.stop()
+        connections.close()
+        policy.shutdown()
+        simulator.stop()
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    finished = sum(len(values) for values in latencies.values())
+    report: Dict[str, Any] = {
+        "jobs": total,
+        "completed": finished,
+        "errors": errors,
+        "timed_out": total - finished - len(errors),
+        "wall_seconds": round(wall_seconds, 3),
+        "policy": {"attempts": policy.stats.attempts, "retries": policy.stats.retries,
+                   "hedges": policy.stats.hedges},
+        "simulator": dict(simulator.stats),
+    }
+    for kind, values in latencies.items():
+        report[kind] = {
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 0.5) * 1000, 1),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+            "max_ms": round(max(values, default=0.0) * 1000, 1),
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dictations", type=int, default=20)
+    parser.add_argument("--searches", type=int, default=5)
+    parser.add_argument("--recording-seconds", type=float, default=3.0)
+    parser.add_argument("--stream-format", action="store_true", help="Stream the formatter output")
+    parser.add_argument("--request-timeout", type=float, default=10.0)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    report = run_load_test(
+        dictations=args.dictations,
+        searches=args.searches,
+        profile=profile_from_args(args),
+        recording_seconds=args.recording_seconds,
+        stream_format=args.stream_format,
+        request_timeout_seconds=args.request_timeout,
+        max_attempts=args.max_attempts,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['completed']}/{report['jobs']} jobs completed in {report['wall_seconds']:.2f}s, "
+              f"{len(report['errors'])} errors, {report['timed_out']} timed out")
+        for kind in ("dictation", "search"):
+            stats = report[kind]
+            print(f"  {kind:<9} n={stats['count']:<4} p50 {stats['p50_ms']:.0f} ms  "
+                  f"p95 {stats['p95_ms']:.0f} ms  max {stats['max_ms']:.0f} ms")
+        print(f"  policy    {report['policy']}")
+        print(f"  simulator {report['simulator']}")
+        for error in report["errors"][:10]:
+            print(f"  error: {error}")
+    return 0 if not report["errors"] and not report["timed_out"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
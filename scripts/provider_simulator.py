@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Groq and Gemini APIs, with injected latency and faults.
+
+Usage:
+  python3 scripts/provider_simulator.py --port 8046
+  python3 scripts/provider_simulator.py --rate-429 0.1 --stall-rate 0.05 --latency-ms 800
+
+Speaks enough of both APIs for the real SDK clients:
+  Groq    GET  /openai/v1/models
+          POST /openai/v1/audio/transcriptions
+          POST /openai/v1/chat/completions   (JSON, or SSE with "stream": true)
+  Gemini  GET  /v1beta/models
+          POST /v1beta/models/<model>:generateContent
+          POST /v1beta/models/<model>:streamGenerateContent?alt=sse
+
+Point the app or a script at it with GROQ_BASE_URL and GOOGLE_GEMINI_BASE_URL
+(printed on start). Any API key is accepted. Response times are drawn from a
+normal distribution (mean +- jitter), streams send chunks at a configurable
+cadence, and a fraction of requests get a 429 (with retry-after and
+x-ratelimit-* headers), a 503, or stall. A stalled stream stops after its
+first chunk; any other stalled request waits before answering.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_GEMINI_CALL = re.compile(r"^/v1beta/(models/[^:]+):(generateContent|streamGenerateContent)")
+
+
+class SimulatorProfile:
+    """Latency, chunk cadence and fault rates for the simulated providers."""
+
+    def __init__(
+        self,
+        transcribe_ms: float = 400.0,
+        chat_ms: float = 250.0,
+        gemini_ms: float = 600.0,
+        jitter_ms: float = 80.0,
+        chunk_interval_ms: float = 40.0,
+        chunk_jitter_ms: float = 15.0,
+        chunks: int = 12,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 30.0,
+        retry_after_seconds: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.transcribe_ms = float(transcribe_ms)
+        self.chat_ms = float(chat_ms)
+        self.gemini_ms = float(gemini_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.chunk_interval_ms = float(chunk_interval_ms)
+        self.chunk_jitter_ms = float(chunk_jitter_ms)
+        self.chunks = max(1, int(chunks))
+        self.rate_429 = float(rate_429)
+        self.rate_5xx = float(rate_5xx)
+        self.stall_rate = float(stall_rate)
+        self.stall_seconds = float(stall_seconds)
+        self.retry_after_seconds = float(retry_after_seconds)
+        self.seed = seed
+
+
+class ProviderSimulator:
+    """Threaded HTTP server playing Groq and Gemini; use as a context manager."""
+
+    def __init__(self, profile: Optional[SimulatorProfile] = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or SimulatorProfile()
+        self.stats: Counter = Counter()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _SimulatorHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.simulator = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point both SDKs at this server."""
+        return {"GROQ_BASE_URL": self.base_url, "GOOGLE_GEMINI_BASE_URL": self.base_url}
+
+    def start(self) -> "ProviderSimulator":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="provider-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ProviderSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def delay(self, mean_ms: float, jitter_ms: float) -> float:
+        with self._lock:
+            return max(0.0, self._rng.gauss(mean_ms, jitter_ms)) / 1000.0
+
+    def fault(self) -> Optional[str]:
+        """"429", "5xx", "stall" or None for the next request."""
+        with self._lock:
+            draw = self._rng.random()
+        profile = self.profile
+        if draw < profile.rate_429:
+            return "429"
+        if draw < profile.rate_429 + profile.rate_5xx:
+            return "5xx"
+        if draw < profile.rate_429 + profile.rate_5xx + profile.stall_rate:
+            return "stall"
+        return None
+
+
+def _reply_text(prompt: str) -> str:
+    cleaned = " ".join(str(prompt or "").split()) or "simulated reply"
+    text = cleaned[0].upper() + cleaned[1:]
+    return text if text[-1] in ".!?" else text + "."
+
+
+def _split(text: str, parts: int) -> List[str]:
+    words = text.split(" ")
+    size = max(1, -(-len(words) // parts))
+    pieces = [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+    return [piece if index == 0 else " " + piece for index, piece in enumerate(pieces)]
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def sim(self) -> ProviderSimulator:
+        return self.server.simulator
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    # -- plumbing -----------------------------------------------------------
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass  # client gave up
+
+    def _stream(self, events: List[str], stall_after_first: bool) -> None:
+        """Send SSE ``data:`` events as chunked HTTP at the profile's cadence."""
+        profile = self.sim.profile
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for index, event in enumerate(events):
+                if index:
+                    time.sleep(self.sim.delay(profile.chunk_interval_ms, profile.chunk_jitter_ms))
+                data = f"data: {event}\n\n".encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                if stall_after_first:
+                    time.sleep(profile.stall_seconds)
+                    self.close_connection = True
+                    return
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            self.close_connection = True
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _fault(self, provider: str) -> Optional[str]:
+        """Answer with an injected 429/5xx and return it, or return "stall"/None."""
+        fault = self.sim.fault()
+        if fault is None:
+            return None
+        self.sim.count(f"injected_{fault}")
+        retry_after = self.sim.profile.retry_after_seconds
+        if fault == "429":
+            headers = {"retry-after": f"{retry_after:g}"}
+            if provider == "groq":
+                headers.update({
+                    "x-ratelimit-limit-requests": "14400",
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": f"{retry_after:g}s",
+                })
+            self._send_json(429, {"error": {"message": "simulated rate limit", "code": 429,
+                                            "status": "RESOURCE_EXHAUSTED"}}, headers)
+        elif fault == "5xx":
+            self._send_json(503, {"error": {"message": "simulated outage", "code": 503, "status": "UNAVAILABLE"}})
+        return fault
+
+    # -- routes -------------------------------------------------------------
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        if path == "/openai/v1/models":
+            self.sim.count("groq_models")
+            models = ["whisper-large-v3", "whisper-large-v3-turbo", "openai/gpt-oss-120b"]
+            return self._send_json(200, {"object": "list", "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "simulator"} for model in models
+            ]})
+        if path == "/v1beta/models":
+            self.sim.count("gemini_models")
+            return self._send_json(200, {"models": [
+                {"name": "models/gemma-4-31b-it", "supportedGenerationMethods": ["generateContent"]},
+                {"name": "models/gemini-sim", "supportedGenerationMethods": ["generateContent"]},
+            ]})
+        self._send_json(404, {"error": {"message": f"no route for GET {path}"}})
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        path = self.path.split("?")[0]
+        if path == "/openai/v1/audio/transcriptions":
+            return self._transcribe(body)
+        if path == "/openai/v1/chat/completions":
+            return self._chat(json.loads(body or b"{}"))
+        match = _GEMINI_CALL.match(path)
+        if match:
+            return self._gemini(match.group(1), match.group(2) == "streamGenerateContent", json.loads(body or b"{}"))
+        self._send_json(404, {"error": {"message": f"no route for POST {path}"}})
+
+    def _transcribe(self, body: bytes) -> None:
+        self.sim.count("groq_transcriptions")
+        fault = self._fault("groq")
+        if fault in ("429", "5xx"):
+            return
+        profile = self.sim.profile
+        time.sleep(self.sim.delay(profile.transcribe_ms, profile.jitter_ms))
+        if fault == "stall":
+            time.sleep(profile.stall_seconds)
+        self._send_json(200, {"text": f"simulated dictation of {len(body)} bytes"})
+
+    def _chat(self, request: Dict[str, Any]) -> None:
+        stream = bool(request.get("stream"))
+        self.sim.count("groq_chat_streams" if stream else "groq_chats")
+        fault = self._fault("groq")
+        if fault in ("429", "5xx"):
+            return
+        profile = self.sim.profile
+        time.sleep(self.sim.delay(profile.chat_ms, profile.jitter_ms))
+        messages = request.get("messages") or [{}]
+        reply = _reply_text(messages[-1].get("content", ""))
+        model = request.get("model", "simulated")
+        if not stream:
+            if fault == "stall":
+                time.sleep(profile.stall_seconds)
+            return self._send_json(200, {
+                "id": "chatcmpl-sim", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": reply}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+        events = [
+            json.dumps({"id": "chatcmpl-sim", "object": "chat.completion.chunk", "created": 0, "model": model,
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            for piece in _split(reply, profile.chunks)
+        ]
+        self._stream(events + ["[DONE]"], stall_after_first=fault == "stall")
+
+    def _gemini(self, model: str, stream: bool, request: Dict[str, Any]) -> None:
+        self.sim.count("gemini_streams" if stream else "gemini_calls")
+        fault = self._fault("gemini")
+        if fault in ("429", "5xx"):
+            return
+        profile = self.sim.profile
+        time.sleep(self.sim.delay(profile.gemini_ms, profile.jitter_ms))
+        contents = request.get("contents") or [{}]
+        parts = contents[-1].get("parts") or [{}]
+        answer = f"Simulated answer to: {_reply_text(parts[0].get('text', ''))}"
+
+        def response(part: Dict[str, Any]) -> Dict[str, Any]:
+            return {"candidates": [{"content": {"role": "model", "parts": [part]}, "index": 0}],
+                    "modelVersion": model}
+
+        if not stream:
+            if fault == "stall":
+                time.sleep(profile.stall_seconds)
+            return self._send_json(200, response({"text": answer}))
+        events = [json.dumps(response({"text": "Considering the question.", "thought": True}))]
+        events += [json.dumps(response({"text": piece})) for piece in _split(answer, profile.chunks)]
+        self._stream(events, stall_after_first=fault == "stall")
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=None, help="Mean latency for every endpoint")
+    parser.add_argument("--jitter-ms", type=float, default=80.0)
+    parser.add_argument("--chunk-interval-ms", type=float, default=40.0)
+    parser.add_argument("--chunks", type=int, default=12)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def profile_from_args(args: argparse.Namespace) -> SimulatorProfile:
+    latency = {}
+    if args.latency_ms is not None:
+        latency = {"transcribe_ms": args.latency_ms, "chat_ms": args.latency_ms, "gemini_ms": args.latency_ms}
+    return SimulatorProfile(
+        jitter_ms=args.jitter_ms,
+        chunk_interval_ms=args.chunk_interval_ms,
+        chunks=args.chunks,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        seed=args.seed,
+        **latency,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8046)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    simulator = ProviderSimulator(profile_from_args(args), host=args.host, port=args.port)
+    with simulator:
+        for name, value in simulator.environment().items():
+            print(f"{name}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    print(dict(simulator.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
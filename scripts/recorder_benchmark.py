@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Drive AudioRecorder from a file or synthetic source, without a microphone.
+
+Usage:
+  python3 scripts/recorder_benchmark.py
+  python3 scripts/recorder_benchmark.py --pattern "tone:3:220,silence:1,tone:3:330" --realtime
+  python3 scripts/recorder_benchmark.py --file clipped_report.wav --realtime --hold 4.5
+
+Fast mode (the default) feeds the whole signal through the real callback and
+encoder as quickly as they accept it, and reports capture throughput in x
+realtime. --realtime paces callbacks like a device so release latency (key up
+to recording_finished) and callback overflows can be measured, and a file
+from a bug report can be replayed to reproduce clipped starts or ends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from src.audio_recorder import AudioRecorder  # noqa: E402
+from src.audio_sources import FileSource, SyntheticSource  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, help="WAV/FLAC to replay as the microphone")
+    parser.add_argument("--pattern", default="tone:4:220,silence:0.6,tone:4:330,noise:1:40",
+                        help="Synthetic pattern: kind:seconds[:hz|level],...")
+    parser.add_argument("--rate", type=int, default=48000, help="Synthetic source rate")
+    parser.add_argument("--realtime", action="store_true", help="Pace callbacks like a device")
+    parser.add_argument("--hold", type=float, help="Seconds to hold the key (realtime; default: whole signal)")
+    parser.add_argument("--codec", default="wav")
+    parser.add_argument("--target-rate", type=int, default=16000, help="Upload rate (0 = capture rate)")
+    parser.add_argument("--always-listening", action="store_true", help="Use the persistent stream + pre-roll")
+    parser.add_argument("--no-trim", action="store_true", help="Disable silence trimming")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    if args.file:
+        source = FileSource(str(args.file), realtime=args.realtime)
+    else:
+        source = SyntheticSource(args.pattern, rate=args.rate, realtime=args.realtime)
+    signal_seconds = source.duration
+
+    recorder = AudioRecorder(
+        always_listening=args.always_listening,
+        target_rate=args.target_rate or None,
+        codec=args.codec,
+        trim_silence=not args.no_trim,
+        source_factory=source.factory(),
+    )
+    results = []
+    recorder.recording_finished.connect(lambda audio: results.append((time.perf_counter(), audio)))
+    recorder.no_speech_detected.connect(lambda: results.append((time.perf_counter(), None)))
+    recorder.error_occurred.connect(lambda message: print(f"error: {message}", file=sys.stderr))
+
+    if args.always_listening:
+        recorder.start_listening()
+    started = time.perf_counter()
+    recorder.start_recording()
+    hold = args.hold if args.hold is not None else signal_seconds
+    if args.realtime:
+        deadline = started + hold
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+    else:
+        source.drained.wait()
+    captured_at = time.perf_counter()
+    recorder.stop_recording()
+    app.processEvents()
+
+    if not results:
+        print("recording produced no result", file=sys.stderr)
+        return 1
+    finished_at, audio = results[-1]
+    capture_seconds = captured_at - started
+    print(f"source: {source.name}, {signal_seconds:.2f}s @ {source.rate} Hz, "
+          f"{'realtime' if args.realtime else 'fast'}")
+    if not args.realtime:
+        print(f"capture: {capture_seconds * 1000:.1f} ms ({signal_seconds / max(capture_seconds, 1e-9):.0f}x realtime)")
+    print(f"release latency: {(finished_at - captured_at) * 1000:.2f} ms")
+    overflows = sum(stream.overflows for stream in source.streams)
+    callbacks = sum(stream.callbacks for stream in source.streams)
+    print(f"callbacks: {callbacks}, overflows: {overflows}")
+    if audio is None:
+        print("result: no speech detected")
+    else:
+        print(f"result: {audio.duration:.2f}s {audio.codec} @ {audio.sample_rate} Hz, {audio.nbytes} bytes")
+    print(f"vad: {recorder.vad_stats.summary()}")
+    recorder.stop_listening()
+    source.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
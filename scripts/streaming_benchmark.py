@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Replay a long streamed Gemini answer into the answer card and time each chunk.
+
+Usage:
+  python3 scripts/streaming_benchmark.py
+  python3 scripts/streaming_benchmark.py --words 20000 --chunk-words 3
+  python3 scripts/streaming_benchmark.py --mode delta --frame-every 4
+
+The answer goes through the real GeminiClient.run_search (with a canned SDK
+stream in place of the network) and into AudioVisualizer, once per mode:
+
+  full   the whole answer so far on every chunk (stream_callback ->
+         update_streaming_answer), as the app used to stream
+  delta  only the new text, numbered (delta_callback ->
+         append_streaming_answer), as it streams now
+
+Per-chunk cost is reported for the first and last tenth of the answer; with
+O(delta) handling the two stay about the same as the answer grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Any, Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from src.gemini_client import GeminiClient  # noqa: E402
+from src.ui_visualizer import AudioVisualizer  # noqa: E402
+
+MODES = ("full", "delta")
+WORDS = (
+    "the answer streams in small parts while **Gemini** keeps thinking about sources "
+    "and each part adds a few words to the card so that the reader sees progress"
+).split()
+
+
+def answer_chunks(words: int = 6000, chunk_words: int = 2, seed: int = 7) -> List[str]:
+    """A long markdown-ish answer cut into stream-sized pieces."""
+    rng = random.Random(seed)
+    text_words = [rng.choice(WORDS) for _ in range(words)]
+    chunks: List[str] = []
+    for start in range(0, words, chunk_words):
+        piece = " ".join(text_words[start:start + chunk_words])
+        if rng.random() < 0.05:
+            piece += ".\n"
+        chunks.append(piece + " ")
+    return chunks
+
+
+class _CannedModels:
+    def __init__(self, chunks: List[str]):
+        self._chunks = chunks
+
+    def generate_content_stream(self, **_request: Any):
+        return iter([types.SimpleNamespace(text=chunk) for chunk in self._chunks])
+
+
+def _client(chunks: List[str]) -> GeminiClient:
+    client = GeminiClient(None)
+    client._types = importlib.import_module("google.genai.types")
+    client.client = types.SimpleNamespace(models=_CannedModels(chunks))
+    return client
+
+
+def _mean_us(values: List[float]) -> float:
+    return sum(values) / len(values) * 1e6 if values else 0.0
+
+
+def replay(chunks: List[str], mode: str, visualizer: AudioVisualizer, frame_every: int = 0) -> Dict[str, Any]:
+    """Stream ``chunks`` into ``visualizer`` and time the per-chunk handling."""
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}")
+    timings: List[float] = []
+    seq = 0
+    visualizer.set_stream_realtime_enabled(False)
+    visualizer.begin_streaming_answer(reason="streaming benchmark")
+
+    def frame() -> None:
+        if frame_every and len(timings) % frame_every == 0:
+            visualizer._tick_streaming_answer_frame()
+
+    def on_full(text: str) -> None:
+        started = time.perf_counter()
+        visualizer.update_streaming_answer(text)
+        timings.append(time.perf_counter() - started)
+        frame()
+
+    def on_delta(delta: str) -> None:
+        nonlocal seq
+        seq += 1
+        started = time.perf_counter()
+        visualizer.append_streaming_answer(delta, seq=seq)
+        timings.append(time.perf_counter() - started)
+        frame()
+
+    callbacks = {"stream_callback": on_full} if mode == "full" else {"delta_callback": on_delta}
+    started = time.perf_counter()
+    answer = _client(chunks).run_search("benchmark", "models/benchmark", with_search=False, **callbacks)
+    total_seconds = time.perf_counter() - started
+    visualizer._tick_streaming_answer_frame()
+
+    tenth = max(1, len(timings) // 10)
+    return {
+        "mode": mode,
+        "chunks": len(timings),
+        "chars": len(answer),
+        "total_ms": total_seconds * 1000,
+        "mean_us": _mean_us(timings),
+        "first_tenth_us": _mean_us(timings[:tenth]),
+        "last_tenth_us": _mean_us(timings[-tenth:]),
+        "arrived_text": visualizer._streaming_arrived_text(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=6000)
+    parser.add_argument("--chunk-words", type=int, default=2)
+    parser.add_argument("--mode", choices=MODES, help="Run one mode only (default: both)")
+    parser.add_argument("--frame-every", type=int, default=0, help="Run a UI frame every N chunks (0 = none)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    chunks = answer_chunks(args.words, args.chunk_words, args.seed)
+    print(f"answer: {args.words} words in {len(chunks)} chunks")
+    for mode in [args.mode] if args.mode else MODES:
+        visualizer = AudioVisualizer()
+        report = replay(chunks, mode, visualizer, frame_every=args.frame_every)
+        print(f"  {mode:<5} total {report['total_ms']:8.1f} ms  per chunk {report['mean_us']:7.1f} us  "
+              f"first tenth {report['first_tenth_us']:7.1f} us  last tenth {report['last_tenth_us']:7.1f} us")
+        visualizer.deleteLater()
+        app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
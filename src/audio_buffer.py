@@ -0,0 +1,163 @@
+import logging
+import tempfile
+import numpy as np
+from typing import IO, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PreRollRing:
+    """Contiguous circular int16 buffer holding the most recent samples.
+
+    Written only by the audio callback (single producer). ``total`` counts every
+    sample ever written, so readers address audio by absolute position and can
+    tell exactly which part of the window is still valid.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(max(1, int(capacity)), dtype=np.int16)
+        self._total = 0
+
+    @property
+    def capacity(self) -> int:
+        return int(self._data.shape[0])
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    def resize(self, capacity: int) -> None:
+        capacity = max(1, int(capacity))
+        if capacity != self.capacity:
+            self._data = np.zeros(capacity, dtype=np.int16)
+        self._total = 0
+
+    def clear(self) -> None:
+        self._total = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        cap = self.capacity
+        n = int(samples.shape[0])
+        base = self._total
+        if n > cap:
+            # Only the newest `cap` samples can survive; keep their absolute
+            # positions so the ring stays consistent with `total`.
+            base += n - cap
+            samples = samples[n - cap:]
+        count = int(samples.shape[0])
+        pos = base % cap
+        first = min(count, cap - pos)
+        self._data[pos:pos + first] = samples[:first]
+        if first < count:
+            self._data[:count - first] = samples[first:]
+        # Publish after the copy so readers never see unwritten samples.
+        self._total += n
+
+    def copy_range(self, start: int, end: int, dest: "CaptureBuffer") -> int:
+        """Append samples at absolute positions [start, end) to ``dest``.
+
+        The range is clamped to what the ring still holds. Returns the number
+        of samples copied.
+        """
+        end = min(int(end), self._total)
+        start = max(int(start), end - self.capacity, 0)
+        if end <= start:
+            return 0
+        cap = self.capacity
+        pos = start % cap
+        count = end - start
+        first = min(count, cap - pos)
+        dest.write(self._data[pos:pos + first])
+        if first < count:
+            dest.write(self._data[:count - first])
+        return count
+
+
+class CaptureBuffer:
+    """Growable int16 arena holding one recording.
+
+    The audio callback is the single producer: it appends with ``write`` and
+    publishes the new length only after the samples are in place. Consumers
+    read ``view()`` at any time without a lock. Capacity doubles when the
+    arena fills, so a steady capture performs no per-callback allocations.
+
+    With ``ram_budget_bytes`` set, growth past the budget moves the arena to
+    a memory-mapped temporary file. Readers keep using the same array
+    interface and the OS pages the audio in and out as needed.
+    """
+
+    def __init__(self, initial_capacity: int, ram_budget_bytes: Optional[int] = None):
+        self._data = np.empty(max(1, int(initial_capacity)), dtype=np.int16)
+        self._length = 0
+        self._ram_budget = ram_budget_bytes
+        self._spill: Optional[IO[bytes]] = None
+        # Absolute pre-roll ring position this buffer was seeded up to. The
+        # callback uses it to catch up on chunks that landed in the ring while
+        # the buffer was being seeded, then clears it.
+        self.ring_mark: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return int(self._data.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return self._length * 2
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill is not None
+
+    def clear(self) -> None:
+        """Forget the contents but keep the arena for reuse."""
+        self._length = 0
+
+    def _grow(self, required: int) -> None:
+        capacity = self.capacity
+        while capacity < required:
+            capacity *= 2
+        if self._spill is not None or (self._ram_budget is not None and capacity * 2 > self._ram_budget):
+            self._data = self._map_spill(capacity)
+            return
+        grown = np.empty(capacity, dtype=np.int16)
+        grown[:self._length] = self._data[:self._length]
+        self._data = grown
+
+    def _map_spill(self, capacity: int) -> np.ndarray:
+        """Map ``capacity`` samples of the spill file, creating it on first use.
+
+        Later growth only extends the file and maps it again; the samples
+        already written stay where they are, so nothing is copied.
+        """
+        first = self._spill is None
+        if first:
+            self._spill = tempfile.TemporaryFile(prefix="whispeross-capture-")
+            logger.info(f"Recording exceeded {self._ram_budget} bytes of RAM; spilling to disk")
+        self._spill.truncate(capacity * 2)
+        mapped = np.memmap(self._spill, dtype=np.int16, mode="r+", shape=(capacity,))
+        if first:
+            mapped[:self._length] = self._data[:self._length]
+        return mapped
+
+    def write(self, samples: np.ndarray) -> None:
+        n = int(samples.shape[0])
+        if n == 0:
+            return
+        length = self._length
+        if length + n > self.capacity:
+            self._grow(length + n)
+        self._data[length:length + n] = samples
+        self._length = length + n
+
+    def view(self) -> np.ndarray:
+        """Samples captured so far (no copy)."""
+        # Read the length before the array: a concurrent grow publishes the new
+        # array before the new length, so both arrays hold [0, length).
+        length = self._length
+        return self._data[:length]
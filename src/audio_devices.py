@@ -0,0 +1,236 @@
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Host API preference + display labels (Windows). WASAPI is the modern,
+# low-latency API and exposes virtual devices like NVIDIA Broadcast; we list
+# it first and collapse the same physical mic that Windows ALSO exposes
+# through the older MME / DirectSound / WDM-KS subsystems into one entry.
+HOST_API_PRIORITY = [
+    ("wasapi", "WASAPI"),
+    ("wdm-ks", "WDM-KS"),
+    ("directsound", "DirectSound"),
+    ("mme", "MME"),
+]
+
+# Names at least this long are treated as the same device when one is a
+# prefix of the other (MME truncates names to ~31 chars).
+_PREFIX_MATCH_LEN = 12
+
+
+def host_api_label_and_rank(host_api_name: Optional[str]) -> Tuple[str, int]:
+    """Map a PortAudio host API name to a short label and a preference rank."""
+    name = (host_api_name or "").lower()
+    for rank, (needle, label) in enumerate(HOST_API_PRIORITY):
+        if needle in name:
+            return label, rank
+    # Unknown/other host APIs sort after the known ones but are still shown.
+    return (host_api_name or "Audio"), len(HOST_API_PRIORITY)
+
+
+def normalize_device_name(name: Optional[str]) -> str:
+    return "".join(ch for ch in (name or "").lower() if ch.isalnum())
+
+
+def is_same_device(key: str, seen_key: str) -> bool:
+    """True if two normalized device names refer to the same physical mic.
+
+    Exact match, or one name is a prefix of the other for reasonably long
+    names — this collapses MME's truncated (~31 char) name onto the full
+    WASAPI name without merging genuinely distinct devices.
+    """
+    if not key or not seen_key:
+        return False
+    if key == seen_key:
+        return True
+    if min(len(key), len(seen_key)) >= _PREFIX_MATCH_LEN and (
+        key.startswith(seen_key) or seen_key.startswith(key)
+    ):
+        return True
+    return False
+
+
+class _SeenDevices:
+    """Set of normalized names supporting ``is_same_device`` lookups.
+
+    Exact names go in a set; long names are also bucketed by their first
+    characters, since a prefix match implies a shared bucket. Each lookup
+    compares against one bucket instead of every device seen so far.
+    """
+
+    def __init__(self):
+        self._exact: Set[str] = set()
+        self._buckets: Dict[str, List[str]] = {}
+
+    def matches(self, key: str) -> bool:
+        if not key:
+            return False
+        if key in self._exact:
+            return True
+        if len(key) < _PREFIX_MATCH_LEN:
+            return False
+        return any(is_same_device(key, seen) for seen in self._buckets.get(key[:_PREFIX_MATCH_LEN], ()))
+
+    def add(self, key: str) -> None:
+        self._exact.add(key)
+        if len(key) >= _PREFIX_MATCH_LEN:
+            self._buckets.setdefault(key[:_PREFIX_MATCH_LEN], []).append(key)
+
+
+class DeviceCatalog:
+    """Caches what PortAudio reports about input devices.
+
+    Enumeration, per-device info (including the native sample rate) and
+    ``is_format_supported`` probes are each queried once and reused. The
+    cache is dropped on ``refresh`` (after PortAudio is re-initialized) or
+    when the host API / device counts change.
+    """
+
+    def __init__(self, pa: Any, sample_format: int):
+        self._pa = pa
+        self._format = sample_format
+        self.hits = 0
+        self.misses = 0
+        self._signature: Optional[Tuple[Any, Any]] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self._devices: Optional[List[Tuple[int, str]]] = None
+        self._info: Dict[Optional[int], Dict[str, Any]] = {}
+        self._supported: Dict[Tuple[Optional[int], int, int], bool] = {}
+
+    def refresh(self, pa: Any) -> None:
+        """Point at a freshly initialized PortAudio instance and drop the cache."""
+        self._pa = pa
+        self._signature = None
+        self._clear()
+
+    def _check_device_set(self) -> None:
+        try:
+            signature = (self._pa.get_host_api_count(), self._pa.get_device_count())
+        except Exception:
+            return
+        if signature != self._signature:
+            if self._signature is not None:
+                logger.info("Audio device set changed; refreshing device catalog")
+            self._signature = signature
+            self._clear()
+
+    def list_devices(self) -> List[Tuple[int, str]]:
+        """Input devices, one clean entry per physical microphone."""
+        self._check_device_set()
+        if self._devices is None:
+            self.misses += 1
+            self._devices = self._enumerate()
+        else:
+            self.hits += 1
+        return list(self._devices)
+
+    def _enumerate(self) -> List[Tuple[int, str]]:
+        """Enumerate ALL host APIs (so virtual/late devices like NVIDIA Broadcast
+        appear), then collapse the same mic that Windows exposes through several
+        audio subsystems into a single entry, preferring WASAPI. The GLOBAL
+        device index (device_info["index"]) is the stored id, and every
+        per-device query is wrapped in try/except so one bad/warming-up device
+        cannot blank the entire list.
+        """
+        try:
+            host_api_count = self._pa.get_host_api_count()
+        except Exception as e:
+            logger.error(f"Error querying host APIs: {e}")
+            return []
+
+        # 1) Gather every input device with its host API label + preference rank.
+        candidates: List[Tuple[int, int, str, str]] = []  # (rank, index, name, label)
+        for host_api_index in range(host_api_count):
+            try:
+                host_info = self._pa.get_host_api_info_by_index(host_api_index)
+                num_devices = host_info.get('deviceCount') or 0
+                label, rank = host_api_label_and_rank(host_info.get('name'))
+            except Exception as e:
+                logger.warning(f"Skipping host API {host_api_index}: {e}")
+                continue
+
+            for i in range(num_devices):
+                try:
+                    device_info = self._pa.get_device_info_by_host_api_device_index(host_api_index, i)
+                    if (device_info.get('maxInputChannels') or 0) <= 0:
+                        continue
+                    global_index = device_info.get('index')
+                    name = device_info.get('name')
+                    if global_index is None or not name:
+                        continue
+                    # The same dict carries the native rate; keep it so
+                    # opening this device later needs no further query.
+                    self._info[int(global_index)] = device_info
+                    candidates.append((rank, int(global_index), name, label))
+                except Exception as e:
+                    # One bad/warming-up device must not drop the whole list.
+                    logger.warning(f"Skipping device {i} on host API {host_api_index}: {e}")
+                    continue
+
+        # 2) In host-API preference order, keep one entry per physical device.
+        candidates.sort(key=lambda c: (c[0], c[1]))
+        devices: List[Tuple[int, str]] = []
+        seen_indices: set = set()
+        seen = _SeenDevices()
+        for _rank, global_index, name, label in candidates:
+            if global_index in seen_indices:
+                continue
+            key = normalize_device_name(name)
+            if seen.matches(key):
+                continue
+            seen_indices.add(global_index)
+            seen.add(key)
+            devices.append((global_index, f"{name} ({label})"))
+
+        return devices
+
+    def device_info(self, index: Optional[int]) -> Dict[str, Any]:
+        """PortAudio info for ``index`` (None = default input device)."""
+        self._check_device_set()
+        info = self._info.get(index)
+        if info is not None:
+            self.hits += 1
+            return info
+        self.misses += 1
+        if index is None:
+            info = self._pa.get_default_input_device_info()
+        else:
+            info = self._pa.get_device_info_by_index(index)
+        self._info[index] = info
+        return info
+
+    def native_rate(self, index: Optional[int]) -> Optional[int]:
+        rate_val = self.device_info(index).get('defaultSampleRate')
+        if isinstance(rate_val, (int, float)) and rate_val > 0:
+            return int(round(rate_val))
+        return None
+
+    def supports(self, index: Optional[int], rate: int, channels: int = 1) -> bool:
+        """Whether the device accepts int16 capture at ``rate`` (probed once)."""
+        key = (index, int(rate), int(channels))
+        cached = self._supported.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        device = index
+        if device is None:
+            device = self.device_info(None).get('index')
+        try:
+            supported = bool(self._pa.is_format_supported(
+                int(rate),
+                input_device=device,
+                input_channels=int(channels),
+                input_format=self._format,
+            ))
+        except ValueError:
+            supported = False
+        except Exception as e:
+            # Probe itself failed (driver quirk); let the open attempt decide.
+            logger.debug(f"Format probe failed for device {index} @ {rate} Hz: {e}")
+            supported = True
+        self._supported[key] = supported
+        return supported
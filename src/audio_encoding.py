@@ -0,0 +1,293 @@
+import importlib
+import io
+import logging
+import struct
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from src.audio_buffer import CaptureBuffer
+
+logger = logging.getLogger(__name__)
+
+WAV_HEADER_BYTES = 44
+_WAV_HEADER_SAMPLES = WAV_HEADER_BYTES // 2
+
+
+class EncodedAudio(io.BufferedIOBase):
+    """Read-only file object over an encoded recording.
+
+    Wraps a memoryview of the encoder's arena, so handing a finished recording
+    to the uploader copies nothing. ``filename`` and ``mime_type`` describe the
+    container for the multipart upload; ``codec`` and ``samples`` (the int16
+    PCM it was encoded from, when known) let it be split and re-encoded.
+    """
+
+    def __init__(
+        self,
+        data: memoryview,
+        filename: str = "audio.wav",
+        mime_type: str = "audio/wav",
+        sample_rate: int = 16000,
+        duration: float = 0.0,
+        codec: str = "wav",
+        samples: Optional[np.ndarray] = None,
+    ):
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+        self.filename = filename
+        self.mime_type = mime_type
+        self.sample_rate = int(sample_rate)
+        self.duration = float(duration)
+        self.codec = codec
+        self.samples = samples
+
+    @property
+    def nbytes(self) -> int:
+        return self._view.nbytes
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def reader(self) -> "EncodedAudio":
+        """Another file object over the same bytes, with its own position.
+
+        Lets retried or concurrent uploads of one recording each stream it
+        from the start without copying it.
+        """
+        return EncodedAudio(
+            self._view, self.filename, self.mime_type, self.sample_rate, self.duration, self.codec, self.samples
+        )
+
+    def getvalue(self) -> bytes:
+        return self._view.tobytes()
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._view.nbytes + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        end = self._view.nbytes if size is None or size < 0 else min(self._pos + size, self._view.nbytes)
+        if end <= self._pos:
+            return b""
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return chunk
+
+    read1 = read
+
+    def readinto(self, buffer) -> int:
+        target = memoryview(buffer).cast("B")
+        count = max(0, min(target.nbytes, self._view.nbytes - self._pos))
+        target[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+
+class WavStreamEncoder(CaptureBuffer):
+    """Builds a 16-bit mono WAV in place as samples arrive.
+
+    The 44-byte RIFF header is reserved at the front of the capture arena and
+    PCM is appended behind it, so the container is complete except for its
+    length fields. ``finalize`` patches those and returns a view of the arena:
+    finishing a recording costs the same whether it lasted 1 s or 5 min.
+    """
+
+    codec = "wav"
+    filename = "audio.wav"
+    mime_type = "audio/wav"
+
+    def __init__(self, sample_rate: int, initial_seconds: float = 30, ram_budget_bytes: Optional[int] = None):
+        self.sample_rate = int(sample_rate)
+        super().__init__(_WAV_HEADER_SAMPLES + int(self.sample_rate * initial_seconds), ram_budget_bytes)
+        self._length = _WAV_HEADER_SAMPLES
+
+    def __len__(self) -> int:
+        return self._length - _WAV_HEADER_SAMPLES
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * 2
+
+    @property
+    def duration(self) -> float:
+        return len(self) / float(self.sample_rate)
+
+    def view(self) -> np.ndarray:
+        return super().view()[_WAV_HEADER_SAMPLES:]
+
+    def flush(self) -> None:
+        """Nothing is buffered ahead of the arena; kept for parity with ResampledCapture."""
+
+    def _bounds(self, start: int, end: Optional[int]) -> tuple:
+        length = len(self)
+        end = length if end is None else max(0, min(int(end), length))
+        return max(0, min(int(start), end)), end
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> EncodedAudio:
+        """Patch the header length fields and expose the WAV without copying.
+
+        ``start``/``end`` trim the recording to a sample range. The header is
+        then written into the 44 bytes just before ``start`` (the reserved
+        slot, or trimmed audio), so trimming is still zero-copy. The arena is
+        not valid for further writes afterwards.
+        """
+        start, end = self._bounds(start, end)
+        samples = self._data[start + _WAV_HEADER_SAMPLES:end + _WAV_HEADER_SAMPLES]
+        arena = self._data[start:end + _WAV_HEADER_SAMPLES]
+        raw = memoryview(arena).cast("B")
+        data_bytes = (end - start) * 2
+        struct.pack_into(
+            "<4sI4s4sIHHIIHH4sI",
+            raw,
+            0,
+            b"RIFF",
+            36 + data_bytes,
+            b"WAVE",
+            b"fmt ",
+            16,                     # PCM fmt chunk size
+            1,                      # PCM
+            1,                      # mono
+            self.sample_rate,
+            self.sample_rate * 2,   # byte rate
+            2,                      # block align
+            16,                     # bits per sample
+            b"data",
+            data_bytes,
+        )
+        return EncodedAudio(
+            raw,
+            filename=self.filename,
+            mime_type=self.mime_type,
+            sample_rate=self.sample_rate,
+            duration=(end - start) / float(self.sample_rate),
+            codec=self.codec,
+            samples=samples,
+        )
+
+
+def _load_soundfile():
+    """Import the optional libsndfile binding used by the compressed codecs."""
+    try:
+        return importlib.import_module("soundfile")
+    except Exception:  # pragma: no cover - environment dependent
+        return None
+
+
+class SoundFileEncoder(WavStreamEncoder):
+    """Compressed codec on top of the incremental PCM arena.
+
+    Capture is identical to WAV (PCM appended as it arrives); ``finalize``
+    encodes the captured samples with libsndfile. That trades a few ms of CPU
+    at key release for a much smaller upload on slow links.
+    """
+
+    sf_format = ""
+    sf_subtype = ""
+    supported_rates: Optional[tuple] = None
+
+    @classmethod
+    def supports(cls, sample_rate: int) -> bool:
+        return cls.supported_rates is None or int(sample_rate) in cls.supported_rates
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> EncodedAudio:
+        soundfile = _load_soundfile()
+        if soundfile is None:
+            raise RuntimeError("soundfile is not installed")
+        start, end = self._bounds(start, end)
+        samples = self.view()[start:end]
+        out = io.BytesIO()
+        soundfile.write(
+            out,
+            samples,
+            self.sample_rate,
+            format=self.sf_format,
+            subtype=self.sf_subtype,
+        )
+        return EncodedAudio(
+            out.getbuffer(),
+            filename=self.filename,
+            mime_type=self.mime_type,
+            sample_rate=self.sample_rate,
+            duration=(end - start) / float(self.sample_rate),
+            codec=self.codec,
+            samples=samples,
+        )
+
+
+class FlacEncoder(SoundFileEncoder):
+    """Lossless FLAC; roughly half the bytes of WAV for speech."""
+
+    codec = "flac"
+    filename = "audio.flac"
+    mime_type = "audio/flac"
+    sf_format = "FLAC"
+    sf_subtype = "PCM_16"
+
+
+class OggOpusEncoder(SoundFileEncoder):
+    """Low-bitrate Opus in Ogg; lossy, but Whisper tolerates it well."""
+
+    codec = "opus"
+    filename = "audio.ogg"
+    mime_type = "audio/ogg"
+    sf_format = "OGG"
+    sf_subtype = "OPUS"
+    # Opus only runs at these rates; other capture rates fall back to FLAC.
+    supported_rates = (8000, 12000, 16000, 24000, 48000)
+
+
+ENCODERS: Dict[str, Type[WavStreamEncoder]] = {
+    "wav": WavStreamEncoder,
+    "flac": FlacEncoder,
+    "opus": OggOpusEncoder,
+}
+
+
+def available_codecs() -> List[str]:
+    """Codec names usable in this environment."""
+    if _load_soundfile() is None:
+        return ["wav"]
+    return list(ENCODERS)
+
+
+def create_encoder(
+    codec: str,
+    sample_rate: int,
+    initial_seconds: float = 30,
+    ram_budget_bytes: Optional[int] = None,
+) -> WavStreamEncoder:
+    """Return an encoder for ``codec``, falling back to WAV when unavailable."""
+    name = str(codec or "wav").strip().lower()
+    encoder_cls = ENCODERS.get(name)
+    if encoder_cls is None:
+        logger.warning("Unknown upload codec %r; using WAV.", codec)
+        encoder_cls = WavStreamEncoder
+    if issubclass(encoder_cls, SoundFileEncoder):
+        if _load_soundfile() is None:
+            logger.warning("soundfile not installed; uploading %s as WAV instead.", name)
+            encoder_cls = WavStreamEncoder
+        elif not encoder_cls.supports(sample_rate):
+            logger.info("%s does not support %d Hz; using FLAC.", name, sample_rate)
+            encoder_cls = FlacEncoder
+    return encoder_cls(sample_rate, initial_seconds, ram_budget_bytes)
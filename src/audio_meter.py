@@ -0,0 +1,107 @@
+import logging
+import threading
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from src.audio_buffer import CaptureBuffer, PreRollRing
+
+logger = logging.getLogger(__name__)
+
+
+class MeterReading(NamedTuple):
+    peak: float  # 0..1 of full scale
+    rms: float  # 0..1 of full scale
+    level: float  # peak shaped for the visualizer bars
+    sequence: int  # bumps on every new reading so readers can skip repeats
+
+
+SILENT_READING = MeterReading(0.0, 0.0, 0.0, 0)
+
+
+def normalize_peak(peak: int) -> float:
+    """
+    Map raw int16 peak amplitude into a visualizer-friendly 0..1 range.
+    A light non-linear curve makes low-volume speech more reactive.
+    """
+    linear = min(max(float(peak) / 7000.0, 0.0), 1.0)
+    return min((linear ** 0.72) * 1.18, 1.0)
+
+
+class AudioMeter:
+    """Computes input levels from the pre-roll ring on its own thread.
+
+    The audio callback only stores samples. At the visualizer's frame rate
+    this thread reads whatever reached the ring since its last tick and
+    publishes a MeterReading by plain attribute assignment, which readers
+    pick up each frame without a lock or a queued Qt event.
+    """
+
+    def __init__(self, ring: PreRollRing, fps: int = 100):
+        self._ring = ring
+        self._interval = 1.0 / max(1, int(fps))
+        self._reading = SILENT_READING
+        self._last_total = 0
+        # Reused for every tick; grows once to the largest window seen.
+        self._scratch = CaptureBuffer(4096)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def reading(self) -> MeterReading:
+        return self._reading
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def set_fps(self, fps: int) -> None:
+        self._interval = 1.0 / max(1, int(fps))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._last_total = self._ring.total
+        self._reading = SILENT_READING._replace(sequence=self._reading.sequence + 1)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="AudioMeter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=1.0)
+        self._reading = SILENT_READING._replace(sequence=self._reading.sequence + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.tick()
+            except Exception as e:  # keep metering alive across odd states
+                logger.debug(f"Meter tick failed: {e}")
+
+    def tick(self) -> None:
+        """Publish the level of the audio that arrived since the last tick."""
+        total = self._ring.total
+        if total < self._last_total:
+            # Ring was reset (stream reopened); start over.
+            self._last_total = 0
+        if total == self._last_total:
+            return
+        self._scratch.clear()
+        self._ring.copy_range(self._last_total, total, self._scratch)
+        self._last_total = total
+        window = self._scratch.view()
+        if window.shape[0] == 0:
+            return
+        samples = window.astype(np.float32)
+        peak = float(np.max(np.abs(samples)))
+        rms = float(np.sqrt(np.dot(samples, samples) / samples.shape[0]))
+        self._reading = MeterReading(
+            peak / 32768.0,
+            rms / 32768.0,
+            normalize_peak(int(peak)),
+            self._reading.sequence + 1,
+        )
@@ -1,29 +1,77 @@
 import pyaudio
-import wave
-import io
-import threading
-import collections
 import numpy as np
 import logging
-from typing import Optional, List, Tuple, Any, Union
+import threading
+import time
+from typing import Optional, List, Tuple, Any, Union, Callable
 from PyQt6.QtCore import QObject, pyqtSignal
+from src.audio_buffer import PreRollRing
+from src.audio_devices import DeviceCatalog
+from src.audio_encoding import WavStreamEncoder, create_encoder
+from src.audio_meter import AudioMeter
+from src.audio_resample import ResampledCapture, StreamingResampler
+from src.audio_vad import VadStats, find_pause, find_speech_bounds
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 class AudioRecorder(QObject):
-    # Signal to send audio amplitude data for visualization (0.0 to 1.0)
-    visualizer_update = pyqtSignal(float)
-    recording_finished = pyqtSignal(object)  # Emits BytesIO buffer (changed from str)
+    recording_finished = pyqtSignal(object)  # Emits EncodedAudio (file-like, zero-copy)
+    segment_ready = pyqtSignal(object)  # EncodedAudio of a phrase finished mid-recording
+    no_speech_detected = pyqtSignal()  # Recording held no speech; nothing to upload
+    max_duration_reached = pyqtSignal()  # Hit max_seconds; caller should stop recording
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, input_device_index: Optional[int] = None, always_listening: bool = True):
+    def __init__(
+        self,
+        input_device_index: Optional[int] = None,
+        always_listening: bool = True,
+        target_rate: Optional[int] = None,
+        codec: str = "wav",
+        trim_silence: bool = True,
+        speculative: bool = False,
+        ram_budget_bytes: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        source_factory: Optional[Callable[[], Any]] = None,
+    ):
         super().__init__()
         self.input_device_index = input_device_index
         self.always_listening = always_listening
+        # Rate the uploaded WAV is written at. None keeps the capture rate;
+        # 16000 resamples (and downmixes) client-side, since Whisper only uses
+        # 16 kHz and a 48 kHz upload is three times the bytes.
+        self.target_rate = target_rate
+        # Upload container: "wav" (finalize is a header patch), or "flac" /
+        # "opus" to trade a little CPU at release for fewer bytes on the wire.
+        self.codec = codec
+        # Trim leading/trailing non-speech before upload, and skip the upload
+        # entirely when the recording holds no speech (accidental taps).
+        self.trim_silence = trim_silence
+        self.vad_stats = VadStats()
+        # Bounds for a key that is held (or a release that is missed) forever:
+        # past ram_budget_bytes the capture spills to a memory-mapped temp
+        # file, and at max_seconds capture stops and max_duration_reached fires.
+        self.ram_budget_bytes = ram_budget_bytes
+        self.max_seconds = max_seconds
+        self._limit_reached = False
+        # Speculative mode: while recording, phrases that end in a pause are
+        # emitted as segment_ready so they can be transcribed before release;
+        # recording_finished then carries only the tail after the last cut.
+        # Pause detection and encoding run on their own thread, like the meter,
+        # so the GUI thread never scans the growing capture.
+        self.speculative = speculative
+        self._SEGMENT_POLL_MS = 250
+        self._MIN_SEGMENT_SECONDS = 6.0
+        self._segment_start = 0
+        self._segments_emitted = 0
+        self._segment_stop = threading.Event()
+        self._segment_thread: Optional[threading.Thread] = None
         self.is_recording = False
-        self.frames: List[bytes] = []
-        self.p = pyaudio.PyAudio()
+        # Where audio comes from: anything with PyAudio's open/terminate and
+        # device-query surface. Defaults to PortAudio; src.audio_sources has
+        # file and synthetic sources for headless runs and benchmarks.
+        self._source_factory = source_factory or pyaudio.PyAudio
+        self.p = self._source_factory()
         self.stream: Optional[pyaudio.Stream] = None
 
         # Audio Config
@@ -33,25 +81,36 @@ class AudioRecorder(QObject):
                           # per device (WASAPI only accepts the device's native rate).
         self.CHUNK = 1024
 
+        # Enumeration, native rates and format probes are cached here so that
+        # listing devices, switching device and reopening streams do not hit
+        # PortAudio again until refresh_devices (or the device set changes).
+        self.devices = DeviceCatalog(self.p, self.FORMAT)
+
         # The sample rate we actually open the stream at. Resolved from the
         # selected device each time a stream opens; the WAV is written at this
-        # rate and the Groq Whisper endpoint resamples server-side.
+        # rate unless target_rate asks for client-side resampling.
         self._capture_rate = self.RATE
 
         # Pre-roll ring buffer (~0.5s of audio). Always fed by the persistent
-        # stream so the moment recording starts we can seed self.frames with the
+        # stream so the moment recording starts we can seed the capture with the
         # audio captured just BEFORE the keypress (eliminates first-word clipping).
         self._PREROLL_SECONDS = 0.5
-        ring_len = max(1, int((self.RATE * self._PREROLL_SECONDS) / self.CHUNK))
-        self._ring: "collections.deque[bytes]" = collections.deque(maxlen=ring_len)
-
-        # Guards the seed of self.frames + the is_recording flip and the
-        # callback's append to self.frames so they never race.
-        self._lock = threading.Lock()
-
-        # Decimation counter for visualizer updates to reduce UI thread load
-        self._viz_counter = 0
-        self._viz_emit_every = 1
+        self._ring = PreRollRing(self._ring_capacity(self.RATE))
+
+        # Arena for the active recording. Preallocated when recording starts and
+        # written only by the audio callback, which makes no per-callback
+        # allocations. It is also the WAV being built: PCM lands behind a
+        # reserved header, so stopping only patches the length fields.
+        self._INITIAL_CAPTURE_SECONDS = 30
+        self._capture: Optional[Union[WavStreamEncoder, ResampledCapture]] = None
+        # Bumped by the audio callback on entry and on exit, so it is odd
+        # while a callback runs. Only the callback writes it; stop reads it to
+        # hand the capture over without a lock (see _take_capture).
+        self._callback_seq = 0
+
+        # Input levels for the visualizer, computed from the ring on the
+        # meter's own thread while recording (never in the audio callback).
+        self.meter = AudioMeter(self._ring)
 
     def start_listening(self) -> None:
         """Open the persistent pre-roll stream if always_listening. Idempotent."""
@@ -115,28 +174,59 @@ class AudioRecorder(QObject):
         WASAPI (the preferred host API) only accepts the device's native mixer
         rate in shared mode, so opening at a hardcoded 16 kHz fails with
         paInvalidSampleRate (-9997). We capture at the device's default rate
-        instead and let the Groq Whisper endpoint resample the uploaded WAV.
+        instead and resample to target_rate (or let Groq do it) afterwards.
         """
+        index = self.input_device_index
         try:
-            if self.input_device_index is not None:
-                info = self.p.get_device_info_by_index(self.input_device_index)
-            else:
-                info = self.p.get_default_input_device_info()
-            rate_val = info.get('defaultSampleRate')
-            if isinstance(rate_val, (int, float)) and rate_val > 0:
-                return int(round(rate_val))
+            rate = self.devices.native_rate(index)
         except Exception as e:
             logger.warning(f"Could not resolve device sample rate; using {self.RATE} Hz: {e}")
-        return self.RATE
+            return self.RATE
+        if rate is None:
+            return self.RATE
+        if not self.devices.supports(index, rate, self.CHANNELS) and self.devices.supports(index, self.RATE, self.CHANNELS):
+            logger.info(f"Device {index} rejects {rate} Hz; capturing at {self.RATE} Hz")
+            return self.RATE
+        return rate
+
+    def _ring_capacity(self, rate: int) -> int:
+        # A few chunks of slack past the pre-roll window keep the samples being
+        # seeded intact while the callback keeps writing during the seed copy.
+        return int(rate * self._PREROLL_SECONDS) + 4 * self.CHUNK
 
     def _prepare_capture_rate(self) -> None:
         """Resolve the capture rate for the current device and size the pre-roll
         ring (~_PREROLL_SECONDS) for that rate so pre-roll duration is correct."""
         self._capture_rate = self._resolve_capture_rate()
-        ring_len = max(1, int((self._capture_rate * self._PREROLL_SECONDS) / self.CHUNK))
-        if self._ring.maxlen != ring_len:
-            # Re-create with the correct capacity (ring is cleared right after).
-            self._ring = collections.deque(self._ring, maxlen=ring_len)
+        self._ring.resize(self._ring_capacity(self._capture_rate))
+
+    def _new_capture(self) -> Union[WavStreamEncoder, ResampledCapture]:
+        encoder_rate = self.target_rate or self._capture_rate
+        encoder = create_encoder(self.codec, encoder_rate, self._INITIAL_CAPTURE_SECONDS, self.ram_budget_bytes)
+        if encoder_rate == self._capture_rate:
+            return encoder
+        return ResampledCapture(encoder, StreamingResampler(self._capture_rate, encoder_rate))
+
+    def set_target_rate(self, rate: Optional[int]) -> None:
+        """Change the upload rate; takes effect from the next recording."""
+        self.target_rate = int(rate) if rate else None
+
+    def set_codec(self, codec: str) -> None:
+        """Change the upload codec; takes effect from the next recording."""
+        self.codec = str(codec or "wav")
+
+    def set_limits(self, ram_budget_bytes: Optional[int], max_seconds: Optional[float]) -> None:
+        """Change the RAM budget and maximum duration; takes effect from the next recording."""
+        self.ram_budget_bytes = int(ram_budget_bytes) if ram_budget_bytes else None
+        self.max_seconds = float(max_seconds) if max_seconds else None
+
+    def set_speculative(self, enabled: bool) -> None:
+        """Enable or disable mid-recording segments; takes effect from the next recording."""
+        self.speculative = bool(enabled)
+
+    def set_trim_silence(self, enabled: bool) -> None:
+        """Enable or disable silence trimming; takes effect from the next recording."""
+        self.trim_silence = bool(enabled)
 
     def update_device(self, device_index: int) -> None:
         self.input_device_index = device_index
@@ -157,17 +247,24 @@ class AudioRecorder(QObject):
                 self._open_persistent_stream()
                 if self.stream is None:
                     return
-            # Seed frames from the pre-roll ring and flip the flag atomically so
-            # the callback starts appending immediately after the seeded audio.
-            with self._lock:
-                self.frames = list(self._ring)
-                self.is_recording = True
+            # Seed the capture from the pre-roll ring with an index copy, then
+            # publish it. Chunks the callback writes to the ring in between are
+            # picked up by the callback itself via ring_mark, so no lock is needed.
+            capture = self._new_capture()
+            mark = self._ring.total
+            preroll = int(self._capture_rate * self._PREROLL_SECONDS)
+            self._ring.copy_range(mark - preroll, mark, capture)
+            capture.ring_mark = mark
+            self._capture = capture
+            self.is_recording = True
+            self.meter.start()
+            self._start_segmenting()
             return
 
         # Legacy path: open a fresh stream on demand.
         try:
-            self.frames = []
             self._prepare_capture_rate()
+            self._capture = self._new_capture()
             self.stream = self.p.open(
                 format=self.FORMAT,
                 channels=self.CHANNELS,
@@ -179,6 +276,8 @@ class AudioRecorder(QObject):
             )
             self.is_recording = True
             self.stream.start_stream()
+            self.meter.start()
+            self._start_segmenting()
         except Exception as e:
             logger.error(f"Failed to start recording: {e}")
             self.error_occurred.emit(f"Failed to start recording: {e}")
@@ -187,8 +286,10 @@ class AudioRecorder(QObject):
         if not self.is_recording:
             return
 
-        with self._lock:
-            self.is_recording = False
+        self.is_recording = False
+        # Joined before the tail is cut so _segment_start is final.
+        self._stop_segmenting()
+        self.meter.stop()
 
         if not self.always_listening:
             # Legacy path: close the on-demand stream.
@@ -200,35 +301,18 @@ class AudioRecorder(QObject):
         self._process_to_memory()
 
     def _audio_callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> Tuple[Optional[bytes], int]:
+        audio_data = np.frombuffer(in_data, dtype=np.int16)
+        self._callback_seq += 1
+        try:
+            self._write_capture(audio_data)
+        finally:
+            self._callback_seq += 1
+
         # Always feed the pre-roll ring (cheap) so we have audio from just before
         # the user pressed record.
-        self._ring.append(in_data)
+        self._ring.write(audio_data)
 
         if self.is_recording:
-            with self._lock:
-                # Re-check under the lock: stop_recording() may have flipped the
-                # flag between the check above and acquiring the lock.
-                if self.is_recording:
-                    self.frames.append(in_data)
-            # Calculate amplitude for visualizer
-            audio_data = np.frombuffer(in_data, dtype=np.int16)
-
-            # Prevent division by zero or empty errors
-            if len(audio_data) == 0:
-                self.visualizer_update.emit(0.0)
-                return (in_data, pyaudio.paContinue)
-
-            # Peak Amplitude Calculation (Optimized)
-            peak = np.max(np.abs(audio_data))
-
-            normalized_peak = self._normalize_peak_for_visualizer(int(peak))
-
-            # Emit at a controlled cadence to keep UI responsive without flooding.
-            self._viz_counter += 1
-            if self._viz_counter % self._viz_emit_every == 0:
-                self.visualizer_update.emit(normalized_peak)
-                self._viz_counter = 0
-
             return (in_data, pyaudio.paContinue)
 
         # Persistent (always-on) stream must keep running even when not recording.
@@ -238,144 +322,139 @@ class AudioRecorder(QObject):
         # Legacy stream is single-shot: signal completion so it can be closed.
         return (None, pyaudio.paComplete)
 
-    def _normalize_peak_for_visualizer(self, peak: int) -> float:
+    def _write_capture(self, audio_data: np.ndarray) -> None:
+        capture = self._capture if self.is_recording else None
+
+        if capture is not None and self.max_seconds and capture.duration >= self.max_seconds:
+            # Keep the ring fed but stop growing the capture; ask the owner
+            # (once) to stop the recording from its own thread.
+            capture = None
+            if not self._limit_reached:
+                self._limit_reached = True
+                self.max_duration_reached.emit()
+
+        if capture is not None:
+            if capture.ring_mark is not None:
+                # Catch up on chunks that reached the ring while start_recording
+                # was seeding this capture, so the audio stays contiguous.
+                self._ring.copy_range(capture.ring_mark, self._ring.total, capture)
+                capture.ring_mark = None
+            capture.write(audio_data)
+
+    def _take_capture(self) -> Optional[Union[WavStreamEncoder, ResampledCapture]]:
+        """Detach the capture once the callback is not writing to it.
+
+        Callbacks that start after the swap see no capture. One that was
+        already running may still hold it, so wait for it to return; that
+        is at most one buffer and the callback itself never waits.
         """
-        Map raw int16 peak amplitude into a visualizer-friendly 0..1 range.
-        A light non-linear curve makes low-volume speech more reactive.
+        capture, self._capture = self._capture, None
+        seq = self._callback_seq
+        if seq % 2:
+            deadline = time.monotonic() + 0.5
+            while self._callback_seq == seq and time.monotonic() < deadline:
+                time.sleep(0.0005)
+            if self._callback_seq == seq:
+                logger.warning("Audio callback did not return; finalizing the capture anyway")
+        return capture
+
+    def _start_segmenting(self) -> None:
+        self._limit_reached = False
+        self._segment_start = 0
+        self._segments_emitted = 0
+        if self.speculative and self._segment_thread is None:
+            self._segment_stop.clear()
+            self._segment_thread = threading.Thread(target=self._run_segmenter, name="AudioSegmenter", daemon=True)
+            self._segment_thread.start()
+
+    def _stop_segmenting(self) -> None:
+        thread, self._segment_thread = self._segment_thread, None
+        if thread is None:
+            return
+        self._segment_stop.set()
+        thread.join(timeout=1.0)
+
+    def _run_segmenter(self) -> None:
+        while not self._segment_stop.wait(self._SEGMENT_POLL_MS / 1000.0):
+            try:
+                self._poll_segments()
+            except Exception as e:  # a missed cut only means a longer tail
+                logger.debug(f"Segment poll failed: {e}")
+
+    def _poll_segments(self) -> None:
+        """Cut the capture at the first pause past the last cut and emit the phrase.
+
+        Runs on the segmenter thread while the callback keeps appending; the
+        capture view is lock-free, so this only reads what is already published.
+        segment_ready reaches GUI-thread receivers as a queued signal.
         """
-        linear = min(max(float(peak) / 7000.0, 0.0), 1.0)
-        return min((linear ** 0.72) * 1.18, 1.0)
+        capture = self._capture
+        if capture is None or not self.is_recording:
+            return
+        samples = capture.view()
+        rate = capture.sample_rate
+        cut = find_pause(samples, rate, self._segment_start, self._MIN_SEGMENT_SECONDS)
+        if cut is None:
+            return
+        segment = samples[self._segment_start:cut]
+        self._segment_start = cut
+        if find_speech_bounds(segment, rate) is None:
+            return
+        encoder = create_encoder(self.codec, rate, initial_seconds=segment.shape[0] / float(rate))
+        encoder.write(segment)
+        self._segments_emitted += 1
+        logger.info(f"Speculative segment {self._segments_emitted}: {segment.shape[0] / float(rate):.1f}s")
+        self.segment_ready.emit(encoder.finalize())
 
     def _process_to_memory(self) -> None:
-        """Process recorded audio to in-memory BytesIO buffer (zero disk latency)."""
+        """Finish the in-memory WAV and hand it off (zero disk I/O, zero copy)."""
         try:
-            if not self.frames:
+            # The callback may still be running (always-listening stream);
+            # after this it can no longer append to the capture we finalize.
+            capture = self._take_capture()
+            if capture is None or len(capture) == 0:
                 logger.warning("No audio frames to process")
                 self.error_occurred.emit("No audio recorded")
                 return
 
-            # Create in-memory WAV file
-            wav_buffer = io.BytesIO()
-            wf = wave.open(wav_buffer, 'wb')
-            wf.setnchannels(self.CHANNELS)
-            wf.setsampwidth(self.p.get_sample_size(self.FORMAT))
-            # Write at the rate we actually captured (matches the device's native
-            # rate so the WAV plays back at correct pitch; Groq resamples to 16kHz).
-            wf.setframerate(self._capture_rate)
-            wf.writeframes(b''.join(self.frames))
-            wf.close()
-
-            # Reset cursor to start for reading
-            wav_buffer.seek(0)
-
-            logger.info(f"Audio processed to memory buffer: {wav_buffer.getbuffer().nbytes} bytes")
-            self.recording_finished.emit(wav_buffer)
+            # With speculative segments out, only the tail after the last cut
+            # is left to upload.
+            start, end = self._segment_start, None
+            if self.trim_silence:
+                capture.flush()
+                samples = capture.view()
+                tail = samples[start:]
+                bounds = find_speech_bounds(tail, capture.sample_rate)
+                if bounds is None and not self._segments_emitted:
+                    self.vad_stats.record_skip(len(tail), capture.sample_rate)
+                    logger.info(f"No speech detected; skipped upload ({self.vad_stats.summary()})")
+                    self.no_speech_detected.emit()
+                    return
+                if bounds is None:
+                    # Silent tail: emit it empty so the segments still complete.
+                    bounds = (len(tail), len(tail))
+                end = start + bounds[1]
+                start = start + bounds[0]
+                self.vad_stats.record_trim(len(tail) - (end - start), capture.sample_rate)
+                logger.info(f"Trimmed recording to samples {start}-{end} of {len(samples)} ({self.vad_stats.summary()})")
+
+            # The container was written as audio arrived; finalizing only patches
+            # the header (and drains the resampler tail), so this is constant
+            # time regardless of length. Trimming moves the header, not the PCM.
+            # The arena now belongs to the emitted audio; the next recording
+            # gets a fresh one.
+            audio = capture.finalize(start, end)
+
+            logger.info(f"Audio processed to memory buffer: {audio.nbytes} bytes")
+            self.recording_finished.emit(audio)
 
         except Exception as e:
             logger.error(f"Failed to process audio to memory: {e}")
             self.error_occurred.emit(f"Failed to process audio: {e}")
 
-    # Host API preference + display labels (Windows). WASAPI is the modern,
-    # low-latency API and exposes virtual devices like NVIDIA Broadcast; we list
-    # it first and collapse the same physical mic that Windows ALSO exposes
-    # through the older MME / DirectSound / WDM-KS subsystems into one entry.
-    _HOST_API_PRIORITY = [
-        ("wasapi", "WASAPI"),
-        ("wdm-ks", "WDM-KS"),
-        ("directsound", "DirectSound"),
-        ("mme", "MME"),
-    ]
-
-    @classmethod
-    def _host_api_label_and_rank(cls, host_api_name: Optional[str]) -> Tuple[str, int]:
-        """Map a PortAudio host API name to a short label and a preference rank."""
-        name = (host_api_name or "").lower()
-        for rank, (needle, label) in enumerate(cls._HOST_API_PRIORITY):
-            if needle in name:
-                return label, rank
-        # Unknown/other host APIs sort after the known ones but are still shown.
-        return (host_api_name or "Audio"), len(cls._HOST_API_PRIORITY)
-
-    @staticmethod
-    def _normalize_device_name(name: Optional[str]) -> str:
-        return "".join(ch for ch in (name or "").lower() if ch.isalnum())
-
-    @staticmethod
-    def _is_same_device(key: str, seen_key: str) -> bool:
-        """True if two normalized device names refer to the same physical mic.
-
-        Exact match, or one name is a prefix of the other for reasonably long
-        names — this collapses MME's truncated (~31 char) name onto the full
-        WASAPI name without merging genuinely distinct devices.
-        """
-        if not key or not seen_key:
-            return False
-        if key == seen_key:
-            return True
-        if min(len(key), len(seen_key)) >= 12 and (
-            key.startswith(seen_key) or seen_key.startswith(key)
-        ):
-            return True
-        return False
-
     def list_devices(self) -> List[Tuple[int, str]]:
-        """List input devices, one clean entry per physical microphone.
-
-        Enumerates ALL host APIs (so virtual/late devices like NVIDIA Broadcast
-        appear), then collapses the same mic that Windows exposes through several
-        audio subsystems into a single entry, preferring WASAPI. The GLOBAL
-        device index (device_info["index"]) is the stored id, and every
-        per-device query is wrapped in try/except so one bad/warming-up device
-        cannot blank the entire list.
-        """
-        try:
-            host_api_count = self.p.get_host_api_count()
-        except Exception as e:
-            logger.error(f"Error querying host APIs: {e}")
-            return []
-
-        # 1) Gather every input device with its host API label + preference rank.
-        candidates: List[Tuple[int, int, str, str]] = []  # (rank, index, name, label)
-        for host_api_index in range(host_api_count):
-            try:
-                host_info = self.p.get_host_api_info_by_index(host_api_index)
-                num_devices = host_info.get('deviceCount') or 0
-                label, rank = self._host_api_label_and_rank(host_info.get('name'))
-            except Exception as e:
-                logger.warning(f"Skipping host API {host_api_index}: {e}")
-                continue
-
-            for i in range(num_devices):
-                try:
-                    device_info = self.p.get_device_info_by_host_api_device_index(host_api_index, i)
-                    if (device_info.get('maxInputChannels') or 0) <= 0:
-                        continue
-                    global_index = device_info.get('index')
-                    name = device_info.get('name')
-                    if global_index is None or not name:
-                        continue
-                    candidates.append((rank, int(global_index), name, label))
-                except Exception as e:
-                    # One bad/warming-up device must not drop the whole list.
-                    logger.warning(f"Skipping device {i} on host API {host_api_index}: {e}")
-                    continue
-
-        # 2) In host-API preference order, keep one entry per physical device.
-        candidates.sort(key=lambda c: (c[0], c[1]))
-        devices: List[Tuple[int, str]] = []
-        seen_indices: set = set()
-        seen_keys: List[str] = []
-        for _rank, global_index, name, label in candidates:
-            if global_index in seen_indices:
-                continue
-            key = self._normalize_device_name(name)
-            if any(self._is_same_device(key, s) for s in seen_keys):
-                continue
-            seen_indices.add(global_index)
-            seen_keys.append(key)
-            devices.append((global_index, f"{name} ({label})"))
-
-        return devices
+        """List input devices, one clean entry per physical microphone (cached)."""
+        return self.devices.list_devices()
 
     def refresh_devices(self) -> List[Tuple[int, str]]:
         """Re-init PortAudio so hot-plugged mics appear, then enumerate.
@@ -391,7 +470,8 @@ class AudioRecorder(QObject):
                 self.p.terminate()
             except Exception as e:
                 logger.error(f"Error terminating PortAudio: {e}")
-            self.p = pyaudio.PyAudio()
+            self.p = self._source_factory()
+            self.devices.refresh(self.p)
             # Reopen the persistent stream on the fresh PortAudio instance.
             if was_listening or self.always_listening:
                 self.start_listening()
@@ -0,0 +1,150 @@
+from math import gcd
+from typing import Optional
+
+import numpy as np
+
+from src.audio_encoding import EncodedAudio, WavStreamEncoder
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def _design_polyphase_filter(up: int, down: int, zero_crossings: int, beta: float) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass split into ``up`` polyphase branches.
+
+    Row ``p`` holds taps ``h[p], h[p + up], h[p + 2*up], ...`` so an output
+    sample is one dot product of a row with the most recent input samples.
+    """
+    factor = max(up, down)
+    half_len = zero_crossings * factor
+    n = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    # Cutoff at the lower Nyquist, expressed at the upsampled rate, with a
+    # little roll-off so the transition band sits below it.
+    cutoff = 0.5 / factor * 0.94
+    taps = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.kaiser(n.shape[0], beta) * up
+    per_phase = -(-taps.shape[0] // up)
+    padded = np.zeros(per_phase * up, dtype=np.float64)
+    padded[:taps.shape[0]] = taps
+    return padded.reshape(per_phase, up).T.astype(np.float32)
+
+
+class StreamingResampler:
+    """Incremental polyphase FIR resampler with multi-channel downmix.
+
+    ``process`` accepts int16 or float chunks of any size, shaped ``(n,)`` or
+    ``(n, channels)``, and returns the int16 mono output available so far.
+    Filter state carries across calls, so feeding a signal in pieces yields the
+    same samples as feeding it at once. ``flush`` drains the filter tail.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int = WHISPER_SAMPLE_RATE,
+                 zero_crossings: int = 16, beta: float = 8.6):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        g = gcd(self.in_rate, self.out_rate)
+        self._up = self.out_rate // g
+        self._down = self.in_rate // g
+        self._phases = _design_polyphase_filter(self._up, self._down, zero_crossings, beta)
+        self._taps = self._phases.shape[1]
+        self._offsets = np.arange(self._taps)
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        # Upsampled-domain position of the next output relative to the start of
+        # the history, advanced by the filter's group delay so output sample 0
+        # lines up with input sample 0.
+        self._next = (self._taps - 1) * self._up + zero_crossings * max(self._up, self._down)
+        self._consumed = 0
+        self._produced = 0
+
+    @property
+    def passthrough(self) -> bool:
+        return self.in_rate == self.out_rate
+
+    @staticmethod
+    def _to_mono_float(samples: np.ndarray) -> np.ndarray:
+        data = np.asarray(samples)
+        if data.ndim == 2:
+            data = data.mean(axis=1, dtype=np.float32)
+        return data.astype(np.float32, copy=False)
+
+    def _run(self, chunk: np.ndarray) -> np.ndarray:
+        buf = np.concatenate((self._history, chunk))
+        limit = buf.shape[0] * self._up
+        if self._next >= limit:
+            out = np.empty(0, dtype=np.float32)
+        else:
+            positions = np.arange(self._next, limit, self._down)
+            base = positions // self._up
+            phase = positions % self._up
+            # Output m is sum_j h[phase + j*up] * x[base - j].
+            windows = buf[base[:, None] - self._offsets[None, :]]
+            out = np.einsum("ij,ij->i", windows, self._phases[phase])
+            self._next = int(positions[-1]) + self._down
+        keep = self._taps - 1
+        self._next -= (buf.shape[0] - keep) * self._up
+        self._history = buf[buf.shape[0] - keep:].copy()
+        return out
+
+    @staticmethod
+    def _to_int16(values: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(values), -32768, 32767).astype(np.int16)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        chunk = self._to_mono_float(samples)
+        self._consumed += chunk.shape[0]
+        if self.passthrough:
+            self._produced += chunk.shape[0]
+            return self._to_int16(chunk)
+        out = self._run(chunk)
+        self._produced += out.shape[0]
+        return self._to_int16(out)
+
+    def flush(self) -> np.ndarray:
+        """Emit the remaining output, padding the input with silence."""
+        if self.passthrough:
+            return np.empty(0, dtype=np.int16)
+        expected = -(-self._consumed * self._up // self._down)
+        missing = expected - self._produced
+        if missing <= 0:
+            return np.empty(0, dtype=np.int16)
+        out = self._run(np.zeros(self._taps, dtype=np.float32))[:missing]
+        self._produced += out.shape[0]
+        return self._to_int16(out)
+
+
+class ResampledCapture:
+    """Capture sink that resamples each chunk before it reaches the encoder.
+
+    Presents the same ``write``/``view``/``finalize`` surface as the encoder so
+    the recorder's callback and pre-roll seeding stay unchanged. Like the
+    encoder it is not thread-safe: the recorder takes it away from the
+    callback before calling ``flush`` or ``finalize``.
+    """
+
+    def __init__(self, encoder: WavStreamEncoder, resampler: StreamingResampler):
+        self.encoder = encoder
+        self.resampler = resampler
+        self.ring_mark: Optional[int] = None
+
+    @property
+    def sample_rate(self) -> int:
+        return self.encoder.sample_rate
+
+    def __len__(self) -> int:
+        return len(self.encoder)
+
+    @property
+    def duration(self) -> float:
+        return self.encoder.duration
+
+    def write(self, samples: np.ndarray) -> None:
+        self.encoder.write(self.resampler.process(samples))
+
+    def view(self) -> np.ndarray:
+        return self.encoder.view()
+
+    def flush(self) -> None:
+        """Drain the resampler tail into the encoder. Safe to call twice."""
+        self.encoder.write(self.resampler.flush())
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> EncodedAudio:
+        self.flush()
+        return self.encoder.finalize(start, end)
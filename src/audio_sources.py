@@ -0,0 +1,273 @@
+import importlib
+import logging
+import threading
+import time
+import wave
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyaudio
+
+from src.audio_resample import StreamingResampler
+
+logger = logging.getLogger(__name__)
+
+# A source is anything with PyAudio's surface as used by AudioRecorder and
+# DeviceCatalog: open(...) -> stream, terminate(), and the device queries.
+# pyaudio.PyAudio itself is the PortAudio backend; the classes below stand in
+# for it without sound hardware.
+SourceFactory = Callable[[], Any]
+
+PatternStep = Tuple[str, float, float]  # (kind, seconds, frequency Hz or level)
+
+
+def load_audio_file(path: str) -> Tuple[np.ndarray, int]:
+    """Read a WAV (or, with soundfile installed, FLAC/OGG) file as int16.
+
+    Returns ``(samples, rate)``; samples are ``(n,)`` or ``(n, channels)``.
+    """
+    if str(path).lower().endswith(".wav"):
+        with wave.open(str(path), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+            channels = wf.getnchannels()
+            rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return (samples if channels == 1 else samples.reshape(-1, channels)), rate
+    try:
+        soundfile = importlib.import_module("soundfile")
+    except Exception as e:
+        raise ValueError(f"{path}: soundfile is required for non-WAV input") from e
+    samples, rate = soundfile.read(str(path), dtype="int16")
+    return samples, int(rate)
+
+
+def render_pattern(pattern: Sequence[PatternStep], rate: int, seed: int = 0) -> np.ndarray:
+    """Render ``("tone", seconds, hz)``, ``("noise", seconds, level)`` and
+    ``("silence", seconds, 0)`` steps into one int16 signal.
+
+    Tones play at a fixed speech-like level (-12 dBFS); noise ``level`` is
+    the standard deviation in int16 units. The output is deterministic for a
+    given ``seed``.
+    """
+    rng = np.random.default_rng(seed)
+    pieces: List[np.ndarray] = []
+    for kind, seconds, value in pattern:
+        count = int(round(seconds * rate))
+        if kind == "tone":
+            t = np.arange(count) / float(rate)
+            pieces.append(np.sin(2 * np.pi * value * t) * 8000.0)
+        elif kind == "noise":
+            pieces.append(rng.normal(0.0, value, count))
+        elif kind == "silence":
+            pieces.append(np.zeros(count))
+        else:
+            raise ValueError(f"Unknown pattern step: {kind!r}")
+    signal = np.concatenate(pieces) if pieces else np.zeros(0)
+    return np.clip(np.rint(signal), -32768, 32767).astype(np.int16)
+
+
+def parse_pattern(text: str) -> List[PatternStep]:
+    """Parse ``"tone:1.5:220,silence:0.5,noise:0.3:40"`` into pattern steps."""
+    steps: List[PatternStep] = []
+    for item in text.split(","):
+        parts = item.strip().split(":")
+        if not parts or not parts[0]:
+            continue
+        kind = parts[0]
+        seconds = float(parts[1]) if len(parts) > 1 else 1.0
+        default = 220.0 if kind == "tone" else 30.0
+        value = float(parts[2]) if len(parts) > 2 else default
+        steps.append((kind, seconds, value))
+    return steps
+
+
+class SimulatedStream:
+    """Delivers a source's samples to a PyAudio-style stream callback.
+
+    A thread hands ``frames_per_buffer`` chunks to the callback. In realtime
+    mode the chunks arrive one buffer period apart on a monotonic clock, like
+    a device; a callback that falls more than a period behind is flagged
+    with paInputOverflow. Otherwise they arrive as fast as the callback
+    returns.
+    """
+
+    def __init__(self, source: "SimulatedSource", rate: int, frames_per_buffer: int,
+                 callback: Callable[..., Tuple[Optional[bytes], int]]):
+        self._source = source
+        self._rate = int(rate)
+        self._frames = int(frames_per_buffer)
+        self._callback = callback
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.callbacks = 0
+        self.overflows = 0
+
+    def start_stream(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SimulatedStream", daemon=True)
+        self._thread.start()
+
+    def stop_stream(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def close(self) -> None:
+        self.stop_stream()
+
+    def is_active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        period = self._frames / float(self._rate)
+        started = time.perf_counter()
+        deadline = started
+        while not self._stop.is_set():
+            chunk = self._source.read(self._rate, self._frames)
+            if chunk is None:
+                break
+            status = 0
+            if self._source.realtime:
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    if self._stop.wait(delay):
+                        break
+                elif delay < -period:
+                    status = pyaudio.paInputOverflow
+                    self.overflows += 1
+            now = time.perf_counter() - started
+            time_info = {"input_buffer_adc_time": now - period, "current_time": now, "output_buffer_dac_time": 0.0}
+            self.callbacks += 1
+            _, flag = self._callback(chunk.tobytes(), self._frames, time_info, status)
+            if flag != pyaudio.paContinue:
+                break
+
+
+class SimulatedSource:
+    """A PyAudio stand-in with one virtual input device fed from an array.
+
+    ``open`` returns a SimulatedStream, converting the signal to the
+    requested rate if needed. Streams share one read position, so closing and
+    reopening continues where the last stream stopped, like a live mic. At
+    the end the signal loops if ``loop`` is set. Otherwise realtime sources
+    keep delivering silence, as a device would, and fast sources end their
+    stream. ``drained`` is set once every sample has been delivered.
+    """
+
+    def __init__(self, samples: np.ndarray, rate: int, realtime: bool = True,
+                 loop: bool = False, name: str = "Simulated input"):
+        data = np.asarray(samples)
+        self._channels = 1 if data.ndim == 1 else int(data.shape[1])
+        self._samples = data
+        self.rate = int(rate)
+        self.realtime = bool(realtime)
+        self.loop = bool(loop)
+        self.name = name
+        self.drained = threading.Event()
+        self.streams: List[SimulatedStream] = []
+        self._by_rate: Dict[int, np.ndarray] = {}
+        self._position = 0.0  # seconds into the signal
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return self._samples.shape[0] / float(self.rate)
+
+    # -- PyAudio surface -------------------------------------------------
+    def open(self, rate: int, frames_per_buffer: int = 1024, stream_callback=None, **_kwargs) -> SimulatedStream:
+        if stream_callback is None:
+            raise ValueError("SimulatedSource only supports callback streams")
+        stream = SimulatedStream(self, rate, frames_per_buffer, stream_callback)
+        self.streams.append(stream)
+        return stream
+
+    def terminate(self) -> None:
+        for stream in self.streams:
+            stream.stop_stream()
+
+    def _device_info(self) -> Dict[str, Any]:
+        return {
+            "index": 0,
+            "name": self.name,
+            "maxInputChannels": self._channels,
+            "defaultSampleRate": float(self.rate),
+            "hostApi": 0,
+        }
+
+    def get_host_api_count(self) -> int:
+        return 1
+
+    def get_device_count(self) -> int:
+        return 1
+
+    def get_host_api_info_by_index(self, index: int) -> Dict[str, Any]:
+        return {"index": index, "name": "Simulated", "deviceCount": 1}
+
+    def get_device_info_by_host_api_device_index(self, host_api: int, index: int) -> Dict[str, Any]:
+        return self._device_info()
+
+    def get_device_info_by_index(self, index: int) -> Dict[str, Any]:
+        return self._device_info()
+
+    def get_default_input_device_info(self) -> Dict[str, Any]:
+        return self._device_info()
+
+    def is_format_supported(self, rate, **_kwargs) -> bool:
+        return True  # any rate: the signal is resampled on open
+
+    # -- sample delivery -------------------------------------------------
+    def _signal_at(self, rate: int) -> np.ndarray:
+        signal = self._by_rate.get(rate)
+        if signal is None:
+            resampler = StreamingResampler(self.rate, rate)
+            signal = np.concatenate((resampler.process(self._samples), resampler.flush()))
+            self._by_rate[rate] = signal
+        return signal
+
+    def read(self, rate: int, frames: int) -> Optional[np.ndarray]:
+        """Next ``frames`` mono int16 samples at ``rate``; None ends the stream."""
+        signal = self._signal_at(rate)
+        with self._lock:
+            start = int(round(self._position * rate))
+            chunk = signal[start:start + frames]
+            if chunk.shape[0] < frames:
+                self.drained.set()
+                if self.loop and signal.shape[0]:
+                    reps = -(-(frames - chunk.shape[0]) // signal.shape[0])
+                    chunk = np.concatenate((chunk, np.tile(signal, reps)))[:frames]
+                elif chunk.shape[0] == 0 and not self.realtime:
+                    return None
+                else:
+                    chunk = np.concatenate((chunk, np.zeros(frames - chunk.shape[0], dtype=np.int16)))
+            self._position += frames / float(rate)
+            if self.loop and signal.shape[0]:
+                self._position %= signal.shape[0] / float(rate)
+        return chunk
+
+    # -- factories -------------------------------------------------------
+    def factory(self) -> SourceFactory:
+        """A ``source_factory`` for AudioRecorder that always returns this source."""
+        return lambda: self
+
+
+class FileSource(SimulatedSource):
+    """Replays a recorded WAV/FLAC file as the microphone."""
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False):
+        samples, rate = load_audio_file(path)
+        super().__init__(samples, rate, realtime=realtime, loop=loop, name=f"File: {path}")
+
+
+class SyntheticSource(SimulatedSource):
+    """Generates tone / noise / silence patterns as the microphone."""
+
+    def __init__(self, pattern: Union[str, Sequence[PatternStep]], rate: int = 48000,
+                 realtime: bool = True, loop: bool = False, seed: int = 0):
+        steps = parse_pattern(pattern) if isinstance(pattern, str) else list(pattern)
+        super().__init__(render_pattern(steps, rate, seed), rate, realtime=realtime, loop=loop,
+                         name="Synthetic input")
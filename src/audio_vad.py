@@ -0,0 +1,141 @@
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechBounds(NamedTuple):
+    start: int
+    end: int
+
+
+def frame_energy_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS level in dBFS of each whole ``frame_len`` frame of int16 samples."""
+    frame_count = int(samples.shape[0]) // frame_len
+    if frame_count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len).astype(np.float32)
+    power = np.einsum("ij,ij->i", frames, frames) / (frame_len * 32768.0 * 32768.0)
+    return 10.0 * np.log10(np.maximum(power, 1e-12))
+
+
+def speech_threshold_db(
+    energy: np.ndarray,
+    floor_offset_db: float = 12.0,
+    min_threshold_db: float = -55.0,
+) -> float:
+    """Frame level above which audio counts as speech.
+
+    Tracks the recording's own noise floor (its quietest tenth of frames) plus
+    ``floor_offset_db``, but never below ``min_threshold_db`` so a dead-silent
+    mic does not flag hiss as speech. A recording without quiet frames to
+    measure the floor from (its loud frames sit within ``floor_offset_db`` of
+    its quiet ones) is voiced throughout, however softly, so only the
+    absolute ``min_threshold_db`` applies.
+    """
+    if not energy.shape[0]:
+        return min_threshold_db
+    floor, loud = (float(level) for level in np.percentile(energy, (10, 90)))
+    if loud - floor < floor_offset_db:
+        return min_threshold_db
+    return max(floor + floor_offset_db, min_threshold_db)
+
+
+def _runs(mask: np.ndarray):
+    """Start and end frame indices of each run of True in ``mask``."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def find_speech_bounds(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: float = 20.0,
+    margin_ms: float = 250.0,
+    min_speech_ms: float = 80.0,
+    floor_offset_db: float = 12.0,
+    min_threshold_db: float = -55.0,
+) -> Optional[SpeechBounds]:
+    """Locate the voiced part of a recording by frame energy.
+
+    Frames above ``speech_threshold_db`` are voiced; runs of voiced frames
+    shorter than ``min_speech_ms`` (key clicks, pops) are ignored. Returns sample offsets widened by
+    ``margin_ms`` on both sides, or None when nothing sounds like speech.
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000.0))
+    energy = frame_energy_db(samples, frame_len)
+    if energy.shape[0] == 0:
+        return None
+
+    threshold = speech_threshold_db(energy, floor_offset_db, min_threshold_db)
+    voiced = energy > threshold
+
+    # Run-length filter: keep only voiced runs long enough to be speech.
+    starts, ends = _runs(voiced)
+    min_frames = max(1, int(np.ceil(min_speech_ms / frame_ms)))
+    keep = (ends - starts) >= min_frames
+    if not keep.any():
+        return None
+
+    margin = int(sample_rate * margin_ms / 1000.0)
+    total = int(samples.shape[0])
+    start = max(0, int(starts[keep][0]) * frame_len - margin)
+    end = min(total, int(ends[keep][-1]) * frame_len + margin)
+    return SpeechBounds(start, end)
+
+
+def find_pause(
+    samples: np.ndarray,
+    sample_rate: int,
+    start: int = 0,
+    min_segment_seconds: float = 6.0,
+    pause_ms: float = 400.0,
+    frame_ms: float = 20.0,
+) -> Optional[int]:
+    """Sample offset to cut at, mid-way through a pause, or None.
+
+    Looks in ``samples[start:]`` for a run of non-speech frames of at least
+    ``pause_ms`` whose midpoint leaves the segment before it at least
+    ``min_segment_seconds`` long. Used to hand finished phrases to the
+    transcriber while the user is still talking.
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000.0))
+    energy = frame_energy_db(samples[start:], frame_len)
+    min_frames = int(min_segment_seconds * 1000.0 / frame_ms)
+    if energy.shape[0] <= min_frames:
+        return None
+
+    quiet = energy <= speech_threshold_db(energy)
+    starts, ends = _runs(quiet)
+    mids = (starts + ends) // 2
+    usable = ((ends - starts) * frame_ms >= pause_ms) & (mids >= min_frames)
+    if not usable.any():
+        return None
+    return start + int(mids[usable][0]) * frame_len
+
+
+class VadStats:
+    """Running totals of what silence trimming saved this session."""
+
+    def __init__(self):
+        self.recordings = 0
+        self.trimmed_seconds = 0.0
+        self.trimmed_bytes = 0
+        self.calls_avoided = 0
+
+    def record_trim(self, trimmed_samples: int, sample_rate: int) -> None:
+        self.recordings += 1
+        self.trimmed_seconds += trimmed_samples / float(sample_rate)
+        self.trimmed_bytes += trimmed_samples * 2
+
+    def record_skip(self, samples: int, sample_rate: int) -> None:
+        self.record_trim(samples, sample_rate)
+        self.calls_avoided += 1
+
+    def summary(self) -> str:
+        return (
+            f"{self.trimmed_seconds:.1f}s / {self.trimmed_bytes} PCM bytes trimmed, "
+            f"{self.calls_avoided} API calls avoided over {self.recordings} recordings"
+        )
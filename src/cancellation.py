@@ -0,0 +1,40 @@
+import itertools
+import threading
+from typing import Optional
+
+_job_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job whose CancelToken was cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation for one pipeline job.
+
+    ``cancel`` may be called from any thread. Clients check the token before
+    each request attempt and between stream chunks, so a job running on a
+    worker thread stops at the next of those points. Jobs on the engine's
+    loop are also cancelled as asyncio tasks, which closes their requests
+    at once. ``job_id`` tells a job's results apart from a newer job's.
+    """
+
+    def __init__(self):
+        self.job_id = next(_job_ids)
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled.")
+
+
+def raise_if_cancelled(token: Optional[CancelToken]) -> None:
+    if token is not None:
+        token.raise_if_cancelled()
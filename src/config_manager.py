@@ -2,6 +2,7 @@ import json
 import os
 from pathlib import Path
 import logging
+from typing import List
 from src.secret_store import ApiKeyStore
 
 logger = logging.getLogger(__name__)
@@ -16,18 +17,77 @@ else:
 
 DEFAULT_CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Config keys kept in OS credential storage, and their account names.
+SECRET_ACCOUNTS = {
+    "api_key": "groq_api_key",
+    "gemini_api_key": "gemini_api_key",
+}
+
 DEFAULT_CONFIG = {
     "api_key": "",
     "gemini_api_key": "",
+    # Further keys per provider, used alongside the one above and failed over
+    # to when it is throttled or rejected. Entries are "" while the key itself
+    # lives in secure storage (see ConfigManager.set_key_pool).
+    "api_key_pool": [],
+    "gemini_api_key_pool": [],
     "gemini_model": "models/gemma-4-31b-it",
-    # "transcription_model" removed — TranscriptionWorker uses whisper-large-v3 directly.
-    # Add back here and wire to TranscriptionWorker if model selection is needed in future.
+    # Speech-to-text backends, tried in order with failover: "groq" and
+    # "local", any OpenAI-compatible /audio/transcriptions server such as a
+    # self-hosted whisper on the LAN (skipped while its URL is empty).
+    "transcription_backends": ["groq", "local"],
+    "transcription_model": "whisper-large-v3",
+    "local_transcription_url": "",  # e.g. http://192.168.1.20:8000/v1
+    "local_transcription_model": "whisper-1",
     "formatter_model": "openai/gpt-oss-120b",  # Default fast/smart model
     # Single formatter style mode:
     # retained for backward-compatibility with older configs; only "Default" is used.
     "formatting_style": "Default",
     "input_device_index": None, # None means default
     "always_listening": True,  # keep mic stream open for pre-roll (no first-word clipping)
+    "resample_to_16k": True,  # downsample/downmix to 16 kHz mono before upload (Whisper's native rate)
+    # Upload container: "wav" (no encode cost), "flac" (lossless, ~half the
+    # bytes) or "opus" (Ogg/Opus, lowest bytes). See scripts/audio_codec_benchmark.py.
+    "upload_codec": "wav",
+    "trim_silence": True,  # trim non-speech before upload; skip uploads with no speech
+    # Long dictations are cut at pauses into segments of at most this many
+    # seconds and transcribed in parallel by up to segment_concurrency uploads.
+    "segment_max_seconds": 60,
+    "segment_concurrency": 4,
+    # Send phrases to Groq at pauses while the hotkey is still held, so only
+    # the last phrase is left to transcribe on release.
+    "speculative_transcription": False,
+    # A recording past this much RAM spills to a memory-mapped temp file, and
+    # one longer than max_recording_seconds stops itself (e.g. missed release).
+    "recording_ram_budget_mb": 64,
+    "max_recording_seconds": 900,
+    # Open HTTPS connections to Groq/Gemini on hotkey press, while the user is
+    # still speaking; pooled connections idle this long are closed.
+    "prewarm_connections": True,
+    "http_idle_expiry_seconds": 90,
+    # Transcription/formatting calls: per-attempt timeout, total attempts for
+    # timeouts / 429 / 5xx, and whether to fire a duplicate request once one
+    # runs past the p95 latency of recent calls.
+    "request_timeout_seconds": 30,
+    "request_max_attempts": 3,
+    "request_hedging": False,
+    # Longest a request is held client-side when Groq's rate-limit headers
+    # say it would be rejected; past that it is sent and retried on 429.
+    "rate_limit_max_wait_seconds": 10,
+    # Recent transcripts and formatter outputs kept for "Retry Last
+    # Dictation" and identical re-submissions.
+    "stage_cache_entries": 32,
+    # Type the formatter's output sentence by sentence as it streams in,
+    # instead of pasting it all once complete (one paste per burst).
+    "stream_formatter": False,
+    # Format short dictation that is already clean (no fillers, lists, math
+    # or self-corrections) locally instead of calling the LLM formatter.
+    "local_format_fast_path": True,
+    # On-disk cache of formatter/translator outputs for repeated phrases,
+    # keyed by text, model and full prompt; cleared when prompts.py changes.
+    "format_cache_enabled": True,
+    "format_cache_max_entries": 2000,
+    "format_cache_ttl_days": 30,
     "appearance_mode": "auto",  # auto | dark | light
     "animation_fps": 100,
     # Streaming answer reveal behavior in the floating visualizer.
@@ -57,8 +117,7 @@ class ConfigManager:
         """
         self.config_file = Path(config_file) if config_file else DEFAULT_CONFIG_FILE
         self._secret_stores = {
-            "api_key": ApiKeyStore(account_name="groq_api_key"),
-            "gemini_api_key": ApiKeyStore(account_name="gemini_api_key"),
+            key_name: ApiKeyStore(account_name=account) for key_name, account in SECRET_ACCOUNTS.items()
         }
         self._ensure_config_exists()
         self.config = self._load_config()
@@ -166,6 +225,36 @@ class ConfigManager:
 
         self.config[key] = value
 
+    def _pool_store(self, key_name: str, index: int) -> ApiKeyStore:
+        # Extra keys are separate accounts next to the primary one:
+        # groq_api_key_2, groq_api_key_3, ...
+        return ApiKeyStore(account_name=f"{SECRET_ACCOUNTS[key_name]}_{index + 2}")
+
+    def get_key_pool(self, key_name: str) -> List[str]:
+        """The extra keys stored for ``key_name`` ("api_key" or "gemini_api_key")."""
+        keys = []
+        for index, plaintext in enumerate(self.config.get(f"{key_name}_pool") or []):
+            value = str(plaintext or "").strip() or self._pool_store(key_name, index).get_api_key()
+            if value:
+                keys.append(value)
+        return keys
+
+    def set_key_pool(self, key_name: str, keys: List[str]) -> None:
+        """Replace the extra keys for ``key_name``, in secure storage where available."""
+        cleaned = [str(key or "").strip() for key in keys]
+        cleaned = [key for key in cleaned if key]
+        slots = []
+        for index, value in enumerate(cleaned):
+            store = self._pool_store(key_name, index)
+            if store.is_available and store.set_api_key(value):
+                slots.append("")
+            else:
+                logger.warning("Secure API key storage unavailable for %s pool; falling back to config.json.", key_name)
+                slots.append(value)
+        for index in range(len(cleaned), len(self.config.get(f"{key_name}_pool") or [])):
+            self._pool_store(key_name, index).clear_api_key()
+        self.config[f"{key_name}_pool"] = slots
+
     def save(self):
         """Persist current configuration to disk."""
         return self._save_config(self.config)
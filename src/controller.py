@@ -5,24 +5,38 @@ import keyboard
 import pyperclip
 import logging
 import io
-from typing import Optional, Any
+import functools
+from typing import Optional, Any, Callable, Dict, Tuple, Union
 from groq import Groq as GroqRaw, AuthenticationError as GroqAuthError, APIConnectionError as GroqConnError
 from PyQt6.QtWidgets import QApplication, QDialog, QSystemTrayIcon, QMenu
 from PyQt6.QtCore import QObject, pyqtSignal, QByteArray, QBuffer, QIODevice, Qt, QTimer, QMimeData
 from PyQt6.QtGui import QIcon, QAction, QCursor
 
 
-from src.config_manager import ConfigManager
+from src.config_manager import CONFIG_DIR, ConfigManager
 from src import autostart
 from src.audio_recorder import AudioRecorder
+from src.audio_resample import WHISPER_SAMPLE_RATE
 from src.groq_client import GroqClient
 from src.gemini_client import GeminiClient
+from src.http_transport import ConnectionManager
+from src.request_policy import RequestPolicy
+from src.rate_limiter import RateLimitScheduler
+from src.stream_coalescer import StreamCoalescer
 from src.hotkey_manager import HotkeyManager
 from src.ui_main_window import MainWindow
 from src.ui_onboarding import SetupMessageDialog, ApiKeyInputDialog
 from src.ui_visualizer import AudioVisualizer
 from src.ui_screen_snip import ScreenRegionSelector
 from src.services.groq_service import TranscriptionWorker, SearchWorker
+from src.pipeline_engine import PipelineEngine
+from src.stage_cache import StageCache
+from src.stream_formatting import IncrementalPaster
+from src.local_formatter import LocalFormatter
+from src.format_cache import FormatCache
+from src.segmented_transcription import SegmentedTranscriber, SpeculativeTranscriber
+from src.transcription_backends import BackendRouter, GroqBackend, OpenAICompatibleBackend
+from src.prompts import TRANSCRIPTION_PROMPT
 from src.debug_trace import configure_debug_trace, trace_widget_event
 
 # Configure logger
@@ -92,12 +106,54 @@ class WhisperAppController(QObject):
 
         # Check for first run (no API key) and prompt before initializing
         self._check_first_run_api_key()
-        self.groq = GroqClient(self.config.get("api_key"))
-        self.gemini = GeminiClient(self.config.get("gemini_api_key"))
+        # Both API clients share one keep-alive pool, warmed on hotkey press.
+        self.connections = ConnectionManager(
+            idle_expiry_seconds=float(self.config.get("http_idle_expiry_seconds", 90) or 90)
+        )
+        # API pipelines run as tasks on one long-lived asyncio loop; results
+        # come back to the GUI thread through the engine's Qt bridge.
+        self.engine = PipelineEngine()
+        self.connections.attach_loop(self.engine.loop)
+        self.request_policy = RequestPolicy(
+            timeout_seconds=float(self.config.get("request_timeout_seconds", 30) or 30),
+            max_attempts=int(self.config.get("request_max_attempts", 3) or 1),
+            hedge=bool(self.config.get("request_hedging", False)),
+        )
+        self.format_cache = self._open_format_cache()
+        # Holds Groq requests while the rate-limit headers say they would 429.
+        self.rate_limiter = RateLimitScheduler(
+            max_wait_seconds=float(self.config.get("rate_limit_max_wait_seconds", 10) or 0),
+        )
+        self.groq = GroqClient(
+            self.config.get("api_key"),
+            connections=self.connections,
+            policy=self.request_policy,
+            format_cache=self.format_cache,
+            scheduler=self.rate_limiter,
+            extra_keys=self.config.get_key_pool("api_key"),
+        )
+        self.gemini = GeminiClient(
+            self.config.get("gemini_api_key"),
+            connections=self.connections,
+            extra_keys=self.config.get_key_pool("gemini_api_key"),
+        )
+        self.transcription = self._build_transcription_backends()
+        # Transcript/formatter results by audio digest and settings, so a
+        # retry only repeats the stage that failed.
+        self.stage_cache = StageCache(int(self.config.get("stage_cache_entries", 32) or 1))
+        # Clean, short dictation is formatted locally instead of by the LLM.
+        self.local_formatter = LocalFormatter()
         self.recorder = AudioRecorder(
             self.config.get("input_device_index"),
             always_listening=bool(self.config.get("always_listening", True)),
+            target_rate=self._upload_sample_rate(),
+            codec=str(self.config.get("upload_codec", "wav") or "wav"),
+            trim_silence=bool(self.config.get("trim_silence", True)),
+            speculative=bool(self.config.get("speculative_transcription", False)),
+            ram_budget_bytes=self._recording_ram_budget(),
+            max_seconds=float(self.config.get("max_recording_seconds", 900) or 0) or None,
         )
+        self.recorder.meter.set_fps(self.config.get("animation_fps", 100))
 
         # Standard Hotkey: Ctrl+Win (Transcribe)
         self.hotkey_mgr = HotkeyManager(
@@ -139,6 +195,14 @@ class WhisperAppController(QObject):
         self.visualizer.set_stream_catch_up_enabled(
             bool(self.config.get("stream_catch_up_enabled", True))
         )
+        self.visualizer.answer_dismissed.connect(self._on_answer_dismissed)
+        # Streamed answer/thought updates reach the visualizer at most once per frame.
+        self.stream_coalescer = StreamCoalescer(
+            self._deliver_search_stream,
+            self._deliver_search_thought,
+            fps=self.config.get("animation_fps", 100),
+            parent=self,
+        )
 
         # System Tray
         self.setup_system_tray()
@@ -151,7 +215,59 @@ class WhisperAppController(QObject):
         self.init_state()
 
         self.worker: Optional[QObject] = None
+        # Only the current job's signals reach the UI; see _start_worker.
+        self._job_id: Optional[int] = None
+        # The last dictation's job arguments, for "Retry Last Dictation".
+        self._last_dictation: Optional[Dict[str, Any]] = None
+        # Progressive paste of a streaming formatter, and the clipboard to
+        # restore once it is done.
+        self._stream_paste: Optional[IncrementalPaster] = None
+        self._stream_clipboard_backup: Tuple[dict[str, bytes], str] = ({}, "")
         self._search_stream_started = False
+        # Segments of the current recording already being transcribed.
+        self._speculative: Optional[SpeculativeTranscriber] = None
+
+    def _build_transcription_backends(self) -> BackendRouter:
+        """Speech-to-text backends from config, in failover order."""
+        backends = []
+        for name in self.config.get("transcription_backends", ["groq", "local"]) or ["groq"]:
+            if name == "groq":
+                backends.append(GroqBackend(self.groq, self.config.get("transcription_model", "whisper-large-v3")))
+            elif name == "local":
+                url = str(self.config.get("local_transcription_url", "") or "").strip()
+                if url:
+                    backends.append(OpenAICompatibleBackend(
+                        url,
+                        model_id=str(self.config.get("local_transcription_model", "whisper-1") or "whisper-1"),
+                        timeout_seconds=float(self.config.get("request_timeout_seconds", 30) or 30),
+                    ))
+            else:
+                logger.warning(f"Unknown transcription backend in config: {name}")
+        if not backends:
+            backends.append(GroqBackend(self.groq))
+        logger.info(f"Transcription backends: {', '.join(backend.name for backend in backends)}")
+        return BackendRouter(backends)
+
+    def _open_format_cache(self) -> Optional[FormatCache]:
+        """On-disk cache of formatter/translator outputs, or None if disabled/unavailable."""
+        if not self.config.get("format_cache_enabled", True):
+            return None
+        try:
+            return FormatCache(
+                CONFIG_DIR / "format_cache.sqlite3",
+                max_entries=int(self.config.get("format_cache_max_entries", 2000) or 1),
+                ttl_seconds=float(self.config.get("format_cache_ttl_days", 30) or 30) * 24 * 3600,
+            )
+        except Exception as e:
+            logger.warning(f"Formatter cache unavailable: {e}")
+            return None
+
+    def _recording_ram_budget(self) -> Optional[int]:
+        budget_mb = float(self.config.get("recording_ram_budget_mb", 64) or 0)
+        return int(budget_mb * 1024 * 1024) if budget_mb > 0 else None
+
+    def _upload_sample_rate(self) -> Optional[int]:
+        return WHISPER_SAMPLE_RATE if self.config.get("resample_to_16k", True) else None
 
     def _check_first_run_api_key(self) -> None:
         """Prompt for API key on first run, validating against the Groq API."""
@@ -250,10 +366,13 @@ class WhisperAppController(QObject):
         self.window.config_changed.connect(self.on_config_changed)
         self.window.refresh_devices_requested.connect(self.refresh_device_list)
 
-        # Recorder -> Floating visualizer overlay
-        self.recorder.visualizer_update.connect(self.visualizer.update_level)
-        self.recorder.visualizer_update.connect(self.window.update_visualizer_level)
+        # Recorder -> Floating visualizer overlay. The overlay polls the meter
+        # each frame; nothing is queued across threads per audio chunk.
+        self.visualizer.set_level_source(self.recorder.meter)
         self.recorder.recording_finished.connect(self.start_transcription)
+        self.recorder.segment_ready.connect(self.on_segment_ready)
+        self.recorder.no_speech_detected.connect(self.on_no_speech_detected)
+        self.recorder.max_duration_reached.connect(self.on_max_duration_reached)
         self.recorder.error_occurred.connect(self.show_error)
 
     def init_state(self) -> None:
@@ -309,8 +428,45 @@ class WhisperAppController(QObject):
             self.config.set("always_listening", enabled)
             self.config.save()
             self.recorder.set_always_listening(enabled)
+        elif key == "resample_to_16k":
+            enabled = bool(value)
+            self.config.set("resample_to_16k", enabled)
+            self.config.save()
+            self.recorder.set_target_rate(WHISPER_SAMPLE_RATE if enabled else None)
+        elif key == "upload_codec":
+            codec = str(value or "wav").strip().lower()
+            self.config.set("upload_codec", codec)
+            self.config.save()
+            self.recorder.set_codec(codec)
+        elif key in {"recording_ram_budget_mb", "max_recording_seconds"}:
+            self.config.set(key, value)
+            self.config.save()
+            self.recorder.set_limits(
+                self._recording_ram_budget(),
+                float(self.config.get("max_recording_seconds", 900) or 0) or None,
+            )
+        elif key == "speculative_transcription":
+            enabled = bool(value)
+            self.config.set("speculative_transcription", enabled)
+            self.config.save()
+            self.recorder.set_speculative(enabled)
+        elif key == "trim_silence":
+            enabled = bool(value)
+            self.config.set("trim_silence", enabled)
+            self.config.save()
+            self.recorder.set_trim_silence(enabled)
+        elif key in {"request_timeout_seconds", "request_max_attempts", "request_hedging"}:
+            self.config.set(key, value)
+            self.config.save()
+            self.request_policy.configure(
+                timeout_seconds=float(self.config.get("request_timeout_seconds", 30) or 30),
+                max_attempts=int(self.config.get("request_max_attempts", 3) or 1),
+                hedge=bool(self.config.get("request_hedging", False)),
+            )
         elif key == "animation_fps":
             self.visualizer.set_animation_fps(value)
+            self.recorder.meter.set_fps(value)
+            self.stream_coalescer.set_fps(value)
         elif key == "stream_realtime_enabled":
             enabled = bool(value)
             self.config.set("stream_realtime_enabled", enabled)
@@ -372,16 +528,32 @@ class WhisperAppController(QObject):
                 mode=mode,
                 widget_mode="listening",
             )
+            # A new session supersedes whatever the last one is still doing.
+            self._cancel_worker("new recording started")
+            self.stream_coalescer.discard()
             self._search_stream_started = False
             self.recording_mode = mode
+            self._discard_speculative()
+            # Search queries are short; splitting them only costs requests and
+            # Whisper context.
+            self.recorder.set_speculative(
+                bool(self.config.get("speculative_transcription", False)) and mode == "transcribe"
+            )
             # Start audio capture FIRST so the mic is recording immediately and is
             # not queued behind GUI work (show/position) — prevents first-word clipping.
             self.recorder.start_recording()
+            if self.config.get("prewarm_connections", True):
+                # DNS/TCP/TLS happen while the user speaks, not after release.
+                self.connections.warm()
             self.visualizer.set_listening_mode(reason=f"recording started ({mode})")
             # Show first, then position - some window systems reset position during show()
             self.visualizer.show()
             self._position_visualizer_at_cursor()
         else:
+            if not self.recorder.is_recording:
+                # Already stopped (e.g. auto-stopped at the duration limit
+                # before the key was released); nothing left to process.
+                return
             # Keep visualizer visible and switch to a processing animation
             # while the API request and transcription are in progress.
             trace_widget_event(
@@ -421,30 +593,40 @@ class WhisperAppController(QObject):
             reason="SearchWorker.progress signal",
         )
 
-    def _on_search_stream_text(self, rendered_text: str) -> None:
-        text = str(rendered_text or "")
-        if not text:
+    def _on_search_stream_delta(self, seq: int, delta: str) -> None:
+        self.stream_coalescer.push_answer(seq, str(delta or ""))
+
+    def _on_search_thought_text(self, thought_text: str) -> None:
+        if self._search_stream_started:
             return
+        self.stream_coalescer.push_thought(str(thought_text or ""))
+
+    def _deliver_search_stream(self, first_seq: int, last_seq: int, text: str) -> None:
         if not self._search_stream_started:
             self._search_stream_started = True
             trace_widget_event(
                 "widget_stream_started",
-                trigger="controller._on_search_stream_text",
+                trigger="controller._deliver_search_stream",
                 reason="first streamed answer chunk received",
             )
             self.visualizer.begin_streaming_answer(reason="first streamed answer chunk")
-        self.visualizer.update_streaming_answer(
-            text,
-            reason="Gemini streamed answer chunk",
-        )
+        if self.visualizer.append_streaming_answer(
+            text, seq=first_seq, last_seq=last_seq, reason="Gemini streamed answer chunk"
+        ):
+            return
+        # The visualizer missed a delta; resend everything streamed so far.
+        snapshot = getattr(self.worker, "stream_snapshot", None)
+        if snapshot is None:
+            return
+        latest_seq, full_text = snapshot()
+        self.visualizer.update_streaming_answer(full_text, reason="Gemini stream resync", seq=latest_seq)
 
-    def _on_search_thought_text(self, thought_text: str) -> None:
-        text = str(thought_text or "")
-        if not text or self._search_stream_started:
+    def _deliver_search_thought(self, text: str) -> None:
+        if self._search_stream_started:
             return
         trace_widget_event(
             "widget_thought_stream",
-            trigger="controller._on_search_thought_text",
+            trigger="controller._deliver_search_thought",
             reason="Gemini streamed thought chunk",
             thought_preview=text[:160],
         )
@@ -453,6 +635,12 @@ class WhisperAppController(QObject):
             reason="Gemini streamed thought chunk",
         )
 
+    def _end_search_stream(self) -> None:
+        """Report how the finished search stream was coalesced."""
+        stats = self.stream_coalescer.reset_stats()
+        if stats.updates:
+            logger.info(f"Search stream: {stats.summary()}")
+
     def _position_visualizer_at_cursor(self) -> None:
         """Position the visualizer at center-bottom of the screen where the cursor is located."""
         cursor_pos = QCursor.pos()
@@ -573,6 +761,39 @@ class WhisperAppController(QObject):
             return None
         return bytes(blob)
 
+    def _segment_concurrency(self) -> int:
+        return int(self.config.get("segment_concurrency", 4) or 4)
+
+    def _build_transcriber(self) -> Union[SegmentedTranscriber, SpeculativeTranscriber]:
+        """Transcription front-end for the recording that just finished.
+
+        If phrases were already sent while the key was held, the speculative
+        session is handed over so the worker only waits for the tail.
+        """
+        speculative, self._speculative = self._speculative, None
+        if speculative is not None:
+            return speculative
+        return SegmentedTranscriber(
+            self.transcription,
+            max_segment_seconds=float(self.config.get("segment_max_seconds", 60) or 60),
+            concurrency=self._segment_concurrency(),
+        )
+
+    def on_segment_ready(self, audio: Any) -> None:
+        """Start transcribing a phrase while the user is still recording."""
+        if self._speculative is None:
+            self._speculative = SpeculativeTranscriber(
+                self.transcription,
+                prompt=TRANSCRIPTION_PROMPT,
+                concurrency=self._segment_concurrency(),
+            )
+        self._speculative.submit(audio)
+
+    def _discard_speculative(self) -> None:
+        if self._speculative is not None:
+            self._speculative.cancel()
+            self._speculative = None
+
     def start_transcription(self, audio_source: Any) -> None:
         """Start transcription. audio_source can be BytesIO buffer or file path."""
         self.window.update_log(f"Processing ({self.recording_mode})...")
@@ -584,6 +805,7 @@ class WhisperAppController(QObject):
 
         if self.recording_mode in {"search", "search_image"}:
             # Quick Answer Mode — always uses Gemini.
+            self.stream_coalescer.discard()
             self._search_stream_started = False
             if self.recording_mode == "search_image":
                 self._start_image_search_pipeline(audio_source)
@@ -599,20 +821,17 @@ class WhisperAppController(QObject):
                 gemini_model_id,
                 "yes" if selected_text else "no",
             )
-            self.worker = SearchWorker(
+            self._start_search_worker(SearchWorker(
                 self.groq,
                 audio_source,
                 gemini_client=self.gemini,
                 gemini_model_id=gemini_model_id,
                 selected_text=selected_text,
                 web_search_enabled=bool(self.config.get("web_search_enabled", True)),
-            )
-            self.worker.progress.connect(self._search_progress_signal.emit)
-            self.worker.thought_text.connect(self._search_thought_signal.emit)
-            self.worker.stream_text.connect(self._on_search_stream_text)
-            self.worker.finished.connect(self.on_search_complete)
-            self.worker.error.connect(self.show_error)
-            self.worker.start()
+                transcriber=self._build_transcriber(),
+                engine=self.engine,
+                stage_cache=self.stage_cache,
+            ))
 
         else:
             # Standard Transcription Mode
@@ -629,14 +848,90 @@ class WhisperAppController(QObject):
                 use_fmt, use_trans, target_lang, fmt_style, active_context,
             )
 
-            self.worker = TranscriptionWorker(
-                self.groq, audio_source, use_fmt, fmt_model,
-                use_translation=use_trans, target_language=target_lang,
-                formatting_style=fmt_style, active_context=active_context,
-            )
-            self.worker.finished.connect(self.on_transcription_complete)
-            self.worker.error.connect(self.show_error)
-            self.worker.start()
+            self._last_dictation = {
+                "audio_file": audio_source,
+                "use_formatter": use_fmt,
+                "format_model": fmt_model,
+                "use_translation": use_trans,
+                "target_language": target_lang,
+                "formatting_style": fmt_style,
+                "active_context": active_context,
+                "transcriber": self._build_transcriber(),
+            }
+            self._start_dictation_worker(self._last_dictation)
+
+    def _start_worker(self, worker: Any, *connections: Tuple[Any, Callable[..., None]]) -> None:
+        """Run ``worker`` as the current job, cancelling the one it replaces.
+
+        Each ``(signal, slot)`` pair is connected through a job-ID check, so
+        results a superseded job emits before it stops are dropped.
+        """
+        self._cancel_worker("superseded by a new job")
+        self.worker = worker
+        self._job_id = worker.job_id
+        for signal, slot in connections:
+            signal.connect(functools.partial(self._deliver_job_signal, worker.job_id, slot))
+        worker.start()
+
+    def _deliver_job_signal(self, job_id: Any, slot: Callable[..., None], *args: Any) -> None:
+        if job_id != self._job_id:
+            logger.debug(f"Dropping a signal from stale job {job_id}")
+            return
+        slot(*args)
+
+    def _cancel_worker(self, reason: str) -> None:
+        worker, self.worker = self.worker, None
+        self._job_id = None
+        # A cancelled job never reaches on_transcription_complete, so stop
+        # typing its sentences here and give the user their clipboard back.
+        self._abort_stream_paste()
+        if worker is None:
+            return
+        try:
+            if worker.is_running():
+                logger.info(f"Cancelling job {worker.job_id}: {reason}")
+            worker.cancel()
+        except Exception as exc:
+            logger.debug("Error cancelling worker: %s", exc)
+
+    def _start_search_worker(self, worker: SearchWorker) -> None:
+        self._start_worker(
+            worker,
+            (worker.progress, self._search_progress_signal.emit),
+            (worker.thought_text, self._search_thought_signal.emit),
+            (worker.stream_delta, self._on_search_stream_delta),
+            (worker.finished, self.on_search_complete),
+            (worker.error, self.show_error),
+        )
+
+    def _on_answer_dismissed(self) -> None:
+        # Nobody is reading the rest of the answer; stop paying for it.
+        self.stream_coalescer.discard()
+        self._cancel_worker("answer card dismissed")
+
+    def _start_dictation_worker(self, job: Dict[str, Any]) -> None:
+        worker = TranscriptionWorker(
+            self.groq, engine=self.engine, stage_cache=self.stage_cache,
+            stream_format=bool(self.config.get("stream_formatter", False)),
+            local_formatter=self.local_formatter if self.config.get("local_format_fast_path", True) else None,
+            **job,
+        )
+        self._start_worker(
+            worker,
+            (worker.partial_text, self.on_format_chunk),
+            (worker.finished, self.on_transcription_complete),
+            (worker.error, self.show_error),
+        )
+
+    def retry_last_dictation(self) -> None:
+        """Re-run the last dictation; stages that already succeeded come from the cache."""
+        if self._last_dictation is None:
+            self.window.update_log("Nothing to retry.")
+            return
+        if self.recorder.is_recording:
+            return
+        self.window.update_log("Retrying last dictation...")
+        self._start_dictation_worker(self._last_dictation)
 
     def _start_image_search_pipeline(
         self,
@@ -648,19 +943,20 @@ class WhisperAppController(QObject):
             reason="image-search mode transcription phase",
         )
         self.window.update_log("Detecting speech for image context...")
-        self.worker = TranscriptionWorker(
+        worker = TranscriptionWorker(
             self.groq,
             audio_source,
             use_formatter=False,
             format_model="openai/gpt-oss-120b",
+            transcriber=self._build_transcriber(),
+            engine=self.engine,
+            stage_cache=self.stage_cache,
         )
-        self.worker.finished.connect(
-            lambda raw_text, _final_text: self._continue_image_search_pipeline(
-                raw_text,
-            )
+        self._start_worker(
+            worker,
+            (worker.finished, lambda raw_text, _final_text: self._continue_image_search_pipeline(raw_text)),
+            (worker.error, self.show_error),
         )
-        self.worker.error.connect(self.show_error)
-        self.worker.start()
 
     def _continue_image_search_pipeline(
         self,
@@ -688,7 +984,8 @@ class WhisperAppController(QObject):
             "Starting Quick Answer search (Provider: Gemini, Model: %s, SelectedContext: no, ImageContext: yes)...",
             gemini_model_id,
         )
-        self.worker = SearchWorker(
+        self.stream_coalescer.discard()
+        self._start_search_worker(SearchWorker(
             self.groq,
             None,
             gemini_client=self.gemini,
@@ -696,19 +993,93 @@ class WhisperAppController(QObject):
             query_text=query_text,
             image_png_bytes=image_png_bytes,
             web_search_enabled=bool(self.config.get("web_search_enabled", True)),
-        )
-        self.worker.progress.connect(self._search_progress_signal.emit)
-        self.worker.thought_text.connect(self._search_thought_signal.emit)
-        self.worker.stream_text.connect(self._on_search_stream_text)
-        self.worker.finished.connect(self.on_search_complete)
-        self.worker.error.connect(self.show_error)
-        self.worker.start()
+            engine=self.engine,
+        ))
+
+    def on_max_duration_reached(self) -> None:
+        """Stop a recording that ran into max_recording_seconds and transcribe it."""
+        limit = self.config.get("max_recording_seconds", 900)
+        logger.warning("Recording reached the %ss limit; stopping automatically", limit)
+        self.window.update_log(f"Recording stopped at the {limit}s limit.")
+        self.set_recording(False)
+
+    def on_no_speech_detected(self) -> None:
+        """The recorder found no speech, so nothing was uploaded."""
+        self.window.update_log("No speech detected; skipped transcription.")
+        self.visualizer.cancel_processing(reason="no speech detected; upload skipped")
 
     def on_transcription_complete(self, raw: str, final: str) -> None:
         self.window.update_log("Transcription complete")
+        if self._stream_paste is not None:
+            # Sentences were typed as the formatter streamed them.
+            self._stream_paste.finish(self._end_stream_paste)
+            return
         self.paste_text(final)
 
+    def on_format_chunk(self, chunk: str) -> None:
+        """Type the next streamed sentence into the target app."""
+        if self._stream_paste is None:
+            self._stream_paste = IncrementalPaster(
+                self._paste_chunk,
+                lambda delay_ms, callback: QTimer.singleShot(delay_ms, callback),
+            )
+            self._stream_clipboard_backup = self._snapshot_clipboard_backup()
+        self._stream_paste.push(chunk)
+
+    def _paste_chunk(self, text: str) -> bool:
+        try:
+            if not self._set_clipboard_text(text):
+                raise RuntimeError("Unable to stage formatted text in clipboard")
+        except Exception as exc:
+            logger.error("Streaming paste failed: %s", exc)
+            return False
+        # Let the clipboard settle before the keystroke without blocking the
+        # GUI thread; the paster spaces chunks further apart than this.
+        paster = self._stream_paste
+        QTimer.singleShot(60, lambda: self._send_paste_keystroke(paster))
+        return True
+
+    def _send_paste_keystroke(self, paster: Optional[IncrementalPaster]) -> None:
+        if paster is not None and paster.aborted:
+            return
+        try:
+            keyboard.send('ctrl+v')
+        except Exception as exc:
+            logger.error("Streaming paste failed: %s", exc)
+
+    def _abort_stream_paste(self) -> None:
+        paster, self._stream_paste = self._stream_paste, None
+        if paster is None:
+            return
+        paster.abort()
+        clipboard_payload, clipboard_text_fallback = self._stream_clipboard_backup
+        self._stream_clipboard_backup = ({}, "")
+        self._schedule_clipboard_restore(
+            clipboard_payload,
+            fallback_text=clipboard_text_fallback,
+            initial_delay_ms=550 if paster.pasted else 60,
+        )
+
+    def _end_stream_paste(self, ok: bool) -> None:
+        paster, self._stream_paste = self._stream_paste, None
+        if paster is None:
+            return
+        clipboard_payload, clipboard_text_fallback = self._stream_clipboard_backup
+        self._stream_clipboard_backup = ({}, "")
+        self._schedule_clipboard_restore(
+            clipboard_payload,
+            fallback_text=clipboard_text_fallback,
+            initial_delay_ms=550 if paster.pasted else 60,
+        )
+        if ok and paster.pasted:
+            self._paste_completed_signal.emit()
+        else:
+            self._paste_failed_signal.emit()
+
     def on_search_complete(self, answer: str) -> None:
+        # Show the last buffered frame before completing the card.
+        self.stream_coalescer.flush()
+        self._end_search_stream()
         cleaned_answer = (answer or "").strip() or "No answer available."
         self.window.update_log(f"Answer: {cleaned_answer}")
         trace_widget_event(
@@ -937,6 +1308,18 @@ class WhisperAppController(QObject):
 
         QTimer.singleShot(delays_ms[0], lambda: _attempt(0))
 
+    def _snapshot_clipboard_backup(self) -> Tuple[dict[str, bytes], str]:
+        """The clipboard's payload plus a plain-text fallback, for restoring after a paste."""
+        clipboard_payload = self._snapshot_clipboard_payload()
+        try:
+            clipboard_text_fallback = str(self.app.clipboard().text() or "")
+        except Exception:
+            try:
+                clipboard_text_fallback = str(pyperclip.paste() or "")
+            except Exception:
+                clipboard_text_fallback = ""
+        return clipboard_payload, clipboard_text_fallback
+
     def paste_text(self, text: str) -> None:
         """Ghost paste: backup clipboard, paste text, restore original clipboard."""
         cleaned_text = str(text or "").strip()
@@ -946,14 +1329,7 @@ class WhisperAppController(QObject):
             return
 
         # Clipboard path: temporary clipboard + Ctrl+V, then restore original clipboard.
-        clipboard_payload = self._snapshot_clipboard_payload()
-        try:
-            clipboard_text_fallback = str(self.app.clipboard().text() or "")
-        except Exception:
-            try:
-                clipboard_text_fallback = str(pyperclip.paste() or "")
-            except Exception:
-                clipboard_text_fallback = ""
+        clipboard_payload, clipboard_text_fallback = self._snapshot_clipboard_backup()
 
         try:
             if not self._set_clipboard_text(cleaned_text):
@@ -996,6 +1372,11 @@ class WhisperAppController(QObject):
 
     def show_error(self, msg: str) -> None:
         self.window.update_log(f"Error: {msg}")
+        if self._stream_paste is not None:
+            # The formatter stream broke midway; keep what was typed.
+            self._stream_paste.finish(lambda _ok: self._end_stream_paste(False))
+        self.stream_coalescer.discard()
+        self._end_search_stream()
         self._search_stream_started = False
         trace_widget_event(
             "widget_error",
@@ -1029,6 +1410,10 @@ class WhisperAppController(QObject):
         show_action.triggered.connect(self.show_window)
         tray_menu.addAction(show_action)
 
+        retry_action = QAction("Retry Last Dictation", self.app)
+        retry_action.triggered.connect(self.retry_last_dictation)
+        tray_menu.addAction(retry_action)
+
         tray_menu.addSeparator()
 
         quit_action = QAction("Quit", self.app)
@@ -1076,18 +1461,22 @@ class WhisperAppController(QObject):
         # Close the persistent pre-roll stream on shutdown (no-op in legacy mode).
         self.recorder.stop_listening()
 
-        # Stop and join any active worker thread before tearing down the event loop.
-        if self.worker is not None:
-            try:
-                self.worker.quit()
-                if not self.worker.wait(3000):  # up to 3 s
-                    logger.warning("Worker thread did not exit cleanly; terminating.")
-                    self.worker.terminate()
-                    self.worker.wait(1000)
-            except Exception as exc:
-                logger.debug("Error stopping worker on quit: %s", exc)
-            finally:
-                self.worker = None
+        # Cancel any in-flight pipeline; its requests are closed on the engine loop.
+        self._cancel_worker("application quitting")
+
+        self.request_policy.shutdown()
+        self.connections.close()
+        self.engine.stop()
+        logger.info(f"Formatter fast path: {self.local_formatter.stats.summary()}")
+        logger.info(f"Groq rate limits: {self.rate_limiter.summary()}")
+        logger.info(f"Transcription: {self.transcription.stats.summary()}")
+        self.transcription.close()
+        for provider, client in (("Groq", self.groq), ("Gemini", self.gemini)):
+            if client.pool is not None and len(client.pool) > 1:
+                logger.info(f"{provider} key pool: {client.pool.summary()}")
+        if self.format_cache is not None:
+            logger.info(f"Formatter cache: {self.format_cache.summary()}")
+            self.format_cache.close()
 
         # Stop hotkey listener
         self.hotkey_mgr.stop_listening()
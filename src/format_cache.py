@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Optional, Union
+
+from src import prompts
+
+logger = logging.getLogger(__name__)
+
+
+def prompts_version(module: ModuleType = prompts) -> str:
+    """Hash of the prompt texts; cached outputs from other prompt texts are void.
+
+    Hashes the module's uppercase string constants rather than prompts.py
+    itself, which frozen (PyInstaller) builds do not ship as source.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(vars(module)):
+        value = getattr(module, name)
+        if name.isupper() and isinstance(value, str):
+            digest.update(f"{name}\0{value}\0".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def normalize_raw(text: str) -> str:
+    return " ".join(str(text or "").split())
+
+
+def cache_key(raw_text: str, model_id: str, prompt: str) -> str:
+    """Key for one formatter call: raw text, model, and the effective prompt.
+
+    ``prompt`` is the full system prompt as sent, so the active-window
+    context the worker appends is part of the key.
+    """
+    prompt_hash = hashlib.sha256(str(prompt or "").encode("utf-8")).hexdigest()
+    digest = hashlib.sha256()
+    for part in (normalize_raw(raw_text), str(model_id or ""), prompt_hash):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class FormatCache:
+    """On-disk LRU cache of formatter/translator outputs (SQLite).
+
+    Entries expire after ``ttl_seconds``; beyond ``max_entries`` or
+    ``max_bytes`` of cached text the least recently used are evicted. The
+    whole cache is dropped when prompts.py changes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 2000,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl_seconds: float = 30 * 24 * 3600,
+        version: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl_seconds = float(ttl_seconds)
+        self.version = version if version is not None else prompts_version()
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'prompts_version'").fetchone()
+        if row is not None and row[0] == self.version:
+            return
+        if row is not None:
+            logger.info("Prompts changed; clearing the formatter cache")
+        self._db.execute("DELETE FROM entries")
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('prompts_version', ?)", (self.version,)
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, raw_text: str, model_id: str, prompt: str) -> Optional[str]:
+        key = cache_key(raw_text, model_id, prompt)
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, raw_text: str, model_id: str, prompt: str, value: str) -> None:
+        key = cache_key(raw_text, model_id, prompt)
+        value = str(value)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_seconds,))
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        self.evictions += evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), {self.evictions} evicted"
@@ -1,7 +1,10 @@
 import importlib
 import logging
-from typing import Callable, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
+from src.cancellation import CancelToken, raise_if_cancelled
+from src.http_transport import GEMINI_BASE_URL, ConnectionManager
+from src.key_pool import KeyPool, call_with_failover, call_with_failover_async
 
 logger = logging.getLogger(__name__)
 
@@ -10,10 +13,27 @@ class GeminiClientError(Exception):
     """Raised when Gemini API operations fail."""
 
 
+class SearchChunk(NamedTuple):
+    text: str
+    # Model reasoning rather than answer text.
+    thought: bool = False
+
+
 class GeminiClient:
-    def __init__(self, api_key: Optional[str]):
+    def __init__(
+        self,
+        api_key: Optional[str],
+        connections: Optional[ConnectionManager] = None,
+        extra_keys: Sequence[str] = (),
+    ):
         self.client = None
         self._types = None
+        self.connections = connections
+        # Pooled keys beyond api_key; ``client`` is the primary key's.
+        self._api_key = ""
+        self._extra_keys = [str(key).strip() for key in extra_keys if str(key or "").strip()]
+        self._clients: Dict[str, Any] = {}
+        self.pool: Optional[KeyPool] = None
         if api_key:
             self.update_api_key(api_key)
 
@@ -27,23 +47,54 @@ class GeminiClient:
                 "Gemini SDK not installed. Install `google-genai` to enable Gemini search."
             ) from exc
 
-    def update_api_key(self, api_key: str) -> None:
+    def update_api_key(self, api_key: str, extra_keys: Optional[Sequence[str]] = None) -> None:
+        """Bind ``api_key``, plus ``extra_keys`` if given (else the current ones)."""
+        if extra_keys is not None:
+            self._extra_keys = [str(key).strip() for key in extra_keys if str(key or "").strip()]
         normalized = str(api_key or "").strip()
+        self._clients = {}
         if not normalized:
             self.client = None
             self._types = None
+            self.pool = None
             return
 
         try:
             genai, types_mod = self._load_sdk_modules()
-            self.client = genai.Client(api_key=normalized)
             self._types = types_mod
+            self.client = self._new_client(genai, normalized)
+            self._clients[normalized] = self.client
+            self._api_key = normalized
+            self.pool = KeyPool([normalized, *self._extra_keys])
+            if self.connections is not None:
+                self.connections.register(GEMINI_BASE_URL)
         except Exception as exc:
             logger.error("Failed to initialize Gemini client: %s", exc)
             self.client = None
             self._types = None
+            self.pool = None
             raise
 
+    def _new_client(self, genai, api_key: str):
+        if self.connections is None:
+            return genai.Client(api_key=api_key)
+        return genai.Client(
+            api_key=api_key,
+            http_options=self._types.HttpOptions(
+                httpx_client=self.connections.http_client(),
+                httpx_async_client=self.connections.async_http_client(),
+            ),
+        )
+
+    def _client_for(self, api_key: str):
+        if not api_key or api_key == self._api_key:
+            return self.client
+        client = self._clients.get(api_key)
+        if client is None:
+            genai, _ = self._load_sdk_modules()
+            client = self._clients[api_key] = self._new_client(genai, api_key)
+        return client
+
     def check_connection(self) -> bool:
         try:
             return bool(self.list_models())
@@ -72,16 +123,14 @@ class GeminiClient:
         except Exception as exc:
             raise GeminiClientError(f"Failed to list Gemini models: {exc}") from exc
 
-    def run_search(
+    def _search_request(
         self,
         query: str,
         model_id: str,
-        system_prompt: str = "",
-        image_bytes: Optional[bytes] = None,
-        stream_callback: Optional[Callable[[str], None]] = None,
-        thought_callback: Optional[Callable[[str], None]] = None,
-        with_search: bool = True,
-    ) -> str:
+        system_prompt: str,
+        image_bytes: Optional[bytes],
+        with_search: bool,
+    ) -> dict:
         if self.client is None or self._types is None:
             raise GeminiClientError("Gemini API key not set.")
 
@@ -112,38 +161,163 @@ class GeminiClient:
                 cleaned_query,
                 self._types.Part.from_bytes(data=bytes(image_bytes), mime_type="image/png"),
             ]
+        return {"model": str(model_id or "").strip(), "contents": contents, "config": config}
 
+    @staticmethod
+    def _chunk_parts(chunk: object) -> Iterator[SearchChunk]:
+        saw_parts = False
+        for candidate in getattr(chunk, "candidates", None) or []:
+            content = getattr(candidate, "content", None)
+            for part in getattr(content, "parts", None) or []:
+                saw_parts = True
+                text = str(getattr(part, "text", "") or "")
+                if text:
+                    yield SearchChunk(text, bool(getattr(part, "thought", False)))
+
+        if not saw_parts:
+            text = str(getattr(chunk, "text", "") or "")
+            if text:
+                yield SearchChunk(text)
+
+    def search_stream(
+        self,
+        query: str,
+        model_id: str,
+        system_prompt: str = "",
+        image_bytes: Optional[bytes] = None,
+        with_search: bool = True,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Iterator[SearchChunk]:
+        """The answer as it arrives, one ``SearchChunk`` per text part.
+
+        Auth/quota errors move to the next pooled key only until the first
+        chunk arrives; after that a broken stream raises, since the caller
+        has already shown part of the answer. Cancelling ``cancel_token``
+        closes the stream at the next chunk.
+        """
+        request = self._search_request(query, model_id, system_prompt, image_bytes, with_search)
+
+        def open_stream(api_key: str) -> Tuple[Iterator[Any], Any]:
+            raise_if_cancelled(cancel_token)
+            stream = iter(self._client_for(api_key).models.generate_content_stream(**request))
+            return stream, next(stream, None)
+
+        stream: Optional[Iterator[Any]] = None
         try:
-            final_text = ""
-            for chunk in self.client.models.generate_content_stream(
-                model=str(model_id or "").strip(),
-                contents=contents,
-                config=config,
-            ):
-                saw_parts = False
-                for candidate in getattr(chunk, "candidates", None) or []:
-                    content = getattr(candidate, "content", None)
-                    for part in getattr(content, "parts", None) or []:
-                        saw_parts = True
-                        text = str(getattr(part, "text", "") or "")
-                        if not text:
-                            continue
-                        if bool(getattr(part, "thought", False)):
-                            if thought_callback is not None:
-                                thought_callback(text)
-                            continue
-                        final_text += text
-                        if stream_callback is not None:
-                            stream_callback(final_text)
-
-                if saw_parts:
-                    continue
+            stream, first = call_with_failover(self.pool, open_stream, self._api_key)
+            if first is not None:
+                yield from self._chunk_parts(first)
+                for chunk in stream:
+                    raise_if_cancelled(cancel_token)
+                    yield from self._chunk_parts(chunk)
+        except Exception as exc:
+            raise GeminiClientError(f"Gemini search failed: {exc}") from exc
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
 
-                text = str(getattr(chunk, "text", "") or "")
-                if text:
-                    final_text += text
-                    if stream_callback is not None:
-                        stream_callback(final_text)
-            return final_text.strip()
+    async def search_stream_async(
+        self,
+        query: str,
+        model_id: str,
+        system_prompt: str = "",
+        image_bytes: Optional[bytes] = None,
+        with_search: bool = True,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> AsyncIterator[SearchChunk]:
+        """``search_stream`` on the SDK's async client."""
+        request = self._search_request(query, model_id, system_prompt, image_bytes, with_search)
+
+        async def open_stream(api_key: str) -> Tuple[AsyncIterator[Any], Any]:
+            raise_if_cancelled(cancel_token)
+            stream = await self._client_for(api_key).aio.models.generate_content_stream(**request)
+            stream = stream.__aiter__()
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+
+        stream: Optional[AsyncIterator[Any]] = None
+        try:
+            stream, first = await call_with_failover_async(self.pool, open_stream, self._api_key)
+            if first is not None:
+                for part in self._chunk_parts(first):
+                    yield part
+                while True:
+                    try:
+                        chunk = await stream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    raise_if_cancelled(cancel_token)
+                    for part in self._chunk_parts(chunk):
+                        yield part
         except Exception as exc:
             raise GeminiClientError(f"Gemini search failed: {exc}") from exc
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    @staticmethod
+    def _collect(
+        parts: List[str],
+        chunk: SearchChunk,
+        stream_callback: Optional[Callable[[str], None]],
+        thought_callback: Optional[Callable[[str], None]],
+        delta_callback: Optional[Callable[[str], None]],
+    ) -> None:
+        if chunk.thought:
+            if thought_callback is not None:
+                thought_callback(chunk.text)
+            return
+        parts.append(chunk.text)
+        if delta_callback is not None:
+            delta_callback(chunk.text)
+        if stream_callback is not None:
+            # Cumulative text costs a join per part; prefer delta_callback.
+            stream_callback("".join(parts))
+
+    def run_search(
+        self,
+        query: str,
+        model_id: str,
+        system_prompt: str = "",
+        image_bytes: Optional[bytes] = None,
+        stream_callback: Optional[Callable[[str], None]] = None,
+        thought_callback: Optional[Callable[[str], None]] = None,
+        with_search: bool = True,
+        delta_callback: Optional[Callable[[str], None]] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
+        """Collect ``search_stream`` into the final answer.
+
+        ``delta_callback`` gets each new piece of the answer and
+        ``stream_callback`` the whole answer so far.
+        """
+        parts: List[str] = []
+        for chunk in self.search_stream(query, model_id, system_prompt, image_bytes, with_search, cancel_token):
+            self._collect(parts, chunk, stream_callback, thought_callback, delta_callback)
+        return "".join(parts).strip()
+
+    async def run_search_async(
+        self,
+        query: str,
+        model_id: str,
+        system_prompt: str = "",
+        image_bytes: Optional[bytes] = None,
+        stream_callback: Optional[Callable[[str], None]] = None,
+        thought_callback: Optional[Callable[[str], None]] = None,
+        with_search: bool = True,
+        delta_callback: Optional[Callable[[str], None]] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
+        """``run_search`` on the SDK's async client; cancelling it closes the stream."""
+        parts: List[str] = []
+        stream = self.search_stream_async(query, model_id, system_prompt, image_bytes, with_search, cancel_token)
+        try:
+            async for chunk in stream:
+                self._collect(parts, chunk, stream_callback, thought_callback, delta_callback)
+        finally:
+            await stream.aclose()
+        return "".join(parts).strip()
@@ -1,7 +1,16 @@
+import io
 import os
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
-from groq import Groq, APIConnectionError, APIStatusError
+import operator
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import httpx
+from groq import AsyncGroq, DefaultAsyncHttpxClient, DefaultHttpxClient, Groq, APIConnectionError, APIStatusError
+from src.cancellation import CancelToken, raise_if_cancelled
+from src.http_transport import ConnectionManager
+from src.request_policy import RequestPolicy
+from src.format_cache import FormatCache
+from src.key_pool import KeyPool, call_with_failover, call_with_failover_async
+from src.rate_limiter import BACKGROUND, INTERACTIVE, RateLimitScheduler
 from src.prompts import SYSTEM_PROMPT_FORMATTER
 
 # Configure logger
@@ -12,23 +21,150 @@ class GroqClientError(Exception):
     pass
 
 class GroqClient:
-    def __init__(self, api_key: Optional[str]):
+    def __init__(
+        self,
+        api_key: Optional[str],
+        connections: Optional[ConnectionManager] = None,
+        policy: Optional[RequestPolicy] = None,
+        format_cache: Optional[FormatCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        extra_keys: Sequence[str] = (),
+    ):
         self.client: Optional[Groq] = None
+        # One SDK client per pooled key; ``client`` is the primary key's.
+        self._clients: Dict[str, Groq] = {}
+        # Async twins for the pipeline engine's loop; built on first use so
+        # their connections bind to that loop.
+        self._async_clients: Dict[str, AsyncGroq] = {}
+        self._api_key = ""
+        # Further keys share the load with api_key and take over when it is
+        # throttled or rejected; None until a key is set.
+        self._extra_keys = self._clean_keys(extra_keys)
+        self.pool: Optional[KeyPool] = None
+        # Shared keep-alive pool (pre-warmed on hotkey press); None keeps the
+        # SDK's own per-client pool.
+        self.connections = connections
+        # Timeouts, retries and hedging for transcribe/format_text. None makes
+        # one plain SDK call (with the SDK's own retries).
+        self.policy = policy
+        # On-disk cache of format_text outputs by raw text, model and prompt.
+        self.format_cache = format_cache
+        # Paces requests from Groq's rate-limit headers; dictation first.
+        # Serves the primary key; each extra key gets its own copy.
+        self.scheduler = scheduler
+        self._schedulers: Dict[str, RateLimitScheduler] = {}
         if api_key:
             self.update_api_key(api_key)
 
-    def update_api_key(self, api_key: str) -> None:
+    @staticmethod
+    def _clean_keys(keys: Sequence[str]) -> List[str]:
+        return [str(key).strip() for key in keys or () if str(key or "").strip()]
+
+    def update_api_key(self, api_key: str, extra_keys: Optional[Sequence[str]] = None) -> None:
+        """Bind ``api_key``, plus ``extra_keys`` if given (else the current ones)."""
+        if extra_keys is not None:
+            self._extra_keys = self._clean_keys(extra_keys)
         try:
             clean_key = api_key.strip() if api_key else ""
-            self.client = Groq(api_key=clean_key)
+            self.client = None
+            self._api_key = clean_key
+            self._clients = {}
+            self._async_clients = {}
+            self.client = self._sync_client(clean_key)
+            self.pool = KeyPool([clean_key, *self._extra_keys])
+            if self.connections is not None:
+                self.connections.register(str(self.client.base_url))
         except Exception as e:
             logger.error(f"Error initializing Groq client: {e}")
             self.client = None
 
+    def _client_kwargs(self, api_key: str, asynchronous: bool) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {}
+        hooks = self._response_hooks(api_key, asynchronous)
+        if self.connections is not None:
+            factory = self.connections.async_http_client if asynchronous else self.connections.http_client
+            kwargs["http_client"] = factory(event_hooks=hooks)
+        elif hooks is not None:
+            factory = DefaultAsyncHttpxClient if asynchronous else DefaultHttpxClient
+            kwargs["http_client"] = factory(event_hooks=hooks)
+        if self.policy is not None:
+            # The policy owns retries; SDK retries would multiply attempts.
+            kwargs["max_retries"] = 0
+        return kwargs
+
+    def _sync_client(self, api_key: str) -> Groq:
+        if api_key == self._api_key and self.client is not None:
+            return self.client
+        client = self._clients.get(api_key)
+        if client is None:
+            client = self._clients[api_key] = Groq(api_key=api_key, **self._client_kwargs(api_key, False))
+        return client
+
+    def _async(self, api_key: Optional[str] = None) -> AsyncGroq:
+        if not self.client:
+            raise GroqClientError("API Key not set.")
+        api_key = api_key or self._api_key
+        client = self._async_clients.get(api_key)
+        if client is None:
+            client = self._async_clients[api_key] = AsyncGroq(api_key=api_key, **self._client_kwargs(api_key, True))
+        return client
+
+    def _scheduler_for(self, api_key: Optional[str]) -> Optional[RateLimitScheduler]:
+        if self.scheduler is None or not api_key or api_key == self._api_key:
+            return self.scheduler
+        scheduler = self._schedulers.get(api_key)
+        if scheduler is None:
+            scheduler = self._schedulers[api_key] = RateLimitScheduler(
+                max_wait_seconds=self.scheduler.max_wait_seconds,
+                background_reserve=self.scheduler.background_reserve,
+            )
+        return scheduler
+
+    def _response_hooks(self, api_key: str, asynchronous: bool) -> Optional[Dict[str, List[Callable[..., Any]]]]:
+        scheduler = self._scheduler_for(api_key)
+        if scheduler is None:
+            return None
+
+        def observe(response: httpx.Response) -> None:
+            scheduler.observe(response.headers, response.status_code)
+
+        async def observe_async(response: httpx.Response) -> None:
+            observe(response)
+
+        return {"response": [observe_async if asynchronous else observe]}
+
+    def _acquire(self, cost: Dict[str, float], priority: int = INTERACTIVE, api_key: Optional[str] = None) -> None:
+        scheduler = self._scheduler_for(api_key)
+        if scheduler is not None:
+            scheduler.acquire(cost, priority)
+
+    async def _acquire_async(
+        self, cost: Dict[str, float], priority: int = INTERACTIVE, api_key: Optional[str] = None
+    ) -> None:
+        scheduler = self._scheduler_for(api_key)
+        if scheduler is not None:
+            await scheduler.acquire_async(cost, priority)
+
+    @property
+    def _per_attempt_file(self) -> bool:
+        # Retries, hedges and key failover all re-send the upload.
+        return self.policy is not None or (self.pool is not None and len(self.pool) > 1)
+
+    @staticmethod
+    def _transcription_cost(file_source: Any) -> Dict[str, float]:
+        return {"requests": 1, "audio_seconds": float(getattr(file_source, "duration", 0.0) or 0.0)}
+
+    @staticmethod
+    def _format_cost(params: Dict[str, Any]) -> Dict[str, float]:
+        # ~4 characters per token, and an answer about as long as the input.
+        prompt_chars = sum(len(str(message["content"])) for message in params["messages"])
+        return {"requests": 1, "tokens": prompt_chars / 4 + len(str(params["messages"][-1]["content"])) / 4}
+
     def check_connection(self) -> bool:
         if not self.client:
             return False
         try:
+            self._acquire({"requests": 1}, BACKGROUND)
             self.client.models.list()
             return True
         except Exception:
@@ -39,6 +175,7 @@ class GroqClient:
             return [], []
 
         try:
+            self._acquire({"requests": 1}, BACKGROUND)
             models = self.client.models.list()
             all_models = models.data
 
@@ -50,80 +187,340 @@ class GroqClient:
             logger.error(f"Error listing models: {e}")
             return [], []
 
-    def transcribe(self, file_source: Union[str, Any], model_id: str = "whisper-large-v3", prompt: Optional[str] = None) -> str:
+    def _create(
+        self,
+        label: str,
+        method: str,
+        params: Dict[str, Any],
+        file_factory: Optional[Callable[[], Any]] = None,
+        cost: Optional[Dict[str, float]] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Any:
+        """Run an SDK call such as ``"chat.completions.create"`` through the
+        request policy (if there is one) and the key pool.
+
+        ``cancel_token`` is checked before every attempt, so a cancelled job
+        neither retries nor fails over to another key.
+        """
+        create = operator.attrgetter(method)
+
+        def send(api_key: str, **extra: Any) -> Any:
+            raise_if_cancelled(cancel_token)
+            self._acquire(cost or {"requests": 1}, api_key=api_key)
+            raise_if_cancelled(cancel_token)
+            kwargs = dict(params, **extra)
+            if file_factory is not None:
+                kwargs["file"] = file_factory()
+            return create(self._sync_client(api_key))(**kwargs)
+
+        if self.policy is None:
+            return call_with_failover(self.pool, send, self._api_key)
+
+        def attempt(timeout: float) -> Any:
+            return call_with_failover(self.pool, lambda api_key: send(api_key, timeout=timeout), self._api_key)
+
+        return self.policy.call(attempt, label)
+
+    async def _create_async(
+        self,
+        label: str,
+        method: str,
+        params: Dict[str, Any],
+        file_factory: Optional[Callable[[], Any]] = None,
+        cost: Optional[Dict[str, float]] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Any:
+        create = operator.attrgetter(method)
+
+        async def send(api_key: str, **extra: Any) -> Any:
+            raise_if_cancelled(cancel_token)
+            await self._acquire_async(cost or {"requests": 1}, api_key=api_key)
+            raise_if_cancelled(cancel_token)
+            kwargs = dict(params, **extra)
+            if file_factory is not None:
+                kwargs["file"] = file_factory()
+            return await create(self._async(api_key))(**kwargs)
+
+        if self.policy is None:
+            return await call_with_failover_async(self.pool, send, self._api_key)
+
+        async def attempt(timeout: float) -> Any:
+            return await call_with_failover_async(
+                self.pool, lambda api_key: send(api_key, timeout=timeout), self._api_key
+            )
+
+        return await self.policy.call_async(attempt, label)
+
+    def _transcription_params(
+        self, file_source: Union[str, Any], model_id: str, prompt: Optional[str], per_attempt_file: bool
+    ) -> Tuple[Dict[str, Any], Optional[Callable[[], Any]]]:
+        """SDK parameters for a transcription, plus a factory for a fresh
+        ``file`` per attempt when ``per_attempt_file`` is set."""
+        file_factory: Optional[Callable[[], Any]] = None
+        # Handle in-memory recordings (EncodedAudio / BytesIO) and file paths
+        if hasattr(file_source, "getbuffer"):
+            # Zero-copy: hand the buffer object itself to the SDK, which
+            # streams it into the multipart body instead of us reading a copy.
+            file_source.seek(0)
+            filename = getattr(file_source, "filename", "audio.wav")
+            mime_type = getattr(file_source, "mime_type", "audio/wav")
+            file_tuple = (filename, file_source, mime_type)
+            if per_attempt_file:
+                # Retries and hedges each need the file from byte 0, and a
+                # hedge reads it concurrently: give every attempt its own reader.
+                if hasattr(file_source, "reader"):
+                    file_factory = lambda: (filename, file_source.reader(), mime_type)
+                else:
+                    payload = file_source.getvalue()
+                    file_factory = lambda: (filename, io.BytesIO(payload), mime_type)
+            logger.info(f"Transcribing from memory buffer: {file_source.getbuffer().nbytes} bytes")
+        elif hasattr(file_source, "read"):
+            # Other file-like objects - read and create tuple
+            audio_data = file_source.read()
+            file_tuple = ("audio.wav", audio_data)
+            logger.info(f"Transcribing from memory buffer: {len(audio_data)} bytes")
+        else:
+            # File path - open and read
+            with open(file_source, "rb") as f:
+                audio_data = f.read()
+            file_tuple = (file_source, audio_data)
+            logger.info(f"Transcribing from file: {file_source}")
+
+        # Build transcription parameters
+        params = {
+            "file": file_tuple,
+            "model": model_id,
+            "response_format": "json",
+            "language": "en",
+            "temperature": 0.0
+        }
+
+        # Add prompt if provided - helps with accuracy for:
+        # - Proper nouns and technical terms
+        # - Consistent punctuation and capitalization
+        # - Context from previous transcriptions
+        if prompt:
+            params["prompt"] = prompt
+        return params, file_factory
+
+    def transcribe(
+        self,
+        file_source: Union[str, Any],
+        model_id: str = "whisper-large-v3",
+        prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
         """
         Transcribe audio using Whisper model.
 
         Args:
-            file_source: Path to audio file OR BytesIO buffer (for zero-latency)
+            file_source: Path to audio file OR in-memory buffer (EncodedAudio / BytesIO)
             model_id: Whisper model to use
             prompt: Optional prompt to guide transcription accuracy.
                    This helps with proper nouns, technical terms, and style.
+            cancel_token: Checked before every attempt, as in ``_create``.
         """
         if not self.client:
             raise GroqClientError("API Key not set.")
 
         try:
-            # Handle both BytesIO (in-memory) and file paths
-            if hasattr(file_source, "read"):
-                # In-memory BytesIO buffer - read and create tuple
-                audio_data = file_source.read()
-                file_tuple = ("audio.wav", audio_data)
-                logger.info(f"Transcribing from memory buffer: {len(audio_data)} bytes")
-            else:
-                # File path - open and read
-                with open(file_source, "rb") as f:
-                    audio_data = f.read()
-                file_tuple = (file_source, audio_data)
-                logger.info(f"Transcribing from file: {file_source}")
-
-            # Build transcription parameters
-            params = {
-                "file": file_tuple,
-                "model": model_id,
-                "response_format": "json",
-                "language": "en",
-                "temperature": 0.0
-            }
-
-            # Add prompt if provided - helps with accuracy for:
-            # - Proper nouns and technical terms
-            # - Consistent punctuation and capitalization
-            # - Context from previous transcriptions
-            if prompt:
-                params["prompt"] = prompt
-
-            transcription = self.client.audio.transcriptions.create(**params)
+            params, file_factory = self._transcription_params(
+                file_source, model_id, prompt, per_attempt_file=self._per_attempt_file
+            )
+            transcription = self._create(
+                "transcription", "audio.transcriptions.create", params, file_factory,
+                cost=self._transcription_cost(file_source), cancel_token=cancel_token,
+            )
             return str(transcription.text)
         except APIStatusError as e:
             raise GroqClientError(f"API Error: {e.message}")
         except Exception as e:
             raise GroqClientError(f"Transcription failed: {e}")
 
-    def format_text(self, raw_text: str, model_id: str = "openai/gpt-oss-120b", system_prompt: Optional[str] = None) -> str:
+    async def transcribe_async(
+        self,
+        file_source: Union[str, Any],
+        model_id: str = "whisper-large-v3",
+        prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
+        """``transcribe`` on the async client; cancelling it aborts the upload."""
         if not self.client:
             raise GroqClientError("API Key not set.")
+        try:
+            params, file_factory = self._transcription_params(
+                file_source, model_id, prompt, per_attempt_file=self._per_attempt_file
+            )
+            transcription = await self._create_async(
+                "transcription", "audio.transcriptions.create", params, file_factory,
+                cost=self._transcription_cost(file_source), cancel_token=cancel_token,
+            )
+            return str(transcription.text)
+        except APIStatusError as e:
+            raise GroqClientError(f"API Error: {e.message}")
+        except Exception as e:
+            raise GroqClientError(f"Transcription failed: {e}")
 
+    @staticmethod
+    def _format_params(raw_text: str, model_id: str, system_prompt: Optional[str]) -> Dict[str, Any]:
         prompt = system_prompt if system_prompt else SYSTEM_PROMPT_FORMATTER
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": prompt
+                },
+                {
+                    "role": "user",
+                    "content": raw_text
+                }
+            ],
+            "model": model_id,
+            "temperature": 0.3,
+        }
 
+    def _cached_format(self, params: Dict[str, Any]) -> Optional[str]:
+        if self.format_cache is None:
+            return None
         try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": raw_text
-                    }
-                ],
-                model=model_id,
-                temperature=0.3,
+            return self.format_cache.get(params["messages"][1]["content"], params["model"], params["messages"][0]["content"])
+        except Exception as e:
+            logger.warning(f"Format cache lookup failed: {e}")
+            return None
+
+    def _store_format(self, params: Dict[str, Any], text: str) -> None:
+        if self.format_cache is None:
+            return
+        try:
+            self.format_cache.put(
+                params["messages"][1]["content"], params["model"], params["messages"][0]["content"], text
             )
-            return str(completion.choices[0].message.content)
+        except Exception as e:
+            logger.warning(f"Format cache write failed: {e}")
+
+    def format_text(
+        self,
+        raw_text: str,
+        model_id: str = "openai/gpt-oss-120b",
+        system_prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
+        if not self.client:
+            raise GroqClientError("API Key not set.")
+
+        params = self._format_params(raw_text, model_id, system_prompt)
+        cached = self._cached_format(params)
+        if cached is not None:
+            return cached
+        try:
+            completion = self._create(
+                "format", "chat.completions.create", params, cost=self._format_cost(params), cancel_token=cancel_token
+            )
+            text = str(completion.choices[0].message.content)
+        except Exception as e:
+            raise GroqClientError(f"Formatting failed: {e}")
+        self._store_format(params, text)
+        return text
+
+    async def format_text_async(
+        self,
+        raw_text: str,
+        model_id: str = "openai/gpt-oss-120b",
+        system_prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> str:
+        if not self.client:
+            raise GroqClientError("API Key not set.")
+        params = self._format_params(raw_text, model_id, system_prompt)
+        cached = self._cached_format(params)
+        if cached is not None:
+            return cached
+        try:
+            completion = await self._create_async(
+                "format", "chat.completions.create", params, cost=self._format_cost(params), cancel_token=cancel_token
+            )
+            text = str(completion.choices[0].message.content)
+        except Exception as e:
+            raise GroqClientError(f"Formatting failed: {e}")
+        self._store_format(params, text)
+        return text
+
+    @staticmethod
+    def _delta_text(chunk: Any) -> str:
+        choices = getattr(chunk, "choices", None) or []
+        if not choices:
+            return ""
+        return str(getattr(choices[0].delta, "content", None) or "")
+
+    def format_text_stream(
+        self,
+        raw_text: str,
+        model_id: str = "openai/gpt-oss-120b",
+        system_prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        """``format_text`` as a stream of text deltas.
+
+        The request policy covers opening the stream (time to first byte);
+        a stream that breaks midway raises rather than restarting, since part
+        of it may already have been typed. Cancelling ``cancel_token`` closes
+        the stream at the next chunk.
+        """
+        if not self.client:
+            raise GroqClientError("API Key not set.")
+
+        params = self._format_params(raw_text, model_id, system_prompt)
+        cached = self._cached_format(params)
+        if cached is not None:
+            yield cached
+            return
+        deltas: List[str] = []
+        try:
+            stream = self._create(
+                "format_stream", "chat.completions.create", dict(params, stream=True),
+                cost=self._format_cost(params), cancel_token=cancel_token,
+            )
+            with stream:
+                for chunk in stream:
+                    raise_if_cancelled(cancel_token)
+                    delta = self._delta_text(chunk)
+                    if delta:
+                        deltas.append(delta)
+                        yield delta
+        except Exception as e:
+            raise GroqClientError(f"Formatting failed: {e}")
+        self._store_format(params, "".join(deltas))
+
+    async def format_text_stream_async(
+        self,
+        raw_text: str,
+        model_id: str = "openai/gpt-oss-120b",
+        system_prompt: Optional[str] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> AsyncIterator[str]:
+        if not self.client:
+            raise GroqClientError("API Key not set.")
+        params = self._format_params(raw_text, model_id, system_prompt)
+        cached = self._cached_format(params)
+        if cached is not None:
+            yield cached
+            return
+        deltas: List[str] = []
+        try:
+            stream = await self._create_async(
+                "format_stream", "chat.completions.create", dict(params, stream=True),
+                cost=self._format_cost(params), cancel_token=cancel_token,
+            )
+            async with stream:
+                async for chunk in stream:
+                    raise_if_cancelled(cancel_token)
+                    delta = self._delta_text(chunk)
+                    if delta:
+                        deltas.append(delta)
+                        yield delta
         except Exception as e:
             raise GroqClientError(f"Formatting failed: {e}")
+        self._store_format(params, "".join(deltas))
 
     def run_search(
         self,
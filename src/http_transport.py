@@ -0,0 +1,380 @@
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+
+
+def _http2_available() -> bool:
+    try:
+        importlib.import_module("h2")
+        return True
+    except Exception:
+        return False
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(str(url))
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ConnectionStats:
+    """Request setup time (pool checkout, DNS, TCP, TLS) split by cold/warm."""
+
+    def __init__(self):
+        self.cold = 0
+        self.warm = 0
+        self.cold_ms = 0.0
+        self.warm_ms = 0.0
+
+    def record(self, cold: bool, setup_ms: float) -> None:
+        if cold:
+            self.cold += 1
+            self.cold_ms += setup_ms
+        else:
+            self.warm += 1
+            self.warm_ms += setup_ms
+
+    def summary(self) -> str:
+        cold_avg = self.cold_ms / self.cold if self.cold else 0.0
+        warm_avg = self.warm_ms / self.warm if self.warm else 0.0
+        return (
+            f"{self.cold} cold requests (avg setup {cold_avg:.1f} ms), "
+            f"{self.warm} warm requests (avg setup {warm_avg:.1f} ms)"
+        )
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """What each SDK's httpx.Client sends through: the manager's pool.
+
+    ``close`` is a no-op so an SDK client being closed or collected cannot
+    tear down connections the other clients are using.
+    """
+
+    def __init__(self, manager: "ConnectionManager"):
+        self._manager = manager
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._manager._send(request)
+
+    def close(self) -> None:
+        pass
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream: Any, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        try:
+            self._stream.close()
+        finally:
+            if on_close is not None:
+                on_close()
+
+
+class _AsyncSharedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of _SharedTransport, for clients on the pipeline loop."""
+
+    def __init__(self, manager: "ConnectionManager"):
+        self._manager = manager
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._manager._send_async(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        try:
+            await self._stream.aclose()
+        finally:
+            if on_close is not None:
+                on_close()
+
+
+class ConnectionManager:
+    """One keep-alive connection pool shared by the Groq and Gemini clients.
+
+    Each SDK gets its own ``httpx.Client`` from ``http_client()`` but they all
+    send through the same pool. ``warm()`` opens connections to every
+    registered origin on a background thread. It is called on hotkey press,
+    while the user is still speaking, so DNS, TCP and TLS (and HTTP/2 setup
+    when ``h2`` is installed) are done by the time the first request goes out.
+    The pool is closed once no request has used it for
+    ``idle_expiry_seconds``, so idle connections do not linger.
+
+    Async clients (``async_http_client()``) get a second pool that lives on
+    the event loop passed to ``attach_loop``; once a loop is attached,
+    ``warm()`` warms that pool instead, since that is where requests go.
+    """
+
+    def __init__(
+        self,
+        idle_expiry_seconds: float = 90.0,
+        max_keepalive_connections: int = 8,
+        http2: Optional[bool] = None,
+        warm_timeout_seconds: float = 5.0,
+    ):
+        self.idle_expiry_seconds = max(1.0, float(idle_expiry_seconds))
+        self.max_keepalive_connections = max(1, int(max_keepalive_connections))
+        self.http2 = _http2_available() if http2 is None else bool(http2)
+        self.warm_timeout_seconds = float(warm_timeout_seconds)
+        self.stats = ConnectionStats()
+        self.transport = _SharedTransport(self)
+        self.async_transport = _AsyncSharedTransport(self)
+        self._lock = threading.Lock()
+        self._pool: Optional[httpx.HTTPTransport] = None
+        self._async_pool: Optional[httpx.AsyncHTTPTransport] = None
+        self._async_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._origins: Dict[str, float] = {}  # origin -> last use (monotonic)
+        self._in_flight = 0
+        self._last_activity = 0.0
+        self._warming: Optional[Union[threading.Thread, Future]] = None
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def http_client(self, event_hooks: Optional[Dict[str, List[Any]]] = None) -> httpx.Client:
+        """A client for one SDK that sends through the shared pool."""
+        return httpx.Client(transport=self.transport, event_hooks=event_hooks)
+
+    def async_http_client(self, event_hooks: Optional[Dict[str, List[Any]]] = None) -> httpx.AsyncClient:
+        """An async client for one SDK that sends through the shared async pool."""
+        return httpx.AsyncClient(transport=self.async_transport, event_hooks=event_hooks)
+
+    def attach_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Warm (and later close) the async pool on ``loop``."""
+        self._loop = loop
+
+    def register(self, url: str) -> None:
+        """Add the origin of ``url`` to the set ``warm()`` connects to."""
+        with self._lock:
+            self._origins.setdefault(origin_of(url), 0.0)
+
+    @property
+    def is_open(self) -> bool:
+        return self._pool is not None or self._async_pool is not None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.idle_expiry_seconds,
+        )
+
+    # -- warming ---------------------------------------------------------
+    def warm(self) -> None:
+        """Open connections to registered origins not used within the expiry
+        window, in the background. Returns immediately."""
+        now = time.monotonic()
+        loop = self._loop if self._loop is not None and self._loop.is_running() else None
+        with self._lock:
+            if self._is_warming():
+                return
+            pool = self._async_pool if loop is not None else self._pool
+            stale = [
+                origin for origin, last in self._origins.items()
+                if pool is None or now - last >= self.idle_expiry_seconds
+            ]
+            if not stale:
+                return
+            if loop is not None:
+                self._warming = asyncio.run_coroutine_threadsafe(self._warm_async(stale), loop)
+            else:
+                self._warming = threading.Thread(target=self._warm, args=(stale,), name="ConnectionWarmup", daemon=True)
+                self._warming.start()
+
+    def _is_warming(self) -> bool:
+        warming = self._warming
+        if isinstance(warming, Future):
+            return not warming.done()
+        return warming is not None and warming.is_alive()
+
+    def _warm(self, origins: List[str]) -> None:
+        with httpx.Client(transport=self.transport, timeout=self.warm_timeout_seconds) as client:
+            for origin in origins:
+                started = time.perf_counter()
+                try:
+                    # Any response will do; the point is the pooled connection.
+                    client.head(f"{origin}/")
+                    logger.info(f"Pre-warmed {origin} in {(time.perf_counter() - started) * 1000:.1f} ms")
+                except Exception as e:
+                    logger.debug(f"Pre-warming {origin} failed: {e}")
+
+    async def _warm_async(self, origins: List[str]) -> None:
+        async with httpx.AsyncClient(transport=self.async_transport, timeout=self.warm_timeout_seconds) as client:
+
+            async def head(origin: str) -> None:
+                started = time.perf_counter()
+                try:
+                    await client.head(f"{origin}/")
+                    logger.info(f"Pre-warmed {origin} in {(time.perf_counter() - started) * 1000:.1f} ms")
+                except Exception as e:
+                    logger.debug(f"Pre-warming {origin} failed: {e}")
+
+            await asyncio.gather(*(head(origin) for origin in origins))
+
+    def wait_warm(self, timeout: Optional[float] = None) -> None:
+        warming = self._warming
+        if isinstance(warming, Future):
+            try:
+                warming.result(timeout)
+            except Exception:
+                pass
+        elif warming is not None:
+            warming.join(timeout)
+
+    # -- sending ---------------------------------------------------------
+    def _checkout(self, use_async: bool = False) -> Union[httpx.HTTPTransport, httpx.AsyncHTTPTransport]:
+        with self._lock:
+            if use_async:
+                if self._async_pool is None:
+                    self._async_pool = httpx.AsyncHTTPTransport(http2=self.http2, limits=self._limits())
+                    self._async_pool_loop = asyncio.get_running_loop()
+                pool: Any = self._async_pool
+            else:
+                if self._pool is None:
+                    self._pool = httpx.HTTPTransport(http2=self.http2, limits=self._limits())
+                pool = self._pool
+            if self._reaper is None:
+                self._stop.clear()
+                self._reaper = threading.Thread(target=self._reap, name="ConnectionReaper", daemon=True)
+                self._reaper.start()
+            self._in_flight += 1
+            self._last_activity = time.monotonic()
+            return pool
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        pool = self._checkout()
+        origin = origin_of(str(request.url))
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            timings.setdefault(event, time.perf_counter())
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = pool.handle_request(request)
+        except BaseException:
+            self._release(origin)
+            raise
+        self._report(origin, started, timings)
+        # The connection stays busy until the body is consumed (Gemini
+        # streams for seconds), so only count the request done on close.
+        response.stream = _ReleasingStream(response.stream, lambda: self._release(origin))
+        return response
+
+    async def _send_async(self, request: httpx.Request) -> httpx.Response:
+        pool = self._checkout(use_async=True)
+        origin = origin_of(str(request.url))
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            timings.setdefault(event, time.perf_counter())
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = await pool.handle_async_request(request)
+        except BaseException:
+            self._release(origin)
+            raise
+        self._report(origin, started, timings)
+        response.stream = _AsyncReleasingStream(response.stream, lambda: self._release(origin))
+        return response
+
+    def _release(self, origin: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._last_activity = time.monotonic()
+            if origin in self._origins:
+                self._origins[origin] = self._last_activity
+
+    def _report(self, origin: str, started: float, timings: Dict[str, float]) -> None:
+        sent = next((at for event, at in timings.items() if event.endswith("send_request_headers.started")), None)
+        if sent is None:
+            return
+        cold = "connection.connect_tcp.started" in timings
+        setup_ms = (sent - started) * 1000
+        self.stats.record(cold, setup_ms)
+        if cold:
+            tcp = timings.get("connection.connect_tcp.complete", sent) - timings["connection.connect_tcp.started"]
+            tls_start = timings.get("connection.start_tls.started")
+            tls = timings.get("connection.start_tls.complete", sent) - tls_start if tls_start else 0.0
+            logger.info(
+                f"{origin}: cold connection, setup {setup_ms:.1f} ms "
+                f"(dns+tcp {tcp * 1000:.1f} ms, tls {tls * 1000:.1f} ms)"
+            )
+        else:
+            logger.info(f"{origin}: warm connection, setup {setup_ms:.1f} ms")
+
+    # -- expiry ----------------------------------------------------------
+    def _reap(self) -> None:
+        interval = min(30.0, max(0.05, self.idle_expiry_seconds / 4.0))
+        while not self._stop.wait(interval):
+            self.expire_idle()
+
+    def expire_idle(self, now: Optional[float] = None) -> bool:
+        """Close the pools if nothing has used them for ``idle_expiry_seconds``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self.is_open or self._in_flight:
+                return False
+            if now - self._last_activity < self.idle_expiry_seconds:
+                return False
+            pools = self._take_pools()
+        logger.debug("Closing idle HTTP connections")
+        self._close_pools(pools)
+        return True
+
+    def _take_pools(self) -> Tuple[Any, Any, Any]:
+        pools = (self._pool, self._async_pool, self._async_pool_loop)
+        self._pool = self._async_pool = self._async_pool_loop = None
+        return pools
+
+    def _close_pools(self, pools: Tuple[Any, Any, Any]) -> None:
+        pool, async_pool, loop = pools
+        if pool is not None:
+            pool.close()
+        if async_pool is not None and loop is not None and not loop.is_closed():
+            # Async connections belong to their loop; close them there.
+            try:
+                asyncio.run_coroutine_threadsafe(async_pool.aclose(), loop)
+            except RuntimeError:
+                pass
+
+    def close(self) -> None:
+        self._stop.set()
+        reaper, self._reaper = self._reaper, None
+        if reaper is not None and reaper is not threading.current_thread():
+            reaper.join(timeout=1.0)
+        with self._lock:
+            pools = self._take_pools()
+        self._close_pools(pools)
+        logger.info(f"HTTP connections: {self.stats.summary()}")
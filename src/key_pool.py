@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.rate_limiter import parse_reset
+
+logger = logging.getLogger(__name__)
+
+AUTH_STATUS_CODES = frozenset({401, 403})
+QUOTA_STATUS_CODES = frozenset({429})
+
+
+def mask_key(api_key: str) -> str:
+    """Loggable form of a key: the prefix and the last four characters."""
+    key = str(api_key or "")
+    if len(key) <= 8:
+        return "…" + key[-2:]
+    return f"{key[:4]}…{key[-4:]}"
+
+
+def failover_reason(exc: BaseException) -> Optional[str]:
+    """"auth" or "quota" when another key might succeed where this one failed."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(exc, "code", None)  # google-genai APIError
+    if status in AUTH_STATUS_CODES:
+        return "auth"
+    if status in QUOTA_STATUS_CODES:
+        return "quota"
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    return parse_reset(headers.get("retry-after"))
+
+
+class KeyUsage:
+    """Per-key counters and cool-down state."""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.label = mask_key(api_key)
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.last_throttled = 0.0
+        self.cooldown_until = 0.0
+        self.last_error = ""
+
+
+class KeyPool:
+    """API keys for one provider, spread by least-recently-throttled.
+
+    ``choose`` returns the available key that was throttled longest ago
+    (never-throttled keys first, then the least used). A key that fails with
+    a quota error cools down for ``cooldown_seconds`` (or the server's
+    retry-after); one that fails authentication cools down for
+    ``auth_cooldown_seconds``. While every key is cooling down the one that
+    recovers first is still handed out, so the server has the final word.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        cooldown_seconds: float = 60.0,
+        auth_cooldown_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.auth_cooldown_seconds = float(auth_cooldown_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._usage: Dict[str, KeyUsage] = {}
+        for key in keys:
+            key = str(key or "").strip()
+            if key and key not in self._usage:
+                self._usage[key] = KeyUsage(key)
+
+    def __len__(self) -> int:
+        return len(self._usage)
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._usage)
+
+    def choose(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        excluded = set(exclude)
+        now = self._clock()
+        with self._lock:
+            candidates = [usage for key, usage in self._usage.items() if key not in excluded]
+            if not candidates:
+                return None
+            ready = [usage for usage in candidates if usage.cooldown_until <= now]
+            if ready:
+                chosen = min(ready, key=lambda usage: (usage.last_throttled, usage.requests))
+            else:
+                chosen = min(candidates, key=lambda usage: usage.cooldown_until)
+            chosen.requests += 1
+            return chosen.api_key
+
+    def record_failure(self, api_key: str, reason: str, retry_after: Optional[float] = None) -> None:
+        now = self._clock()
+        with self._lock:
+            usage = self._usage.get(api_key)
+            if usage is None:
+                return
+            usage.failures += 1
+            usage.last_error = reason
+            if reason == "auth":
+                cooldown = self.auth_cooldown_seconds
+            else:
+                usage.throttled += 1
+                usage.last_throttled = now
+                cooldown = max(self.cooldown_seconds, retry_after or 0.0)
+            usage.cooldown_until = max(usage.cooldown_until, now + cooldown)
+            pooled = len(self._usage) > 1
+        if pooled:
+            # With a single key there is nothing to fail over to.
+            logger.warning(f"API key {usage.label} failed ({reason}); cooling down for {cooldown:.0f}s")
+
+    def record_success(self, api_key: str) -> None:
+        with self._lock:
+            usage = self._usage.get(api_key)
+            if usage is not None and usage.last_error == "auth":
+                # The key works again (e.g. billing fixed); stop avoiding it.
+                usage.cooldown_until = 0.0
+                usage.last_error = ""
+
+    def usage(self) -> List[Dict[str, Any]]:
+        now = self._clock()
+        with self._lock:
+            return [
+                {
+                    "key": usage.label,
+                    "requests": usage.requests,
+                    "failures": usage.failures,
+                    "throttled": usage.throttled,
+                    "cooling_down_seconds": max(0.0, usage.cooldown_until - now),
+                    "last_error": usage.last_error,
+                }
+                for usage in self._usage.values()
+            ]
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{item['key']}: {item['requests']} requests, {item['throttled']} throttled, "
+            f"{item['failures']} failed" + (" (cooling down)" if item["cooling_down_seconds"] else "")
+            for item in self.usage()
+        ) or "no keys"
+
+
+def call_with_failover(pool: Optional[KeyPool], call: Callable[[str], Any], fallback_key: str = "") -> Any:
+    """Run ``call(key)``, moving to the next key on auth/quota errors."""
+    if pool is None or not len(pool):
+        return call(fallback_key)
+    tried: List[str] = []
+    while True:
+        key = pool.choose(exclude=tried)
+        try:
+            result = call(key)
+        except Exception as exc:
+            if not _fail_over(pool, key, exc, tried):
+                raise
+            continue
+        pool.record_success(key)
+        return result
+
+
+async def call_with_failover_async(pool: Optional[KeyPool], call: Callable[[str], Any], fallback_key: str = "") -> Any:
+    if pool is None or not len(pool):
+        return await call(fallback_key)
+    tried: List[str] = []
+    while True:
+        key = pool.choose(exclude=tried)
+        try:
+            result = await call(key)
+        except Exception as exc:
+            if not _fail_over(pool, key, exc, tried):
+                raise
+            continue
+        pool.record_success(key)
+        return result
+
+
+def _fail_over(pool: KeyPool, key: str, exc: BaseException, tried: List[str]) -> bool:
+    """Record ``exc`` against ``key``; True when an untried key is left to use."""
+    reason = failover_reason(exc)
+    if reason is None:
+        return False
+    pool.record_failure(key, reason, retry_after_seconds(exc))
+    tried.append(key)
+    return len(tried) < len(pool)
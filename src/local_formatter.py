@@ -0,0 +1,147 @@
+import logging
+import re
+import threading
+from typing import Optional
+
+from src.math_formatting import looks_like_math_dictation
+
+logger = logging.getLogger(__name__)
+
+# Dictation the LLM formatter would restructure rather than just tidy.
+_FILLERS = re.compile(r"\b(?:um+|uh+|erm+|hmm+|you know)\b", re.IGNORECASE)
+_CORRECTIONS = re.compile(
+    r"\b(?:scratch that|delete that|i mean|no wait|sorry,? i meant|let me rephrase)\b", re.IGNORECASE
+)
+_STRUCTURE = re.compile(
+    r"\b(?:bullet(?: point)?s?|new (?:line|paragraph)|next line|number (?:one|two|three)|"
+    r"step (?:one|two|three)|first(?:ly)?,? .* second(?:ly)?)\b",
+    re.IGNORECASE,
+)
+_REPEATED_WORD = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
+_MARKDOWN = re.compile(r"[*#`_]")
+_SENTENCE_PUNCTUATION = re.compile(r"[.!?]")
+
+# "I", "I'm", "I've", "I'll", "I'd" written lowercase.
+_PRONOUN_I = re.compile(r"(?<![\w'])i(?=(?:'(?:m|ve|ll|d|s))?\b)")
+_SENTENCE_START = re.compile(r"(^|[.!?]\s+)([a-z])")
+
+
+def format_locally(text: str) -> str:
+    """Deterministic subset of the formatter prompt's rules.
+
+    Fixes spacing, capitalization and terminal punctuation, and applies the
+    prompt's unambiguous symbol substitutions ("^2", "^3", "1/2", "N degrees").
+    Meaning-dependent rules (lists, paragraphs, math grouping, Greek letters)
+    are left to the LLM.
+    """
+    formatted = " ".join(str(text or "").split())
+    if not formatted:
+        return ""
+
+    formatted = re.sub(r"\s+([,.!?;:])", r"\1", formatted)
+    formatted = re.sub(r"([,;:!?])(?=[A-Za-z])", r"\1 ", formatted)
+
+    formatted = formatted.replace("^2", "²").replace("^3", "³")
+    formatted = re.sub(r"(?<![\d/])1/2(?![\d/])", "½", formatted)
+    formatted = re.sub(r"(\d)\s*degrees?\b", r"\1°", formatted, flags=re.IGNORECASE)
+
+    formatted = _PRONOUN_I.sub("I", formatted)
+    formatted = _SENTENCE_START.sub(lambda m: m.group(1) + m.group(2).upper(), formatted)
+
+    if formatted[-1].isalnum() or formatted[-1] in "°²³½":
+        formatted += "."
+    return formatted
+
+
+def llm_needed(text: str, max_words: int = 40) -> Optional[str]:
+    """Why ``text`` should go to the LLM formatter, or None if it is clean enough.
+
+    Clean enough means the LLM would only make the changes ``format_locally``
+    makes: a short dictation with no fillers, self-corrections, spoken list or
+    paragraph cues, math, markdown, or missing inner punctuation.
+    """
+    cleaned = " ".join(str(text or "").split())
+    if not cleaned:
+        return None
+    words = cleaned.split(" ")
+    if len(words) > max_words:
+        return "long"
+    if _FILLERS.search(cleaned):
+        return "fillers"
+    if _CORRECTIONS.search(cleaned):
+        return "self-correction"
+    if _STRUCTURE.search(cleaned):
+        return "structure"
+    if looks_like_math_dictation(cleaned):
+        return "math"
+    if _MARKDOWN.search(cleaned):
+        return "markdown"
+    if _REPEATED_WORD.search(cleaned):
+        return "repetition"
+    if len(words) > 8 and not _SENTENCE_PUNCTUATION.search(cleaned[:-1]) and "," not in cleaned:
+        return "unpunctuated"
+    return None
+
+
+class FastPathStats:
+    """How many dictations skipped the LLM and roughly how long that saved."""
+
+    def __init__(self):
+        self.dictations = 0
+        self.local = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_dictation(self, local: bool) -> None:
+        with self._lock:
+            self.dictations += 1
+            if local:
+                self.local += 1
+
+    def record_llm(self, seconds: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += float(seconds)
+
+    @property
+    def local_fraction(self) -> float:
+        return self.local / self.dictations if self.dictations else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        # Each local dictation saved one average LLM formatting round trip.
+        if not self.llm_calls:
+            return 0.0
+        return self.local * (self.llm_seconds / self.llm_calls)
+
+    def summary(self) -> str:
+        return (
+            f"{self.local}/{self.dictations} dictations formatted locally "
+            f"({self.local_fraction * 100:.0f}%), ~{self.saved_seconds:.1f}s saved"
+        )
+
+
+class LocalFormatter:
+    """Fast path in front of the LLM formatter for Default-style dictation.
+
+    ``try_format(raw)`` returns the locally formatted text when ``llm_needed``
+    finds nothing for the LLM to do, else None. Callers report LLM formatting
+    time through ``record_llm`` so ``stats`` can estimate the time saved.
+    """
+
+    def __init__(self, max_words: int = 40):
+        self.max_words = max(1, int(max_words))
+        self.stats = FastPathStats()
+
+    def try_format(self, raw_text: str) -> Optional[str]:
+        reason = llm_needed(raw_text, self.max_words)
+        self.stats.record_dictation(local=reason is None)
+        if reason is not None:
+            logger.debug(f"Formatter fast path skipped: {reason}")
+            return None
+        logger.info("Formatted locally; skipped LLM formatter")
+        return format_locally(raw_text)
+
+    def record_llm(self, seconds: float) -> None:
+        self.stats.record_llm(seconds)
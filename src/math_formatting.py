@@ -22,7 +22,7 @@ def _to_superscript(value: str) -> str:
     return str(value).translate(_SUPERSCRIPTS)
 
 
-def _looks_like_math_dictation(text: str) -> bool:
+def looks_like_math_dictation(text: str) -> bool:
     lower = f" {str(text or '').lower()} "
     keywords = (
         " plus ",
@@ -45,7 +45,7 @@ def normalize_math_dictation(text: str) -> str:
     source = str(text or "")
     if not source.strip():
         return source
-    if not _looks_like_math_dictation(source):
+    if not looks_like_math_dictation(source):
         return source
 
     normalized = " ".join(source.split())
@@ -0,0 +1,156 @@
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QtBridge(QObject):
+    """Runs callables on the thread this object lives on (the GUI thread).
+
+    ``post`` may be called from any thread. Everything the pipeline engine
+    hands back to Qt goes through here, so there is one queued hop per result
+    rather than one per worker.
+    """
+
+    _deliver = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._deliver.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    def post(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._deliver.emit((fn, args))
+
+    @staticmethod
+    def _run(item: Any) -> None:
+        fn, args = item
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Error delivering pipeline result to Qt")
+
+
+class PipelineEngine:
+    """One long-lived asyncio event loop thread for API pipelines.
+
+    Dictations are submitted as coroutines instead of starting a QThread
+    each, so their uploads, retries and streams are tasks on the same loop.
+    Independent I/O overlaps and ``cancel()`` on the returned future cancels
+    the task, closing its HTTP requests.
+    """
+
+    def __init__(self, name: str = "api-pipeline"):
+        self.name = name
+        # Created here, on the constructing (GUI) thread, so deliveries land there.
+        self.bridge = QtBridge()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The engine's loop, starting the thread on first use."""
+        self.start()
+        assert self._loop is not None
+        return self._loop
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._loop = loop
+            self._thread = threading.Thread(target=self._run, args=(loop, ready), name=self.name, daemon=True)
+            self._thread.start()
+        ready.wait()
+
+    def _run(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            # Let cancelled pipelines and pending pool shutdowns finish cleanly.
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        """Schedule ``coro`` on the loop; cancelling the future cancels the task."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run_blocking(self, fn: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+        """Await a blocking call (e.g. a model listing) without stalling the loop."""
+        return self.loop.run_in_executor(None, fn, *args)
+
+    def stop(self, timeout: float = 3.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Pipeline engine thread did not stop within %.1fs", timeout)
+
+
+_default_engine: Optional[PipelineEngine] = None
+_default_lock = threading.Lock()
+
+
+def default_engine() -> PipelineEngine:
+    """Process-wide engine for jobs started without one (create it on the GUI thread)."""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = PipelineEngine()
+        return _default_engine
+
+
+async def call_stage(obj: Any, name: str, *args: Any, native: bool = True, **kwargs: Any) -> Any:
+    """Await ``obj.<name>_async`` when it exists, else ``obj.<name>``.
+
+    With ``native`` the sync fallback runs on a thread so the loop stays free;
+    without it the sync method is called inline (for callers that own a
+    private loop and want the blocking call, e.g. ``Worker.run``).
+    """
+    if native:
+        method = getattr(obj, f"{name}_async", None)
+        if method is not None and asyncio.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(getattr(obj, name), *args, **kwargs)
+    return getattr(obj, name)(*args, **kwargs)
+
+
+async def stream_stage(obj: Any, name: str, *args: Any, native: bool = True, **kwargs: Any) -> AsyncIterator[Any]:
+    """``call_stage`` for generators: iterate ``obj.<name>_async`` or ``obj.<name>``."""
+    if native:
+        method = getattr(obj, f"{name}_async", None)
+        if method is not None and inspect.isasyncgenfunction(method):
+            async for item in method(*args, **kwargs):
+                yield item
+            return
+    iterator = iter(getattr(obj, name)(*args, **kwargs))
+    done = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done) if native else next(iterator, done)
+        if item is done:
+            return
+        yield item
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Request priorities: dictation goes ahead of housekeeping such as model listing.
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_HEADER = re.compile(r"^x-ratelimit-(limit|remaining|reset)-(.+)$")
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Any) -> Optional[float]:
+    """Seconds from a reset header: "7.66s", "2m59.56s", "120ms" or plain seconds."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Client-side view of one server-side limit (requests, tokens, audio seconds)."""
+
+    def __init__(self, capacity: float, refill_per_second: float, now: float):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        self._refill(now)
+        deficit = amount - self.level
+        if deficit <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return deficit / self.refill_per_second
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def sync(self, limit: float, remaining: float, reset_seconds: Optional[float], now: float) -> None:
+        """Adopt the server's numbers; the window refills fully by ``reset``."""
+        self.capacity = float(limit)
+        self.level = min(float(remaining), self.capacity)
+        self._updated = now
+        if reset_seconds and reset_seconds > 0 and remaining < limit:
+            self.refill_per_second = (limit - remaining) / reset_seconds
+
+    @property
+    def fraction(self) -> float:
+        return max(0.0, self.level) / self.capacity if self.capacity > 0 else 0.0
+
+
+class RateLimitScheduler:
+    """Paces Groq requests from the x-ratelimit-* and retry-after response headers.
+
+    Every response updates one bucket per limited resource the server
+    reports (requests, tokens, and audio seconds for transcription). Before
+    sending, ``acquire(cost, priority)`` waits until the buckets cover
+    ``cost``, at most ``max_wait_seconds``; past that the request goes out
+    anyway and the request policy handles any 429. A 429 or retry-after
+    holds every request until it has passed. Background requests also leave
+    ``background_reserve`` of each bucket for dictation and yield to
+    interactive requests that are waiting.
+    """
+
+    def __init__(
+        self,
+        max_wait_seconds: float = 10.0,
+        background_reserve: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_wait_seconds = float(max_wait_seconds)
+        self.background_reserve = min(1.0, max(0.0, float(background_reserve)))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._blocked_until = 0.0
+        self._interactive_waiting = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.rate_limited = 0
+
+    def observe(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        now = self._clock()
+        limits: Dict[str, Dict[str, str]] = {}
+        for name, value in headers.items():
+            match = _HEADER.match(name.lower())
+            if match:
+                limits.setdefault(match.group(2).replace("-", "_"), {})[match.group(1)] = value
+        retry_after = parse_reset(headers.get("retry-after"))
+        with self._lock:
+            for resource, values in limits.items():
+                try:
+                    limit = float(values["limit"])
+                    remaining = float(values["remaining"])
+                except (KeyError, ValueError):
+                    continue
+                bucket = self._buckets.get(resource)
+                if bucket is None:
+                    bucket = self._buckets[resource] = TokenBucket(limit, 0.0, now)
+                bucket.sync(limit, remaining, parse_reset(values.get("reset")), now)
+            if status_code == 429:
+                self.rate_limited += 1
+            if retry_after is not None and (status_code == 429 or status_code >= 500):
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def _delay(self, cost: Mapping[str, float], priority: int, now: float) -> float:
+        wait = max(0.0, self._blocked_until - now)
+        for resource, amount in cost.items():
+            bucket = self._buckets.get(resource)
+            if bucket is None:
+                continue
+            if priority == BACKGROUND:
+                amount += bucket.capacity * self.background_reserve
+            wait = max(wait, bucket.wait_for(amount, now))
+        if priority == BACKGROUND and self._interactive_waiting:
+            wait = max(wait, 0.05)
+        return wait
+
+    def _take(self, cost: Mapping[str, float], now: float) -> None:
+        for resource, amount in cost.items():
+            bucket = self._buckets.get(resource)
+            if bucket is not None:
+                bucket.take(amount, now)
+
+    def _begin(self, priority: int) -> float:
+        with self._lock:
+            if priority == INTERACTIVE:
+                self._interactive_waiting += 1
+        return self._clock() + self.max_wait_seconds
+
+    def _step(self, cost: Mapping[str, float], priority: int, deadline: float) -> float:
+        """Seconds to sleep before checking again, or 0 once the request may go."""
+        with self._lock:
+            now = self._clock()
+            wait = min(self._delay(cost, priority, now), deadline - now)
+            if wait <= 0:
+                self._take(cost, now)
+            return max(0.0, wait)
+
+    def _end(self, priority: int, started: float) -> float:
+        waited = self._clock() - started
+        with self._lock:
+            if priority == INTERACTIVE:
+                self._interactive_waiting -= 1
+            if waited > 0.001:
+                self.waits += 1
+                self.waited_seconds += waited
+        if waited > 0.001:
+            logger.info(f"Held request {waited:.2f}s for Groq rate limits")
+        return waited
+
+    def acquire(self, cost: Mapping[str, float], priority: int = INTERACTIVE) -> float:
+        """Block until ``cost`` fits; returns the seconds waited."""
+        started = self._clock()
+        deadline = self._begin(priority)
+        try:
+            while True:
+                wait = self._step(cost, priority, deadline)
+                if wait <= 0:
+                    break
+                time.sleep(min(wait, 0.25))
+        finally:
+            waited = self._end(priority, started)
+        return waited
+
+    async def acquire_async(self, cost: Mapping[str, float], priority: int = INTERACTIVE) -> float:
+        started = self._clock()
+        deadline = self._begin(priority)
+        try:
+            while True:
+                wait = self._step(cost, priority, deadline)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(min(wait, 0.25))
+        finally:
+            waited = self._end(priority, started)
+        return waited
+
+    def headroom(self) -> Dict[str, Dict[str, float]]:
+        """Current estimate per resource: remaining, limit and fraction left."""
+        now = self._clock()
+        with self._lock:
+            report: Dict[str, Dict[str, float]] = {}
+            for resource, bucket in self._buckets.items():
+                bucket.wait_for(0.0, now)  # refill to now
+                report[resource] = {
+                    "remaining": max(0.0, bucket.level),
+                    "limit": bucket.capacity,
+                    "fraction": bucket.fraction,
+                }
+        return report
+
+    def blocked_seconds(self) -> float:
+        """How much longer a 429 / retry-after holds all requests."""
+        with self._lock:
+            return max(0.0, self._blocked_until - self._clock())
+
+    def summary(self) -> str:
+        levels = ", ".join(
+            f"{name} {values['fraction'] * 100:.0f}%" for name, values in self.headroom().items()
+        )
+        return (
+            f"{self.waits} requests held ({self.waited_seconds:.1f}s), {self.rate_limited} rate-limited; "
+            f"headroom: {levels or 'unknown'}"
+        )
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import httpx
+from groq import APIConnectionError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rate limits, overload and gateway errors are worth another try; 4xx
+# request errors (bad key, bad file) are not.
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+class AttemptTimeout(TimeoutError):
+    """An attempt got no answer within the policy's per-attempt timeout."""
+
+
+def _close_abandoned(future: Future) -> None:
+    """Close what an abandoned attempt returned, e.g. an unread stream.
+
+    Its connection only goes back to the pool on close; left open it would
+    also keep the shared pool from ever expiring.
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Closing an abandoned response failed: {e}")
+
+
+async def _aclose_abandoned(task: asyncio.Future) -> None:
+    if task.cancelled() or task.exception() is not None:
+        return
+    close = getattr(task.result(), "close", None)
+    if callable(close):
+        try:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.debug(f"Closing an abandoned response failed: {e}")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError, httpx.TransportError, APIConnectionError)):
+        return True
+    return getattr(exc, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """Recent successful-attempt latencies, for choosing the hedge delay."""
+
+    def __init__(self, window: int = 100):
+        self._samples: Deque[float] = deque(maxlen=max(1, int(window)))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(float(seconds))
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PolicyStats:
+    """Counters for what the policy did beyond a single plain attempt."""
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def bump(self, counter: str) -> None:
+        # Calls run concurrently (segment uploads, hedges); keep counts exact.
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} calls, {self.attempts} attempts, {self.retries} retries, "
+            f"{self.timeouts} timeouts, {self.hedges} hedges ({self.hedges_won} won)"
+        )
+
+
+class RequestPolicy:
+    """Per-attempt timeouts, jittered retries and optional hedging for API calls.
+
+    ``call(operation, label)`` runs ``operation(timeout)`` on a worker thread,
+    where ``timeout`` is the per-attempt budget to hand to the SDK. An attempt
+    that has not answered by then is abandoned. Timeouts, connection errors and
+    ``RETRYABLE_STATUS_CODES`` are retried up to ``max_attempts`` in total,
+    after a full-jitter exponential backoff (or the server's Retry-After).
+
+    With ``hedge`` on, a second copy of an attempt is started once it has run
+    longer than the ``hedge_quantile`` latency of recent calls with the same
+    label, and whichever copy answers first wins. Hedging starts after
+    ``hedge_min_samples`` calls have been timed.
+
+    ``call_async`` does the same for coroutines on an event loop. There the
+    losing copy and any timed-out attempt are cancelled rather than abandoned.
+    Whatever an abandoned or losing attempt still returns is closed.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 30.0,
+        max_attempts: int = 3,
+        backoff_base_seconds: float = 0.25,
+        backoff_max_seconds: float = 4.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 10,
+        retryable: Callable[[BaseException], bool] = is_retryable,
+        max_workers: int = 8,
+    ):
+        self.timeout_seconds = float(timeout_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base_seconds = float(backoff_base_seconds)
+        self.backoff_max_seconds = float(backoff_max_seconds)
+        self.hedge = bool(hedge)
+        self.hedge_quantile = float(hedge_quantile)
+        self.hedge_min_samples = max(1, int(hedge_min_samples))
+        self.retryable = retryable
+        self.stats = PolicyStats()
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(2, int(max_workers)), thread_name_prefix="api-request")
+
+    def configure(
+        self,
+        timeout_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        hedge: Optional[bool] = None,
+    ) -> None:
+        if timeout_seconds:
+            self.timeout_seconds = float(timeout_seconds)
+        if max_attempts:
+            self.max_attempts = max(1, int(max_attempts))
+        if hedge is not None:
+            self.hedge = bool(hedge)
+
+    def latency(self, label: str) -> LatencyTracker:
+        tracker = self._latency.get(label)
+        if tracker is None:
+            tracker = self._latency.setdefault(label, LatencyTracker())
+        return tracker
+
+    def hedge_delay(self, label: str) -> Optional[float]:
+        """Seconds after which an attempt is duplicated, or None for no hedge."""
+        tracker = self.latency(label)
+        if not self.hedge or len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.quantile(self.hedge_quantile)
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        retry_after = _retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max_seconds)
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (attempt - 1)))
+        return random.uniform(0.0, ceiling)
+
+    def call(self, operation: Callable[[float], T], label: str = "request") -> T:
+        self.stats.bump("calls")
+        attempt = 1
+        while True:
+            try:
+                return self._attempt(operation, label)
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.retryable(e):
+                    raise
+                delay = self.backoff(attempt, e)
+                self.stats.bump("retries")
+                logger.warning(f"{label} attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def _attempt(self, operation: Callable[[float], T], label: str) -> T:
+        timeout = self.timeout_seconds
+        hedge_delay = self.hedge_delay(label)
+        started: Dict[Future, float] = {}
+
+        def submit() -> Future:
+            self.stats.bump("attempts")
+            future = self._executor.submit(operation, timeout)
+            started[future] = time.monotonic()
+            return future
+
+        first = submit()
+        deadline = started[first] + timeout
+        hedge_at = started[first] + hedge_delay if hedge_delay is not None else None
+        pending = {first}
+        errors: List[BaseException] = []
+        winner: Optional[Future] = None
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    self.stats.bump("timeouts")
+                    raise AttemptTimeout(f"{label} got no response within {timeout:.1f}s")
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    self.stats.bump("hedges")
+                    logger.info(f"{label} slower than p{self.hedge_quantile * 100:.0f} ({hedge_delay:.2f}s); hedging")
+                    pending.add(submit())
+                    continue
+                until = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, pending = wait(pending, timeout=until - now, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception()
+                    if error is None:
+                        self.latency(label).record(time.monotonic() - started[future])
+                        if future is not first:
+                            self.stats.bump("hedges_won")
+                        winner = future
+                        return future.result()
+                    errors.append(error)
+            # Every copy failed (a hedge is only fired while the first is pending).
+            raise errors[-1]
+        finally:
+            # The losing copy or a timed-out attempt keeps running on its
+            # thread; close its response whenever it arrives.
+            for future in started:
+                if future is not winner and not future.cancel():
+                    future.add_done_callback(_close_abandoned)
+
+    async def call_async(self, operation: Callable[[float], Awaitable[T]], label: str = "request") -> T:
+        self.stats.bump("calls")
+        attempt = 1
+        while True:
+            try:
+                return await self._attempt_async(operation, label)
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.retryable(e):
+                    raise
+                delay = self.backoff(attempt, e)
+                self.stats.bump("retries")
+                logger.warning(f"{label} attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _attempt_async(self, operation: Callable[[float], Awaitable[T]], label: str) -> T:
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout_seconds
+        hedge_delay = self.hedge_delay(label)
+        started: Dict[asyncio.Future, float] = {}
+
+        def submit() -> asyncio.Future:
+            self.stats.bump("attempts")
+            task = asyncio.ensure_future(operation(timeout))
+            started[task] = loop.time()
+            return task
+
+        first = submit()
+        deadline = started[first] + timeout
+        hedge_at = started[first] + hedge_delay if hedge_delay is not None else None
+        pending = {first}
+        errors: List[BaseException] = []
+        winner: Optional[asyncio.Future] = None
+        try:
+            while pending:
+                now = loop.time()
+                if now >= deadline:
+                    self.stats.bump("timeouts")
+                    raise AttemptTimeout(f"{label} got no response within {timeout:.1f}s")
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    self.stats.bump("hedges")
+                    logger.info(f"{label} slower than p{self.hedge_quantile * 100:.0f} ({hedge_delay:.2f}s); hedging")
+                    pending.add(submit())
+                    continue
+                until = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, pending = await asyncio.wait(pending, timeout=until - now, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        self.latency(label).record(loop.time() - started[task])
+                        if task is not first:
+                            self.stats.bump("hedges_won")
+                        winner = task
+                        return task.result()
+                    errors.append(error)
+            raise errors[-1]
+        finally:
+            # The losing copy, a timed-out attempt, or all of them when the
+            # caller itself is cancelled. A copy that finished in the same
+            # wait as the winner is closed instead.
+            for task in started:
+                if not task.done():
+                    task.cancel()
+                elif task is not winner:
+                    await _aclose_abandoned(task)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"API request policy: {self.stats.summary()}")
@@ -0,0 +1,308 @@
+import asyncio
+import logging
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.audio_encoding import create_encoder
+from src.audio_vad import frame_energy_db, speech_threshold_db
+from src.cancellation import CancelToken, raise_if_cancelled
+from src.pipeline_engine import call_stage
+
+logger = logging.getLogger(__name__)
+
+_FRAME_SECONDS = 0.02
+_WORD_RE = re.compile(r"[^\w']+")
+
+
+class AudioSegment(NamedTuple):
+    start: int
+    end: int
+    overlaps_next: bool
+
+
+def plan_segments(
+    samples: np.ndarray,
+    sample_rate: int,
+    max_seconds: float,
+    search_seconds: float = 5.0,
+    overlap_seconds: float = 0.5,
+) -> List[AudioSegment]:
+    """Split a recording into segments of at most ``max_seconds``.
+
+    Each cut is placed at the quietest 20 ms frame in the last
+    ``search_seconds`` before the limit. If even that frame is speech (above
+    ``speech_threshold_db``) the segment runs ``overlap_seconds`` past the
+    cut so no word is lost at the seam; the overlap is removed again when the
+    texts are stitched.
+    """
+    total = int(samples.shape[0])
+    max_len = max(1, int(max_seconds * sample_rate))
+    if total <= max_len:
+        return [AudioSegment(0, total, False)]
+
+    frame = max(1, int(sample_rate * _FRAME_SECONDS))
+    energy = frame_energy_db(samples, frame)
+    threshold = speech_threshold_db(energy)
+    overlap = min(int(overlap_seconds * sample_rate), max_len // 4)
+    search = max(frame, min(int(search_seconds * sample_rate), max_len // 2))
+
+    segments: List[AudioSegment] = []
+    start = 0
+    while total - start > max_len:
+        hi = start + max_len - overlap
+        lo = hi - search
+        first, last = -(-lo // frame), min(hi // frame, energy.shape[0])
+        cut, quiet = hi, False
+        if last > first:
+            quietest = first + int(np.argmin(energy[first:last]))
+            if energy[quietest] <= threshold:
+                cut, quiet = quietest * frame + frame // 2, True
+        end = cut if quiet else min(cut + overlap, total)
+        segments.append(AudioSegment(start, end, not quiet))
+        start = cut
+    segments.append(AudioSegment(start, total, False))
+    return segments
+
+
+def _words(text: str) -> List[str]:
+    return [_WORD_RE.sub("", word).lower() for word in text.split()]
+
+
+def merge_overlap(previous: str, following: str, max_words: int = 8) -> str:
+    """Join two transcripts, dropping words ``following`` repeats from ``previous``."""
+    previous, following = previous.strip(), following.strip()
+    if not previous or not following:
+        return previous or following
+    tail, head = _words(previous), _words(following)
+    for count in range(min(max_words, len(tail), len(head)), 0, -1):
+        if tail[-count:] == head[:count]:
+            following = " ".join(following.split()[count:])
+            break
+    return f"{previous} {following}".strip()
+
+
+class SegmentedTranscriber:
+    """Transcribes long recordings as concurrent segments.
+
+    Has the same ``transcribe(audio, prompt=...)`` surface as GroqClient, so
+    workers can use either. Recordings up to ``max_segment_seconds`` (or
+    sources without PCM, such as file paths) go straight to the client.
+    Longer ones are cut at low-energy points, uploaded through a pool of
+    ``concurrency`` threads, and stitched back in order. ``cancel_token``
+    goes to every segment's upload, so cancelling stops the segments that
+    have not been sent yet.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_segment_seconds: float = 60.0,
+        concurrency: int = 4,
+        overlap_seconds: float = 0.5,
+    ):
+        self.client = client
+        self.max_segment_seconds = max(1.0, float(max_segment_seconds))
+        self.concurrency = max(1, int(concurrency))
+        self.overlap_seconds = float(overlap_seconds)
+
+    def transcribe(
+        self, audio_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        samples = getattr(audio_source, "samples", None)
+        if samples is None:
+            return self.client.transcribe(audio_source, prompt=prompt, cancel_token=cancel_token)
+
+        rate = audio_source.sample_rate
+        segments = plan_segments(samples, rate, self.max_segment_seconds, overlap_seconds=self.overlap_seconds)
+        if len(segments) == 1:
+            return self.client.transcribe(audio_source, prompt=prompt, cancel_token=cancel_token)
+
+        logger.info(
+            "Transcribing %.1fs recording as %d segments (concurrency %d)",
+            samples.shape[0] / float(rate), len(segments), self.concurrency,
+        )
+
+        def run(segment: AudioSegment) -> str:
+            raise_if_cancelled(cancel_token)
+            return self.client.transcribe(
+                _encode_segment(audio_source, segment), prompt=prompt, cancel_token=cancel_token
+            )
+
+        executor = ThreadPoolExecutor(max_workers=min(self.concurrency, len(segments)))
+        try:
+            futures = [executor.submit(run, segment) for segment in segments]
+            texts = [future.result() for future in futures]
+        finally:
+            # On failure, drop segments that have not started yet.
+            executor.shutdown(wait=True, cancel_futures=True)
+        return _stitch(segments, texts)
+
+    async def transcribe_async(
+        self, audio_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        """``transcribe`` as coroutines on the caller's loop instead of a pool."""
+        samples = getattr(audio_source, "samples", None)
+        if samples is None:
+            return await call_stage(self.client, "transcribe", audio_source, prompt=prompt, cancel_token=cancel_token)
+
+        rate = audio_source.sample_rate
+        segments = plan_segments(samples, rate, self.max_segment_seconds, overlap_seconds=self.overlap_seconds)
+        if len(segments) == 1:
+            return await call_stage(self.client, "transcribe", audio_source, prompt=prompt, cancel_token=cancel_token)
+
+        logger.info(
+            "Transcribing %.1fs recording as %d async segments (concurrency %d)",
+            samples.shape[0] / float(rate), len(segments), self.concurrency,
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run(segment: AudioSegment) -> str:
+            async with slots:
+                raise_if_cancelled(cancel_token)
+                return await call_stage(
+                    self.client, "transcribe", _encode_segment(audio_source, segment),
+                    prompt=prompt, cancel_token=cancel_token,
+                )
+
+        tasks = [asyncio.ensure_future(run(segment)) for segment in segments]
+        try:
+            texts = await asyncio.gather(*tasks)
+        finally:
+            # On failure or cancellation, abort the uploads still in flight.
+            for task in tasks:
+                task.cancel()
+        return _stitch(segments, list(texts))
+
+
+def _encode_segment(audio_source: Any, segment: AudioSegment) -> Any:
+    rate = audio_source.sample_rate
+    length = segment.end - segment.start
+    encoder = create_encoder(getattr(audio_source, "codec", "wav"), rate, initial_seconds=length / float(rate))
+    encoder.write(audio_source.samples[segment.start:segment.end])
+    return encoder.finalize()
+
+
+def _stitch(segments: List[AudioSegment], texts: List[str]) -> str:
+    text = ""
+    for index, segment_text in enumerate(texts):
+        if index and segments[index - 1].overlaps_next:
+            text = merge_overlap(text, segment_text)
+        else:
+            text = f"{text} {segment_text.strip()}".strip()
+    return text
+
+
+class SpeculativeTranscriber:
+    """Transcribes phrases of a recording that is still in progress.
+
+    ``submit`` starts uploading each finished segment as soon as the recorder
+    hands it over. ``transcribe`` receives the tail left at key release, so
+    the caller only waits for that last piece. It then joins every text in
+    order. It has the same surface as GroqClient, so it slots into
+    TranscriptionWorker/SearchWorker in place of a plain client.
+
+    Phrases stay on the session after ``transcribe``, so calling it again
+    (Retry Last Dictation) reuses the texts that arrived and only uploads
+    the phrases that failed.
+
+    Phrase uploads start before there is a job to cancel, so they check the
+    session's own ``cancel_token``, which ``cancel()`` trips. The job's token
+    passed to ``transcribe`` covers the tail and any phrase uploaded again.
+    """
+
+    def __init__(self, client: Any, prompt: Optional[str] = None, concurrency: int = 4):
+        self.client = client
+        self.prompt = prompt
+        # Identifies this recording in the stage cache, where the tail alone
+        # would not.
+        self.session_key = uuid.uuid4().hex
+        self.cancel_token = CancelToken()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(concurrency)))
+        self._phrases: List[Any] = []
+        # One per phrase; None once it failed and must be uploaded again.
+        self._futures: List[Optional[Any]] = []
+        self._joined = False
+
+    @property
+    def pending(self) -> int:
+        """Phrases handed over that are not part of a finished transcript yet."""
+        return 0 if self._joined else len(self._phrases)
+
+    def submit(self, audio: Any, cancel_token: Optional[CancelToken] = None) -> None:
+        """Start uploading a phrase; ``cancel_token`` defaults to the session's."""
+        self._phrases.append(audio)
+        self._futures.append(self._executor.submit(
+            self._upload, audio, self.prompt, cancel_token or self.cancel_token
+        ))
+
+    def _upload(self, audio: Any, prompt: Optional[str], cancel_token: Optional[CancelToken]) -> str:
+        # Queued phrases may only start after the session was cancelled.
+        raise_if_cancelled(cancel_token)
+        return self.client.transcribe(audio, prompt=prompt, cancel_token=cancel_token)
+
+    def cancel(self) -> None:
+        """Drop the session, e.g. when the recording is abandoned."""
+        self.cancel_token.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._phrases = []
+        self._futures = []
+
+    def _close(self) -> None:
+        # Phrases still uploading finish in the background for a retry;
+        # failed ones are uploaded again by the next transcribe.
+        self._executor.shutdown(wait=False)
+        self._futures = [
+            None if future is None or (future.done() and (future.cancelled() or future.exception())) else future
+            for future in self._futures
+        ]
+
+    def transcribe(
+        self, audio_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        try:
+            samples = getattr(audio_source, "samples", None)
+            tail = ""
+            if samples is None or samples.shape[0]:
+                tail = self.client.transcribe(audio_source, prompt=prompt or self.prompt, cancel_token=cancel_token)
+            texts = [
+                future.result() if future is not None
+                else self._upload(phrase, self.prompt, cancel_token)
+                for phrase, future in zip(self._phrases, self._futures)
+            ] + [tail]
+            self._joined = True
+        finally:
+            self._close()
+        logger.info("Speculative transcription joined %d segments", len(texts))
+        return " ".join(text.strip() for text in texts if text and text.strip())
+
+    async def transcribe_async(
+        self, audio_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        try:
+            samples = getattr(audio_source, "samples", None)
+            tail = ""
+            if samples is None or samples.shape[0]:
+                tail = await call_stage(
+                    self.client, "transcribe", audio_source, prompt=prompt or self.prompt, cancel_token=cancel_token
+                )
+            # Phrases were uploaded on the pool while recording; wait for them
+            # without blocking the loop.
+            texts = []
+            for phrase, future in zip(self._phrases, self._futures):
+                if future is None:
+                    raise_if_cancelled(cancel_token)
+                    texts.append(await call_stage(
+                        self.client, "transcribe", phrase, prompt=self.prompt, cancel_token=cancel_token
+                    ))
+                else:
+                    texts.append(await asyncio.wrap_future(future))
+            texts.append(tail)
+            self._joined = True
+        finally:
+            self._close()
+        logger.info("Speculative transcription joined %d segments", len(texts))
+        return " ".join(text.strip() for text in texts if text and text.strip())
@@ -0,0 +1,83 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def audio_digest(source: Any) -> Optional[str]:
+    """SHA-256 of a recording's bytes, or None when it cannot be read twice.
+
+    In-memory recordings are hashed straight from their buffer; file paths
+    are hashed from disk. Other file-like objects would be consumed by
+    reading, so they are not cached.
+    """
+    digest = hashlib.sha256()
+    if hasattr(source, "getbuffer"):
+        digest.update(source.getbuffer())
+    elif isinstance(source, (str, os.PathLike)):
+        try:
+            with open(source, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+    else:
+        return None
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, *parts: Any) -> str:
+    """Cache key for one pipeline stage and everything that shapes its output."""
+    digest = hashlib.sha256(stage.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return f"{stage}:{digest.hexdigest()}"
+
+
+class StageCache:
+    """Bounded LRU of pipeline stage results (transcript, formatter, translator).
+
+    A job that fails after transcribing keeps its transcript here, so a retry
+    only repeats the stage that failed, and submitting the same audio with
+    the same settings again costs no API calls.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Optional[str], value: str) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,117 @@
+import time
+from typing import Callable, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class CoalescerStats:
+    def __init__(self):
+        self.updates = 0  # answer deltas and thought chunks received
+        self.deliveries = 0  # frames that delivered something
+        self.merged = 0  # updates that shared a frame with an earlier one
+        self.dropped = 0  # updates discarded before delivery
+        self.max_batch = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.updates} updates in {self.deliveries} frames "
+            f"({self.merged} merged, {self.dropped} dropped, max {self.max_batch} per frame)"
+        )
+
+
+class StreamCoalescer(QObject):
+    """Batches streamed search updates so the UI gets at most one per frame.
+
+    Answer deltas are joined into one delta that covers their sequence
+    range. Thought chunks are handed over one by one in the same frame, so
+    the receiver separates them as it would separately delivered chunks;
+    Qt folds the repaints they cause into one. The first update after a quiet
+    frame is delivered on the next event-loop pass; updates that arrive
+    within the same frame wait for it to end. ``deliver_thought`` runs
+    before ``deliver_answer``, matching arrival order.
+    """
+
+    def __init__(
+        self,
+        deliver_answer: Callable[[int, int, str], None],
+        deliver_thought: Callable[[str], None],
+        fps: int = 100,
+        parent: Optional[QObject] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(parent)
+        self._deliver_answer = deliver_answer
+        self._deliver_thought = deliver_thought
+        self._clock = clock
+        self._interval = 1.0 / max(1, int(fps))
+        self._last_delivery = float("-inf")
+        self._answer_parts: List[str] = []
+        self._first_seq = 0
+        self._last_seq = 0
+        self._thought_parts: List[str] = []
+        self.stats = CoalescerStats()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def set_fps(self, fps: int) -> None:
+        self._interval = 1.0 / max(1, int(fps))
+
+    @property
+    def pending(self) -> int:
+        return len(self._answer_parts) + len(self._thought_parts)
+
+    def push_answer(self, seq: int, delta: str) -> None:
+        if not delta:
+            return
+        if self._answer_parts and seq != self._last_seq + 1:
+            # Out of order; deliver what we have so the receiver sees the gap.
+            self.flush()
+        if not self._answer_parts:
+            self._first_seq = seq
+        self._answer_parts.append(delta)
+        self._last_seq = seq
+        self._queued()
+
+    def push_thought(self, text: str) -> None:
+        if not text:
+            return
+        self._thought_parts.append(text)
+        self._queued()
+
+    def _queued(self) -> None:
+        self.stats.updates += 1
+        if self.pending > 1:
+            self.stats.merged += 1
+        if self._timer.isActive():
+            return
+        wait = max(0.0, self._interval - (self._clock() - self._last_delivery))
+        self._timer.start(int(wait * 1000))
+
+    def flush(self) -> None:
+        """Deliver everything pending now."""
+        self._timer.stop()
+        batch = self.pending
+        if not batch:
+            return
+        self._last_delivery = self._clock()
+        self.stats.deliveries += 1
+        self.stats.max_batch = max(self.stats.max_batch, batch)
+        thoughts, self._thought_parts = self._thought_parts, []
+        answer, self._answer_parts = self._answer_parts, []
+        if thoughts:
+            for thought in thoughts:
+                self._deliver_thought(thought)
+        if answer:
+            self._deliver_answer(self._first_seq, self._last_seq, "".join(answer))
+
+    def discard(self) -> None:
+        """Drop pending updates, e.g. when their answer is dismissed."""
+        self._timer.stop()
+        self.stats.dropped += self.pending
+        self._answer_parts = []
+        self._thought_parts = []
+
+    def reset_stats(self) -> CoalescerStats:
+        stats, self.stats = self.stats, CoalescerStats()
+        return stats
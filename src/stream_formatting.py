@@ -0,0 +1,120 @@
+import re
+import time
+from typing import Callable, List, Optional
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace, or a line break. "3.5" and "e.g.x" do not match.
+_SENTENCE_END = re.compile(r"[.!?…][\"'”’)\]]*\s+|\n+")
+
+
+class SentenceChunker:
+    """Cuts a stream of formatter deltas into whole sentences.
+
+    ``feed`` returns the sentences completed by a delta and ``flush`` the
+    rest once the stream ends. ``normalize`` (e.g. math normalization) sees
+    whole sentences only, so a rewrite such as "x plus y squared" is never
+    split across chunks. Whitespace between sentences is kept at the end of
+    each chunk, so concatenating the chunks gives the formatted text.
+    """
+
+    def __init__(self, normalize: Optional[Callable[[str], str]] = None):
+        self.normalize = normalize
+        self._buffer = ""
+        self._emitted = False
+
+    def feed(self, delta: str) -> List[str]:
+        self._buffer += str(delta or "")
+        chunks: List[str] = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            chunks.append(self._finish(self._buffer[start:match.end()]))
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return [chunk for chunk in chunks if chunk]
+
+    def flush(self) -> List[str]:
+        rest, self._buffer = self._buffer, ""
+        chunk = self._finish(rest).rstrip()
+        return [chunk] if chunk else []
+
+    def _finish(self, sentence: str) -> str:
+        if not self._emitted:
+            sentence = sentence.lstrip()
+        body = sentence.rstrip()
+        if not body:
+            return ""
+        trailing = sentence[len(body):]
+        if self.normalize is not None:
+            body = self.normalize(body)
+        self._emitted = True
+        return body + trailing
+
+
+class IncrementalPaster:
+    """Pastes streamed chunks into the focused app as they arrive.
+
+    ``paste(text)`` stages the clipboard and sends the paste keystroke.
+    Pastes are spaced at least ``min_interval_ms`` apart, so the target app
+    has read one clipboard before it is replaced. Chunks that arrive in the
+    meantime are joined into the next paste. ``finish(on_done)`` calls
+    ``on_done(ok)`` once everything pushed so far has been pasted, and
+    ``abort()`` drops whatever has not been pasted yet.
+    """
+
+    def __init__(
+        self,
+        paste: Callable[[str], bool],
+        schedule: Callable[[int, Callable[[], None]], None],
+        min_interval_ms: int = 150,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._paste = paste
+        self._schedule = schedule
+        self.min_interval_ms = max(0, int(min_interval_ms))
+        self._clock = clock
+        self._pending = ""
+        self._next_at = 0.0
+        self._scheduled = False
+        self._on_done: Optional[Callable[[bool], None]] = None
+        self.pasted = ""
+        self.failed = False
+        self.aborted = False
+
+    def push(self, text: str) -> None:
+        if self.failed or self.aborted:
+            return
+        self._pending += str(text or "")
+        self._drain()
+
+    def finish(self, on_done: Callable[[bool], None]) -> None:
+        self._on_done = on_done
+        self._drain()
+
+    def abort(self) -> None:
+        """Stop pasting; a paste already scheduled does nothing and ``on_done`` is not called."""
+        self.aborted = True
+        self._pending = ""
+        self._on_done = None
+
+    def _drain(self) -> None:
+        if self._scheduled or self.aborted:
+            return
+        if self._pending and not self.failed:
+            wait_ms = int((self._next_at - self._clock()) * 1000)
+            if wait_ms > 0:
+                self._scheduled = True
+                self._schedule(wait_ms, self._on_timer)
+                return
+            text, self._pending = self._pending, ""
+            if self._paste(text):
+                self.pasted += text
+                self._next_at = self._clock() + self.min_interval_ms / 1000.0
+            else:
+                self.failed = True
+        if self._on_done is not None and (self.failed or not self._pending):
+            on_done, self._on_done = self._on_done, None
+            on_done(not self.failed)
+
+    def _on_timer(self) -> None:
+        self._scheduled = False
+        self._drain()
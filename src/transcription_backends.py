@@ -0,0 +1,353 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+import httpx
+
+from src.cancellation import CancelToken, raise_if_cancelled
+from src.pipeline_engine import call_stage
+
+logger = logging.getLogger(__name__)
+
+# Containers the recorder can produce (see config "upload_codec").
+ALL_CODECS = frozenset({"wav", "flac", "opus"})
+
+
+class TranscriptionBackendError(Exception):
+    """Raised when a transcription backend rejects or fails a request."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BackendCapabilities(NamedTuple):
+    streaming: bool = False
+    # None accepts any language.
+    languages: Optional[FrozenSet[str]] = None
+    max_payload_bytes: int = 25 * 1024 * 1024
+    codecs: FrozenSet[str] = ALL_CODECS
+
+
+@runtime_checkable
+class TranscriptionBackend(Protocol):
+    """A speech-to-text service the pipeline can send recordings to.
+
+    ``transcribe`` has GroqClient's signature minus the model, which is the
+    backend's own setting, so a backend slots in wherever a client did. A
+    cancelled ``cancel_token`` stops it before its next request.
+    """
+
+    name: str
+    capabilities: BackendCapabilities
+
+    def transcribe(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        ...
+
+    async def transcribe_async(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        ...
+
+
+def payload_size(file_source: Any) -> Optional[int]:
+    if hasattr(file_source, "getbuffer"):
+        return file_source.getbuffer().nbytes
+    if isinstance(file_source, (str, os.PathLike)):
+        try:
+            return os.path.getsize(file_source)
+        except OSError:
+            return None
+    return None
+
+
+def unsupported_reason(capabilities: BackendCapabilities, file_source: Any, language: str = "en") -> Optional[str]:
+    """Why a backend cannot take ``file_source``, or None if it can."""
+    codec = getattr(file_source, "codec", "wav")
+    if codec not in capabilities.codecs:
+        return f"codec {codec}"
+    size = payload_size(file_source)
+    if size is not None and size > capabilities.max_payload_bytes:
+        return f"{size} bytes"
+    if capabilities.languages is not None and language not in capabilities.languages:
+        return f"language {language}"
+    return None
+
+
+class GroqBackend:
+    """Groq's hosted Whisper, through the shared GroqClient."""
+
+    name = "groq"
+    # Groq's free-tier upload limit; it accepts every codec we produce.
+    capabilities = BackendCapabilities(max_payload_bytes=25 * 1024 * 1024)
+
+    def __init__(self, client: Any, model_id: str = "whisper-large-v3"):
+        self.client = client
+        self.model_id = str(model_id or "").strip() or "whisper-large-v3"
+
+    def transcribe(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        return self.client.transcribe(file_source, self.model_id, prompt=prompt, cancel_token=cancel_token)
+
+    async def transcribe_async(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        return await call_stage(
+            self.client, "transcribe", file_source, self.model_id, prompt=prompt, cancel_token=cancel_token
+        )
+
+
+class OpenAICompatibleBackend:
+    """Any server with an OpenAI-style ``POST {base_url}/audio/transcriptions``,
+    e.g. a self-hosted whisper server on the LAN."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model_id: str = "whisper-1",
+        api_key: str = "",
+        name: str = "local",
+        timeout_seconds: float = 30.0,
+        capabilities: Optional[BackendCapabilities] = None,
+        language: str = "en",
+    ):
+        self.base_url = str(base_url or "").rstrip("/")
+        self.model_id = model_id
+        self.api_key = str(api_key or "").strip()
+        self.name = name
+        self.timeout_seconds = float(timeout_seconds)
+        self.capabilities = capabilities or BackendCapabilities()
+        self.language = language
+        self._client: Optional[httpx.Client] = None
+        # Built on first async use so its connections bind to that loop.
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/audio/transcriptions"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _form(self, file_source: Any, prompt: Optional[str]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        data = {"model": self.model_id, "response_format": "json", "language": self.language, "temperature": "0"}
+        if prompt:
+            data["prompt"] = prompt
+        if hasattr(file_source, "getbuffer"):
+            file_source.seek(0)
+            reader = file_source.reader() if hasattr(file_source, "reader") else file_source
+            upload = (
+                getattr(file_source, "filename", "audio.wav"),
+                reader,
+                getattr(file_source, "mime_type", "audio/wav"),
+            )
+        elif hasattr(file_source, "read"):
+            upload = ("audio.wav", file_source.read())
+        else:
+            with open(file_source, "rb") as f:
+                upload = (os.path.basename(str(file_source)), f.read())
+        return data, {"file": upload}
+
+    def _text(self, response: httpx.Response) -> str:
+        if response.status_code >= 400:
+            raise TranscriptionBackendError(
+                f"{self.name} transcription failed: HTTP {response.status_code} {response.text[:200]}",
+                status_code=response.status_code,
+            )
+        try:
+            return str(response.json()["text"])
+        except (ValueError, KeyError, TypeError) as exc:
+            raise TranscriptionBackendError(f"{self.name} returned an unexpected response: {exc}") from exc
+
+    def transcribe(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        raise_if_cancelled(cancel_token)
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout_seconds)
+        data, files = self._form(file_source, prompt)
+        try:
+            response = self._client.post(self.url, data=data, files=files, headers=self._headers())
+        except httpx.HTTPError as exc:
+            raise TranscriptionBackendError(f"{self.name} transcription failed: {exc}") from exc
+        return self._text(response)
+
+    async def transcribe_async(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        raise_if_cancelled(cancel_token)
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(timeout=self.timeout_seconds)
+                self._async_client_loop = asyncio.get_running_loop()
+            client = self._async_client
+        data, files = self._form(file_source, prompt)
+        try:
+            response = await client.post(self.url, data=data, files=files, headers=self._headers())
+        except httpx.HTTPError as exc:
+            raise TranscriptionBackendError(f"{self.name} transcription failed: {exc}") from exc
+        return self._text(response)
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+            async_client, self._async_client = self._async_client, None
+            loop, self._async_client_loop = self._async_client_loop, None
+        if client is not None:
+            client.close()
+        if async_client is not None and loop is not None and not loop.is_closed():
+            # Async connections belong to their loop; close them there.
+            try:
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
+            except RuntimeError:
+                pass
+
+
+class RouterStats:
+    def __init__(self):
+        self.requests = 0
+        self.failovers = 0
+        self.selection_seconds = 0.0
+        self.failover_seconds = 0.0
+        self.by_backend: Dict[str, int] = {}
+
+    def summary(self) -> str:
+        served = ", ".join(f"{name} {count}" for name, count in self.by_backend.items()) or "none"
+        mean_selection_us = self.selection_seconds / self.requests * 1e6 if self.requests else 0.0
+        return (
+            f"{self.requests} transcriptions (served by {served}), {self.failovers} failovers "
+            f"({self.failover_seconds:.2f}s lost), selection {mean_selection_us:.0f}us avg"
+        )
+
+
+class BackendRouter:
+    """Sends each transcription to the first backend that can take it.
+
+    Backends are tried in order, skipping any whose capabilities rule the
+    recording out and any that failed within ``cooldown_seconds``. A failure
+    moves on to the next backend. ``stats`` records the time spent choosing
+    and the time lost to backends that failed.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[TranscriptionBackend],
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not backends:
+            raise ValueError("BackendRouter needs at least one backend")
+        self.backends: List[TranscriptionBackend] = list(backends)
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.stats = RouterStats()
+        self._clock = clock
+        self._failed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def capabilities(self) -> BackendCapabilities:
+        """The union of what the backends accept."""
+        caps = [backend.capabilities for backend in self.backends]
+        languages: Optional[FrozenSet[str]] = frozenset()
+        for cap in caps:
+            languages = None if languages is None or cap.languages is None else languages | cap.languages
+        return BackendCapabilities(
+            streaming=any(cap.streaming for cap in caps),
+            languages=languages,
+            max_payload_bytes=max(cap.max_payload_bytes for cap in caps),
+            codecs=frozenset().union(*(cap.codecs for cap in caps)),
+        )
+
+    def candidates(self, file_source: Any) -> List[TranscriptionBackend]:
+        """Backends to try for ``file_source``, healthy ones first."""
+        started = time.perf_counter()
+        now = self._clock()
+        healthy, cooling = [], []
+        for backend in self.backends:
+            reason = unsupported_reason(backend.capabilities, file_source)
+            if reason is not None:
+                logger.debug(f"Skipping {backend.name} transcription backend: {reason}")
+                continue
+            with self._lock:
+                failed_at = self._failed_at.get(backend.name)
+            if failed_at is not None and now - failed_at < self.cooldown_seconds:
+                cooling.append(backend)
+            else:
+                healthy.append(backend)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.selection_seconds += time.perf_counter() - started
+        if not healthy and not cooling:
+            raise TranscriptionBackendError("No transcription backend accepts this recording.")
+        return healthy + cooling
+
+    def _served(self, backend: TranscriptionBackend, text: str) -> str:
+        with self._lock:
+            self._failed_at.pop(backend.name, None)
+            self.stats.by_backend[backend.name] = self.stats.by_backend.get(backend.name, 0) + 1
+        return text
+
+    def _failed(self, backend: TranscriptionBackend, exc: Exception, started: float, failover: bool) -> None:
+        with self._lock:
+            self._failed_at[backend.name] = self._clock()
+            if failover:
+                self.stats.failovers += 1
+                self.stats.failover_seconds += time.perf_counter() - started
+        if failover:
+            logger.warning(f"{backend.name} transcription failed ({exc}); failing over")
+
+    def transcribe(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        """Transcribe on the first backend that succeeds; a cancelled job stops instead of failing over."""
+        backends = self.candidates(file_source)
+        for position, backend in enumerate(backends, start=1):
+            raise_if_cancelled(cancel_token)
+            started = time.perf_counter()
+            try:
+                return self._served(
+                    backend, backend.transcribe(file_source, prompt=prompt, cancel_token=cancel_token)
+                )
+            except Exception as exc:
+                # Cancelling is not the backend's fault.
+                raise_if_cancelled(cancel_token)
+                failover = position < len(backends)
+                self._failed(backend, exc, started, failover)
+                if not failover:
+                    raise
+        raise TranscriptionBackendError("No transcription backend accepts this recording.")
+
+    async def transcribe_async(
+        self, file_source: Any, prompt: Optional[str] = None, cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        backends = self.candidates(file_source)
+        for position, backend in enumerate(backends, start=1):
+            raise_if_cancelled(cancel_token)
+            started = time.perf_counter()
+            try:
+                return self._served(
+                    backend,
+                    await call_stage(backend, "transcribe", file_source, prompt=prompt, cancel_token=cancel_token),
+                )
+            except Exception as exc:
+                raise_if_cancelled(cancel_token)
+                failover = position < len(backends)
+                self._failed(backend, exc, started, failover)
+                if not failover:
+                    raise
+        raise TranscriptionBackendError("No transcription backend accepts this recording.")
+
+    def close(self) -> None:
+        for backend in self.backends:
+            close = getattr(backend, "close", None)
+            if close is not None:
+                close()
@@ -1112,6 +1112,16 @@ class MainWindow(QWidget):
         self.always_listening_hint.setWordWrap(True)
         pipeline_layout.addWidget(self.always_listening_hint)
 
+        resample_row = QHBoxLayout()
+        resample_label = QLabel("Upload at 16 kHz (smaller, faster)")
+        self.resample_toggle = AnimatedToggle()
+        self.resample_toggle.setChecked(bool(self.config.get("resample_to_16k", True)))
+        self.resample_toggle.stateChanged.connect(self.on_resample_toggle_changed)
+        resample_row.addWidget(resample_label)
+        resample_row.addStretch()
+        resample_row.addWidget(self.resample_toggle)
+        pipeline_layout.addLayout(resample_row)
+
         divider_1 = QFrame()
         divider_1.setObjectName("Divider")
         pipeline_layout.addWidget(divider_1)
@@ -1810,6 +1820,12 @@ class MainWindow(QWidget):
         self.config.save()
         self.config_changed.emit("always_listening", enabled)
 
+    def on_resample_toggle_changed(self, state):
+        enabled = state == int(Qt.CheckState.Checked.value)
+        self.config.set("resample_to_16k", enabled)
+        self.config.save()
+        self.config_changed.emit("resample_to_16k", enabled)
+
     def on_translate_toggle_changed(self, state):
         enabled = state == int(Qt.CheckState.Checked.value)
         self.config.set("translation_enabled", enabled)
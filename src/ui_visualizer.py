@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (
     QScrollArea,
     QFrame,
 )
-from PyQt6.QtCore import Qt, QTimer, QRect, QEasingCurve, QPropertyAnimation, pyqtProperty
+from PyQt6.QtCore import Qt, QTimer, QRect, QEasingCurve, QPropertyAnimation, pyqtProperty, pyqtSignal
 from PyQt6.QtGui import (
     QPainter,
     QColor,
@@ -68,6 +68,11 @@ class CompactAudioVisualizer(QWidget):
         self.processing_text = ""
         self._next_success_delay_frames = 0
         self._success_delay_remaining = 0
+
+        # Optional AudioMeter-like object exposing `.reading`; polled once per
+        # frame while listening instead of receiving a signal per audio chunk.
+        self.level_source = None
+        self._last_level_sequence = -1
         
         # Smooth animation timer
         self._animation_fps = 100
@@ -162,7 +167,19 @@ class CompactAudioVisualizer(QWidget):
             variation = 0.68 + 0.46 * math.sin((self.idle_phase * 2.4) + self.bar_phases[i])
             self.bar_targets[i] = self.target_amplitude * variation * height_modifier
 
+    def _pull_level(self):
+        source = self.level_source
+        if source is None or self.mode != "listening" or not self.isVisible():
+            return
+        reading = source.reading
+        if reading.sequence == self._last_level_sequence:
+            return
+        self._last_level_sequence = reading.sequence
+        self.update_level(reading.level)
+
     def animate(self):
+        self._pull_level()
+
         # Global amplitude lerp
         if self.mode == "listening" and self.is_active:
             self.amplitude += (self.target_amplitude - self.amplitude) * 0.34
@@ -547,6 +564,9 @@ class ThinkingMarquee(QWidget):
 class AudioVisualizer(QWidget):
     """Floating audio visualizer overlay with compact bar design and fade animation."""
 
+    # The user dismissed an answer that was still streaming.
+    answer_dismissed = pyqtSignal()
+
     COMPACT_WIDTH = 120
     COMPACT_HEIGHT = 36
     PROCESSING_MIN_WIDTH = 120
@@ -601,7 +621,9 @@ class AudioVisualizer(QWidget):
         self._drag_origin = None
         self._streaming_answer_active = False
         self._streaming_answer_dismissed = False
-        self._streaming_answer_text = ""
+        # Arrived answer text as appended; joined only when needed.
+        self._streaming_answer_chunks: list[str] = []
+        self._streaming_next_seq = 1
         self._streaming_pending_text: Optional[str] = None
         self._streaming_target_rect = QRect()
         self._streaming_visible_text = ""
@@ -963,7 +985,8 @@ class AudioVisualizer(QWidget):
 
     def _reset_streaming_answer_state(self, clear_dismissed: bool = True):
         self._streaming_answer_active = False
-        self._streaming_answer_text = ""
+        self._streaming_answer_chunks = []
+        self._streaming_next_seq = 1
         self._streaming_visible_text = ""
         self._streaming_arrived_segments = []
         self._streaming_visible_segments = 0
@@ -1014,18 +1037,36 @@ class AudioVisualizer(QWidget):
                 segments.append(tail)
         return segments
 
+    def _streaming_arrived_text(self) -> str:
+        chunks = self._streaming_answer_chunks
+        if len(chunks) > 1:
+            chunks[:] = ["".join(chunks)]
+        return chunks[0] if chunks else ""
+
+    def _append_streaming_arrived_text(self, delta: str):
+        # Segments start at word starts, so only the last one can grow:
+        # re-splitting it with the delta costs O(delta), not O(answer).
+        segments = self._streaming_arrived_segments
+        tail = segments.pop() if segments else ""
+        segments.extend(self._split_streaming_segments(tail + delta))
+        self._streaming_answer_chunks.append(delta)
+
     def _set_streaming_arrived_text(self, text: str):
         latest = str(text or "")
-        append_only = latest.startswith(self._streaming_answer_text)
-        self._streaming_answer_text = latest
-        self._streaming_arrived_segments = self._split_streaming_segments(latest)
-        total = len(self._streaming_arrived_segments)
+        current = self._streaming_arrived_text()
+        if latest.startswith(current):
+            if len(latest) > len(current):
+                self._append_streaming_arrived_text(latest[len(current):])
+            return
 
-        if not append_only:
-            # Fallback for unexpected non-append diffs: keep already revealed
-            # prefix length when possible, then continue forward.
-            self._streaming_reveal_carry = 0.0
-        self._streaming_visible_segments = min(self._streaming_visible_segments, total)
+        # Fallback for unexpected non-append diffs: keep already revealed
+        # prefix length when possible, then continue forward.
+        self._streaming_answer_chunks = [latest] if latest else []
+        self._streaming_arrived_segments = self._split_streaming_segments(latest)
+        self._streaming_reveal_carry = 0.0
+        self._streaming_visible_segments = min(
+            self._streaming_visible_segments, len(self._streaming_arrived_segments)
+        )
 
     @classmethod
     def _normalize_stream_reveal_wps(cls, value) -> int:
@@ -1129,8 +1170,7 @@ class AudioVisualizer(QWidget):
         if self._streaming_pending_text is not None:
             next_text = self._streaming_pending_text
             self._streaming_pending_text = None
-            if next_text != self._streaming_answer_text:
-                self._set_streaming_arrived_text(next_text)
+            self._set_streaming_arrived_text(next_text)
 
         total_segments = len(self._streaming_arrived_segments)
         visible_segments = min(self._streaming_visible_segments, total_segments)
@@ -1247,7 +1287,7 @@ class AudioVisualizer(QWidget):
             and visual_reveal_complete
         )
         if reveal_complete and self._answer_visible and (not self._auto_dismiss_timer.isActive()):
-            final_text = self._streaming_answer_text or "".join(self._streaming_arrived_segments)
+            final_text = self._streaming_arrived_text()
             self._set_answer_label_display_text(final_text)
             self._streaming_visible_text = final_text
             self._streaming_visible_segments = total_segments
@@ -1796,7 +1836,12 @@ class AudioVisualizer(QWidget):
         if not self._streaming_resize_timer.isActive():
             self._streaming_resize_timer.start()
 
-    def update_streaming_answer(self, text: str, reason: str = ""):
+    def update_streaming_answer(self, text: str, reason: str = "", seq: Optional[int] = None):
+        """Replace the streaming answer with ``text`` (the full answer so far).
+
+        ``seq`` is the last delta ``text`` includes; ``append_streaming_answer``
+        continues from the one after it.
+        """
         if self._streaming_answer_dismissed:
             return
         rendered = self._normalize_markdown_bold_spacing(str(text or ""))
@@ -1804,7 +1849,9 @@ class AudioVisualizer(QWidget):
             return
         if not self._streaming_answer_active:
             self.begin_streaming_answer(reason=reason or "streaming answer update")
-        if rendered == self._streaming_answer_text and self._streaming_pending_text is None:
+        if seq is not None:
+            self._streaming_next_seq = int(seq) + 1
+        if rendered == self._streaming_arrived_text() and self._streaming_pending_text is None:
             return
 
         self._streaming_pending_text = rendered
@@ -1813,6 +1860,45 @@ class AudioVisualizer(QWidget):
         if self._stream_realtime_enabled:
             self._tick_streaming_answer_frame()
 
+    def append_streaming_answer(
+        self,
+        delta: str,
+        seq: Optional[int] = None,
+        reason: str = "",
+        last_seq: Optional[int] = None,
+    ) -> bool:
+        """Append ``delta`` to the streaming answer.
+
+        Deltas are numbered from 1; ``delta`` holds deltas ``seq`` through
+        ``last_seq`` (default: just ``seq``). Returns False when one is
+        missing, so the caller can resync with ``update_streaming_answer``.
+        """
+        if self._streaming_answer_dismissed:
+            return True
+        if not self._streaming_answer_active:
+            self.begin_streaming_answer(reason=reason or "streaming answer update")
+        if seq is not None:
+            last = int(seq if last_seq is None else last_seq)
+            if last < self._streaming_next_seq:
+                return True  # Already part of the answer (e.g. via a resync).
+            if int(seq) != self._streaming_next_seq:
+                return False
+            self._streaming_next_seq = last + 1
+        text = str(delta or "")
+        if not text:
+            return True
+
+        if self._streaming_pending_text is not None:
+            # A resync is still waiting for the next frame; extend it instead.
+            self._streaming_pending_text += text
+        else:
+            self._append_streaming_arrived_text(text)
+        if not self._streaming_resize_timer.isActive():
+            self._streaming_resize_timer.start()
+        if self._stream_realtime_enabled:
+            self._tick_streaming_answer_frame()
+        return True
+
     def complete_streaming_answer(self, final_text: str = "", reason: str = ""):
         if self._streaming_answer_dismissed:
             self._streaming_answer_active = False
@@ -1823,7 +1909,12 @@ class AudioVisualizer(QWidget):
             reason=reason or "streaming answer completed",
             answer_preview=str(final_text or "")[:120],
         )
-        if final_text:
+        arrived = self._streaming_pending_text
+        if arrived is None:
+            arrived = self._streaming_arrived_text()
+        normalize = self._normalize_markdown_bold_spacing
+        if final_text and normalize(final_text.strip()) != normalize(arrived.strip()):
+            # Only an answer that differs from what streamed needs a resync.
             self.update_streaming_answer(final_text, reason="final streamed answer sync")
 
         self._streaming_answer_active = False
@@ -2018,9 +2109,9 @@ class AudioVisualizer(QWidget):
             answer_visible=self._answer_visible,
         )
         if self._streaming_answer_active:
-            # During live streaming, allow users to dismiss the UI without
-            # interrupting the in-flight request. Ignore further chunks
-            # for this response cycle.
+            # During live streaming, hide at once and ignore further chunks
+            # for this response cycle; answer_dismissed lets the owner
+            # cancel the request.
             self._streaming_answer_active = False
             self._streaming_answer_dismissed = True
             self._reset_streaming_answer_state(clear_dismissed=False)
@@ -2029,6 +2120,7 @@ class AudioVisualizer(QWidget):
             self._answer_label.clear()
             self._set_click_through(True)
             self.hide(reason=reason or "streaming answer dismissed")
+            self.answer_dismissed.emit()
             return
 
         if not self._answer_visible:
@@ -2061,6 +2153,10 @@ class AudioVisualizer(QWidget):
             return
         self._visualizer.update_level(level)
 
+    def set_level_source(self, source):
+        """Read mic levels from ``source.reading`` each frame (see AudioMeter)."""
+        self._visualizer.level_source = source
+
     def set_listening_mode(self, reason: str = ""):
         self._trace_widget_event(
             "widget_mode_change",
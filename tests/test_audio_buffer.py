@@ -0,0 +1,116 @@
+import time
+import tracemalloc
+
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+from src.audio_buffer import CaptureBuffer, PreRollRing
+from src.audio_recorder import AudioRecorder
+
+
+def test_ring_keeps_newest_samples_in_order():
+    ring = PreRollRing(8)
+    ring.write(np.arange(0, 5, dtype=np.int16))
+    ring.write(np.arange(5, 11, dtype=np.int16))
+
+    dest = CaptureBuffer(4)
+    copied = ring.copy_range(0, ring.total, dest)
+
+    assert ring.total == 11
+    assert copied == 8
+    assert dest.view().tolist() == list(range(3, 11))
+
+
+def test_ring_write_larger_than_capacity():
+    ring = PreRollRing(4)
+    ring.write(np.arange(0, 10, dtype=np.int16))
+
+    dest = CaptureBuffer(4)
+    ring.copy_range(ring.total - 4, ring.total, dest)
+    assert dest.view().tolist() == [6, 7, 8, 9]
+
+
+def test_ring_copy_range_is_clamped():
+    ring = PreRollRing(4)
+    ring.write(np.arange(0, 3, dtype=np.int16))
+
+    dest = CaptureBuffer(4)
+    assert ring.copy_range(-10, 2, dest) == 2
+    assert dest.view().tolist() == [0, 1]
+    assert ring.copy_range(5, 9, dest) == 0
+
+
+def test_capture_buffer_grows_and_preserves_samples():
+    capture = CaptureBuffer(4)
+    capture.write(np.arange(0, 3, dtype=np.int16))
+    capture.write(np.arange(3, 10, dtype=np.int16))
+
+    assert len(capture) == 10
+    assert capture.capacity >= 10
+    assert capture.nbytes == 20
+    assert capture.view().tolist() == list(range(10))
+
+
+def test_capture_view_is_not_a_copy():
+    capture = CaptureBuffer(8)
+    capture.write(np.ones(4, dtype=np.int16))
+    assert np.shares_memory(capture.view(), capture.view())
+
+
+def test_capture_spills_to_memmap_past_ram_budget():
+    capture = CaptureBuffer(1024, ram_budget_bytes=4096)
+    samples = np.arange(0, 10000, dtype=np.int16)
+    capture.write(samples[:1500])
+    assert not capture.spilled
+
+    capture.write(samples[1500:6000])
+    assert capture.spilled
+    assert isinstance(capture._data, np.memmap)
+    # Later growth extends the same file rather than copying.
+    spill = capture._spill
+    capture.write(samples[6000:])
+    assert capture._spill is spill
+
+    assert np.array_equal(capture.view(), samples)
+
+
+def _run_callbacks(recorder, chunk: bytes, count: int) -> None:
+    for _ in range(count):
+        recorder._audio_callback(chunk, 1024, None, None)
+
+
+def test_benchmark_capture_allocations_per_second():
+    """Live allocations retained per second of 48 kHz capture stay flat."""
+    with patch("src.audio_recorder.pyaudio.PyAudio") as mock_pa:
+        mock_pa.return_value.open.return_value = MagicMock()
+        mock_pa.return_value.get_default_input_device_info.return_value = {
+            "defaultSampleRate": 48000.0
+        }
+        recorder = AudioRecorder(always_listening=True)
+        recorder.start_listening()
+
+        chunk = (np.sin(np.arange(1024) / 9.0) * 8000).astype(np.int16).tobytes()
+        callbacks_per_second = 48000 / 1024.0
+        seconds = 10
+        count = int(callbacks_per_second * seconds)
+
+        recorder.start_recording()
+        _run_callbacks(recorder, chunk, 50)  # warm up
+
+        tracemalloc.start()
+        before_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        started = time.perf_counter()
+        _run_callbacks(recorder, chunk, count)
+        elapsed = time.perf_counter() - started
+        after_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.stop()
+
+        allocs_per_second = max(0, after_blocks - before_blocks) / seconds
+        print(
+            f"\ncapture: {allocs_per_second:.1f} retained allocations/s of audio, "
+            f"{elapsed / count * 1e6:.1f} us/callback"
+        )
+
+        # A list of bytes would retain ~47 objects per second of audio.
+        assert allocs_per_second < 5
+        assert len(recorder._capture) >= count * 1024
@@ -0,0 +1,174 @@
+import time
+from unittest.mock import patch
+
+from src.audio_devices import DeviceCatalog, is_same_device, normalize_device_name
+from src.audio_recorder import AudioRecorder
+
+PA_INT16 = 8
+
+
+class FakeStream:
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePyAudio:
+    """PortAudio stand-in with per-query latency and a query counter."""
+
+    QUERY_DELAY = 0.002
+
+    def __init__(self, devices=None, rejected_rates=()):
+        self.host_apis = [{'name': 'Windows WASAPI'}, {'name': 'MME'}]
+        self.devices = devices if devices is not None else {
+            0: [
+                {'index': 1, 'name': 'Realtek Microphone Array', 'maxInputChannels': 2, 'defaultSampleRate': 48000.0},
+                {'index': 2, 'name': 'Microphone (NVIDIA Broadcast)', 'maxInputChannels': 1, 'defaultSampleRate': 48000.0},
+            ],
+            1: [
+                {'index': 5, 'name': 'Microphone (NVIDIA Broadca', 'maxInputChannels': 1, 'defaultSampleRate': 44100.0},
+            ],
+        }
+        self.rejected_rates = set(rejected_rates)
+        self.queries = 0
+        self.opened = []
+
+    def _query(self):
+        self.queries += 1
+        time.sleep(self.QUERY_DELAY)
+
+    def get_host_api_count(self):
+        return len(self.host_apis)
+
+    def get_device_count(self):
+        return sum(len(devices) for devices in self.devices.values())
+
+    def get_host_api_info_by_index(self, index):
+        self._query()
+        return {'deviceCount': len(self.devices.get(index, [])), **self.host_apis[index]}
+
+    def get_device_info_by_host_api_device_index(self, host_api, index):
+        self._query()
+        return dict(self.devices[host_api][index])
+
+    def _all(self):
+        return {d['index']: d for devices in self.devices.values() for d in devices}
+
+    def get_device_info_by_index(self, index):
+        self._query()
+        return dict(self._all()[index])
+
+    def get_default_input_device_info(self):
+        self._query()
+        return dict(self.devices[0][0])
+
+    def is_format_supported(self, rate, input_device=None, input_channels=None, input_format=None):
+        self._query()
+        if rate in self.rejected_rates:
+            raise ValueError("Invalid sample rate")
+        return True
+
+    def open(self, **kwargs):
+        self.opened.append(kwargs)
+        return FakeStream()
+
+    def terminate(self):
+        pass
+
+
+def test_list_devices_is_cached_and_deduplicated():
+    pa = FakePyAudio()
+    catalog = DeviceCatalog(pa, PA_INT16)
+
+    first = catalog.list_devices()
+    queries = pa.queries
+    second = catalog.list_devices()
+
+    assert first == second == [
+        (1, 'Realtek Microphone Array (WASAPI)'),
+        (2, 'Microphone (NVIDIA Broadcast) (WASAPI)'),
+    ]
+    assert pa.queries == queries
+    assert catalog.hits == 1
+
+
+def test_device_set_change_invalidates():
+    pa = FakePyAudio()
+    catalog = DeviceCatalog(pa, PA_INT16)
+    catalog.list_devices()
+
+    pa.devices[0].append({'index': 9, 'name': 'USB Headset', 'maxInputChannels': 1, 'defaultSampleRate': 16000.0})
+
+    assert (9, 'USB Headset (WASAPI)') in catalog.list_devices()
+
+
+def test_enumeration_prewarms_native_rates_and_probes_are_cached():
+    pa = FakePyAudio(rejected_rates={44100})
+    catalog = DeviceCatalog(pa, PA_INT16)
+    catalog.list_devices()
+    queries = pa.queries
+
+    assert catalog.native_rate(2) == 48000
+    assert pa.queries == queries
+
+    assert catalog.supports(5, 44100) is False
+    assert catalog.supports(5, 44100) is False
+    assert catalog.supports(None, 48000) is True
+    assert pa.queries == queries + 3  # two probes + the default device lookup
+
+
+def test_refresh_drops_cache():
+    pa = FakePyAudio()
+    catalog = DeviceCatalog(pa, PA_INT16)
+    catalog.list_devices()
+
+    fresh = FakePyAudio(devices={0: [], 1: []})
+    catalog.refresh(fresh)
+
+    assert catalog.list_devices() == []
+
+
+def test_prefix_dedup_matches_pairwise_rule():
+    names = ['Microphone (NVIDIA Broadcast)', 'Microphone (NVIDIA Broadca', 'Mic', 'mic', 'Microphone Array']
+    keys = [normalize_device_name(n) for n in names]
+    assert is_same_device(keys[0], keys[1])
+    assert is_same_device(keys[2], keys[3])
+    assert not is_same_device(keys[0], keys[4])
+
+
+def test_recorder_falls_back_when_native_rate_rejected():
+    pa = FakePyAudio(rejected_rates={44100})
+    with patch("src.audio_recorder.pyaudio.PyAudio", return_value=pa):
+        recorder = AudioRecorder(input_device_index=5, always_listening=True)
+        recorder.start_listening()
+
+    assert recorder._capture_rate == 16000
+    assert pa.opened[-1]['rate'] == 16000
+
+
+def test_benchmark_reopen_latency_is_cache_hit():
+    pa = FakePyAudio()
+    with patch("src.audio_recorder.pyaudio.PyAudio", return_value=pa):
+        recorder = AudioRecorder(input_device_index=1, always_listening=True)
+        recorder.list_devices()  # init_state
+        recorder.start_listening()
+
+        start = time.perf_counter()
+        recorder.update_device(2)
+        cold = time.perf_counter() - start
+        cold_queries = pa.queries
+
+        recorder.update_device(1)
+        start = time.perf_counter()
+        recorder.update_device(2)
+        warm = time.perf_counter() - start
+
+    print(f"reopen cold {cold * 1000:.2f} ms, warm {warm * 1000:.2f} ms")
+    # Device 2 was first probed on the cold switch; switching back is free.
+    assert pa.queries == cold_queries
+    assert warm < FakePyAudio.QUERY_DELAY
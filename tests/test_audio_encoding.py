@@ -0,0 +1,206 @@
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.audio_encoding import (
+    EncodedAudio,
+    FlacEncoder,
+    OggOpusEncoder,
+    WavStreamEncoder,
+    WAV_HEADER_BYTES,
+    available_codecs,
+    create_encoder,
+)
+from src.groq_client import GroqClient
+
+
+def _sine(seconds: float, rate: int) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / float(rate)
+    return (np.sin(2 * np.pi * 220.0 * t) * 9000).astype(np.int16)
+
+
+def test_finalize_produces_valid_wav():
+    samples = _sine(0.25, 48000)
+    encoder = WavStreamEncoder(48000, initial_seconds=0.1)
+    for start in range(0, len(samples), 1024):
+        encoder.write(samples[start:start + 1024])
+
+    audio = encoder.finalize()
+
+    assert audio.nbytes == WAV_HEADER_BYTES + samples.nbytes
+    with wave.open(audio, "rb") as wf:
+        assert wf.getnchannels() == 1
+        assert wf.getsampwidth() == 2
+        assert wf.getframerate() == 48000
+        assert wf.getnframes() == len(samples)
+        decoded = np.frombuffer(wf.readframes(len(samples)), dtype=np.int16)
+    assert np.array_equal(decoded, samples)
+
+
+def test_finalize_is_zero_copy():
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.arange(100, dtype=np.int16))
+
+    audio = encoder.finalize()
+
+    assert np.shares_memory(np.frombuffer(audio.getbuffer(), dtype=np.uint8), encoder._data)
+    assert audio.filename == "audio.wav"
+    assert audio.mime_type == "audio/wav"
+    assert audio.duration == pytest.approx(100 / 16000)
+
+
+def test_encoded_audio_file_protocol():
+    audio = EncodedAudio(memoryview(b"0123456789"))
+    assert audio.read(3) == b"012"
+    assert audio.tell() == 3
+    audio.seek(-2, io.SEEK_END)
+    assert audio.read() == b"89"
+    audio.seek(0)
+    target = bytearray(4)
+    assert audio.readinto(target) == 4
+    assert bytes(target) == b"0123"
+    assert audio.getvalue() == b"0123456789"
+    assert isinstance(audio, io.IOBase)
+
+
+def test_transcribe_uploads_buffer_without_reading_it():
+    with patch("src.groq_client.Groq") as mock_groq:
+        mock_groq.return_value.audio.transcriptions.create.return_value = MagicMock(text="hi")
+        client = GroqClient("key")
+
+        encoder = WavStreamEncoder(16000, initial_seconds=1)
+        encoder.write(np.zeros(160, dtype=np.int16))
+        audio = encoder.finalize()
+        audio.read = MagicMock(side_effect=AssertionError("payload must not be copied"))
+
+        assert client.transcribe(audio) == "hi"
+
+    kwargs = mock_groq.return_value.audio.transcriptions.create.call_args.kwargs
+    assert kwargs["file"] == ("audio.wav", audio, "audio/wav")
+
+
+def test_trimmed_finalize_is_zero_copy_and_valid():
+    samples = np.arange(1000, dtype=np.int16)
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(samples)
+
+    audio = encoder.finalize(300, 700)
+
+    assert audio.nbytes == WAV_HEADER_BYTES + 800
+    assert np.shares_memory(np.frombuffer(audio.getbuffer(), dtype=np.uint8), encoder._data)
+    with wave.open(audio, "rb") as wf:
+        assert np.array_equal(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16), samples[300:700])
+    assert audio.duration == pytest.approx(400 / 16000)
+
+
+def test_spilled_wav_is_served_from_the_mapped_file():
+    samples = _sine(5.0, 16000)
+    encoder = WavStreamEncoder(16000, initial_seconds=1, ram_budget_bytes=64 * 1024)
+    encoder.write(samples)
+
+    audio = encoder.finalize(100, 50000)
+
+    assert encoder.spilled
+    assert isinstance(audio.samples, np.memmap)
+    with wave.open(audio, "rb") as wf:
+        assert np.array_equal(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16), samples[100:50000])
+
+
+def test_flac_encoder_is_lossless():
+    soundfile = pytest.importorskip("soundfile")
+    samples = _sine(0.5, 16000)
+    encoder = create_encoder("flac", 16000, initial_seconds=1)
+    encoder.write(samples)
+
+    audio = encoder.finalize()
+
+    assert isinstance(encoder, FlacEncoder)
+    assert (audio.filename, audio.mime_type) == ("audio.flac", "audio/flac")
+    assert audio.nbytes < samples.nbytes
+    decoded, rate = soundfile.read(audio, dtype="int16")
+    assert rate == 16000
+    assert np.array_equal(decoded, samples)
+
+
+def test_opus_encoder_produces_ogg():
+    pytest.importorskip("soundfile")
+    encoder = create_encoder("opus", 16000, initial_seconds=1)
+    encoder.write(_sine(1.0, 16000))
+
+    audio = encoder.finalize()
+
+    assert isinstance(encoder, OggOpusEncoder)
+    assert (audio.filename, audio.mime_type) == ("audio.ogg", "audio/ogg")
+    assert audio.read(4) == b"OggS"
+
+
+def test_opus_falls_back_to_flac_for_unsupported_rate():
+    pytest.importorskip("soundfile")
+    assert isinstance(create_encoder("opus", 44100), FlacEncoder)
+
+
+def test_codecs_fall_back_to_wav_without_soundfile():
+    with patch("src.audio_encoding._load_soundfile", return_value=None):
+        assert available_codecs() == ["wav"]
+        encoder = create_encoder("flac", 16000)
+    assert type(encoder) is WavStreamEncoder
+
+
+def test_unknown_codec_uses_wav():
+    assert type(create_encoder("mp9", 16000)) is WavStreamEncoder
+
+
+def _legacy_join_and_wave(chunks, rate):
+    buffer = io.BytesIO()
+    wf = wave.open(buffer, "wb")
+    wf.setnchannels(1)
+    wf.setsampwidth(2)
+    wf.setframerate(rate)
+    wf.writeframes(b"".join(chunks))
+    wf.close()
+    buffer.seek(0)
+    return buffer.read()
+
+
+@pytest.mark.parametrize("seconds", [10, 60, 300])
+def test_benchmark_release_to_upload_is_constant_time(seconds):
+    """Key release -> upload-ready payload for 10 s, 60 s and 300 s recordings."""
+    rate = 48000
+    samples = _sine(seconds, rate)
+    encoder = WavStreamEncoder(rate, initial_seconds=30)
+    encoder.write(samples)
+
+    started = time.perf_counter()
+    audio = encoder.finalize()
+    payload = audio.getbuffer()
+    release_ms = (time.perf_counter() - started) * 1000.0
+
+    chunks = [samples[i:i + 1024].tobytes() for i in range(0, len(samples), 1024)]
+    started = time.perf_counter()
+    _legacy_join_and_wave(chunks, rate)
+    legacy_ms = (time.perf_counter() - started) * 1000.0
+
+    print(
+        f"\n{seconds:>4d}s @ {rate} Hz: release {release_ms:.3f} ms "
+        f"(legacy join + wave + read {legacy_ms:.1f} ms, {payload.nbytes / 1e6:.1f} MB)"
+    )
+    assert payload.nbytes == WAV_HEADER_BYTES + samples.nbytes
+    # Header patch only: well under a millisecond on any machine, at any length.
+    assert release_ms < 5.0
+
+
+def test_reader_shares_bytes_with_independent_position():
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.arange(100, dtype=np.int16))
+    audio = encoder.finalize()
+    audio.read(10)
+    other = audio.reader()
+
+    assert other.tell() == 0 and audio.tell() == 10
+    assert other.getvalue() == audio.getvalue()
+    assert other.getbuffer().obj is audio.getbuffer().obj
+    assert (other.filename, other.sample_rate, other.codec) == (audio.filename, audio.sample_rate, audio.codec)
@@ -1,8 +1,15 @@
 import pytest
+import wave
 from unittest.mock import MagicMock, patch, mock_open
 import numpy as np
 from PyQt6.QtCore import QObject
 from src.audio_recorder import AudioRecorder
+from src.audio_encoding import WavStreamEncoder
+
+def _capture_of(samples, rate=16000):
+    capture = WavStreamEncoder(rate, initial_seconds=0)
+    capture.write(np.asarray(samples, dtype=np.int16))
+    return capture
 
 @pytest.fixture
 def mock_pyaudio():
@@ -110,20 +117,20 @@ def test_capture_uses_device_native_sample_rate(mock_pyaudio):
     assert recorder._capture_rate == 48000
 
 def test_wav_written_at_capture_rate(mock_pyaudio, qtbot):
-    recorder = AudioRecorder(always_listening=False)
+    recorder = AudioRecorder(always_listening=False, trim_silence=False)
     recorder._capture_rate = 44100  # simulate a device captured at 44.1 kHz
     recorder.is_recording = True
     recorder.stream = MagicMock()
-    recorder.frames = [b'\x00\x00']
+    recorder._capture = recorder._new_capture()
+    recorder._capture.write(np.zeros(4, dtype=np.int16))
 
-    with patch("src.audio_recorder.wave.open") as mock_wave:
-        mock_wf = MagicMock()
-        mock_wave.return_value = mock_wf
-        with qtbot.waitSignal(recorder.recording_finished):
-            recorder.stop_recording()
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
 
     # WAV header must match the rate we actually captured at.
-    mock_wf.setframerate.assert_called_once_with(44100)
+    with wave.open(blocker.args[0], 'rb') as wf:
+        assert wf.getframerate() == 44100
+        assert wf.getnframes() == 4
 
 def test_start_recording_success(mock_pyaudio, qtbot):
     # Legacy path: opens a fresh stream on record.
@@ -153,18 +160,14 @@ def test_start_recording_fail(mock_pyaudio, qtbot):
 
 def test_stop_recording_success(mock_pyaudio, qtbot):
     # Legacy path: stream is closed and cleared on stop.
-    recorder = AudioRecorder(always_listening=False)
+    recorder = AudioRecorder(always_listening=False, trim_silence=False)
     recorder.is_recording = True
     mock_stream = MagicMock() # Create local reference
     recorder.stream = mock_stream
-    recorder.frames = [b'\x00\x00']
+    recorder._capture = _capture_of([0])
 
-    # Mock wave.open to avoid actual WAV processing
-    with patch("src.audio_recorder.wave.open") as mock_wave:
-        mock_wf = MagicMock()
-        mock_wave.return_value = mock_wf
-        with qtbot.waitSignal(recorder.recording_finished) as blocker:
-            recorder.stop_recording()
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
 
     assert recorder.is_recording is False
     assert recorder.stream is None # Should be cleared
@@ -172,11 +175,10 @@ def test_stop_recording_success(mock_pyaudio, qtbot):
     # Use local reference to verify calls
     mock_stream.stop_stream.assert_called_once()
     mock_stream.close.assert_called_once()
-    mock_wave.assert_called_once()
 
-    # Now emits BytesIO buffer, not filename (in-memory recording)
-    import io
-    assert hasattr(blocker.args[0], 'read')  # Should be a file-like object (BytesIO)
+    # Emits an in-memory file-like WAV, not a filename.
+    assert hasattr(blocker.args[0], 'read')
+    assert blocker.args[0].read(4) == b'RIFF'
 
 def test_start_listening_opens_persistent_stream(mock_pyaudio):
     recorder = AudioRecorder(always_listening=True)
@@ -208,25 +210,23 @@ def test_always_on_start_recording_seeds_from_ring(mock_pyaudio):
 
     recorder.start_recording()
 
-    # Frames seeded from the ring buffer; no new stream opened.
+    # Capture seeded from the ring buffer; no new stream opened.
     assert recorder.is_recording is True
-    assert recorder.frames == [pre_roll]
+    assert recorder._capture.view().tobytes() == pre_roll
     mock_instance.open.assert_not_called()
 
 def test_always_on_stop_recording_keeps_stream_open(mock_pyaudio, qtbot):
-    recorder = AudioRecorder(always_listening=True)
+    recorder = AudioRecorder(always_listening=True, trim_silence=False)
     mock_instance = mock_pyaudio.return_value
     mock_stream = MagicMock()
     mock_instance.open.return_value = mock_stream
 
     recorder.start_listening()
     recorder.start_recording()
-    recorder.frames = [b'\x00\x00']
+    recorder._capture = _capture_of([0])
 
-    with patch("src.audio_recorder.wave.open") as mock_wave:
-        mock_wave.return_value = MagicMock()
-        with qtbot.waitSignal(recorder.recording_finished):
-            recorder.stop_recording()
+    with qtbot.waitSignal(recorder.recording_finished):
+        recorder.stop_recording()
 
     assert recorder.is_recording is False
     # Persistent stream MUST stay open for the next recording.
@@ -240,7 +240,7 @@ def test_callback_keeps_persistent_stream_alive(mock_pyaudio):
     import pyaudio
     assert flag == pyaudio.paContinue
     # Ring buffer is always fed.
-    assert len(recorder._ring) == 1
+    assert recorder._ring.total == 512
 
 def test_legacy_callback_completes_when_not_recording(mock_pyaudio):
     recorder = AudioRecorder(always_listening=False)
@@ -303,19 +303,216 @@ def test_update_device_reopens_when_always_on(mock_pyaudio):
     _, kwargs = mock_instance.open.call_args
     assert kwargs.get('input_device_index') == 9
 
-def test_audio_callback_visualizer(mock_pyaudio, qtbot):
+def test_audio_callback_only_stores_samples(mock_pyaudio, qtbot):
+    recorder = AudioRecorder(always_listening=False)
+    recorder.is_recording = True
+    recorder._capture = _capture_of([])
+    data = np.array([1000, 2000, -3000], dtype=np.int16)
+
+    recorder._audio_callback(data.tobytes(), 3, None, None)
+
+    assert recorder._capture.view().tolist() == data.tolist()
+    assert recorder._ring.total == 3
+    # Levels come from the meter, computed off the audio thread.
+    recorder.meter.tick()
+    assert recorder.meter.reading.peak == pytest.approx(3000 / 32768.0)
+    assert recorder.meter.reading.level > 3000 / 7000.0
+
+def test_meter_runs_only_while_recording(mock_pyaudio):
+    recorder = AudioRecorder(always_listening=False, trim_silence=False)
+    mock_pyaudio.return_value.open.return_value = MagicMock()
+
+    recorder.start_recording()
+    assert recorder.meter.running
+    recorder.stop_recording()
+    assert not recorder.meter.running
+
+def test_stop_waits_for_callback_write_in_progress(mock_pyaudio, qtbot):
+    import threading
+
+    recorder = AudioRecorder(always_listening=True, trim_silence=False)
+    recorder.stream = MagicMock()
+    recorder.is_recording = True
+    capture = _capture_of([1, 2])
+    recorder._capture = capture
+    in_write = threading.Event()
+    events = []
+    real_write, real_finalize = capture.write, capture.finalize
+
+    def slow_write(samples):
+        in_write.set()
+        threading.Event().wait(0.1)
+        real_write(samples)
+        events.append("write")
+
+    def finalize(*args):
+        events.append("finalize")
+        return real_finalize(*args)
+
+    capture.write = slow_write
+    capture.finalize = finalize
+    data = np.array([3, 4], dtype=np.int16).tobytes()
+    callback = threading.Thread(target=recorder._audio_callback, args=(data, 2, None, None))
+    callback.start()
+    in_write.wait(1)
+
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
+    callback.join()
+    recorder._audio_callback(data, 2, None, None)  # late callback: ring only
+
+    assert events == ["write", "finalize"]
+    with wave.open(blocker.args[0], 'rb') as wf:
+        assert wf.getnframes() == 4
+
+def test_always_on_capture_is_contiguous_with_preroll(mock_pyaudio):
+    recorder = AudioRecorder(always_listening=True)
+    mock_pyaudio.return_value.open.return_value = MagicMock()
+    recorder.start_listening()
+
+    first = np.arange(0, 512, dtype=np.int16)
+    second = np.arange(512, 1024, dtype=np.int16)
+    recorder._audio_callback(first.tobytes(), 512, None, None)
+    recorder.start_recording()
+    recorder._audio_callback(second.tobytes(), 512, None, None)
+
+    assert np.array_equal(recorder._capture.view(), np.arange(0, 1024, dtype=np.int16))
+
+def test_callback_catches_up_on_chunks_written_during_seed(mock_pyaudio):
+    recorder = AudioRecorder(always_listening=True)
+    mock_pyaudio.return_value.open.return_value = MagicMock()
+    recorder.start_listening()
+    recorder._audio_callback(np.full(256, 1, dtype=np.int16).tobytes(), 256, None, None)
+    recorder.start_recording()
+
+    # A chunk lands in the ring after the seed copy but before the callback
+    # observed the new capture (simulated by writing the ring directly).
+    recorder._ring.write(np.full(256, 2, dtype=np.int16))
+    recorder._audio_callback(np.full(256, 3, dtype=np.int16).tobytes(), 256, None, None)
+
+    captured = recorder._capture.view()
+    assert captured.tolist() == [1] * 256 + [2] * 256 + [3] * 256
+
+def test_target_rate_resamples_capture_before_encoding(mock_pyaudio, qtbot):
+    mock_instance = mock_pyaudio.return_value
+    mock_instance.open.return_value = MagicMock()
+    mock_instance.get_default_input_device_info.return_value = {'defaultSampleRate': 48000.0}
+
+    recorder = AudioRecorder(always_listening=False, target_rate=16000)
+    recorder.start_recording()
+    chunk = (np.sin(np.arange(1024) / 7.0) * 5000).astype(np.int16).tobytes()
+    for _ in range(30):
+        recorder._audio_callback(chunk, 1024, None, None)
+
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
+
+    with wave.open(blocker.args[0], 'rb') as wf:
+        assert wf.getframerate() == 16000
+        assert wf.getnframes() == 30 * 1024 // 3
+
+def test_silent_recording_skips_upload(mock_pyaudio, qtbot):
     recorder = AudioRecorder(always_listening=False)
     recorder.is_recording = True
+    recorder.stream = MagicMock()
+    recorder._capture = _capture_of(np.zeros(16000))
+    finished = MagicMock()
+    recorder.recording_finished.connect(finished)
+
+    with qtbot.waitSignal(recorder.no_speech_detected):
+        recorder.stop_recording()
+
+    finished.assert_not_called()
+    assert recorder._capture is None
+    assert recorder.vad_stats.calls_avoided == 1
+    assert recorder.vad_stats.trimmed_bytes == 32000
+
+def test_recording_is_trimmed_to_speech(mock_pyaudio, qtbot):
+    recorder = AudioRecorder(always_listening=False)
+    recorder.is_recording = True
+    recorder.stream = MagicMock()
+    tone = (np.sin(np.arange(8000) / 5.0) * 6000).astype(np.int16)
+    samples = np.concatenate((np.zeros(16000), tone, np.zeros(16000)))
+    recorder._capture = _capture_of(samples)
 
-    # Generate dummy audio data (sine wave-ish)
-    # int16 max is 32767
-    data = np.array([1000, 2000, -3000], dtype=np.int16).tobytes()
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
 
-    with qtbot.waitSignal(recorder.visualizer_update) as blocker:
-        recorder._audio_callback(data, 1024, None, None)
+    with wave.open(blocker.args[0], 'rb') as wf:
+        frames = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    assert 8000 <= frames.shape[0] < samples.shape[0] // 2
+    assert np.array_equal(frames[frames != 0][:100], tone[tone != 0][:100])
+    assert recorder.vad_stats.trimmed_seconds > 1.0
 
-    emitted = blocker.args[0]
-    linear = 3000 / 7000.0
-    assert 0.0 <= emitted <= 1.0
-    # Low/medium volume should now be boosted for better visual responsiveness.
-    assert emitted > linear
+def test_speculative_recording_emits_segments_then_tail(mock_pyaudio, qtbot):
+    recorder = AudioRecorder(always_listening=False, speculative=True)
+    recorder.stream = MagicMock()
+    recorder.is_recording = True
+    recorder._start_segmenting()
+    tone = (np.sin(np.arange(16000 * 7) / 5.0) * 6000).astype(np.int16)
+    pause = np.zeros(16000, dtype=np.int16)
+    recorder._capture = _capture_of(np.concatenate((tone, pause)))
+
+    with qtbot.waitSignal(recorder.segment_ready) as segment:
+        recorder._poll_segments()
+    recorder._capture.write(tone[:16000 * 2])
+    recorder._poll_segments()  # no new pause yet
+    with qtbot.waitSignal(recorder.recording_finished) as tail:
+        recorder.stop_recording()
+
+    with wave.open(segment.args[0], 'rb') as wf:
+        assert 7 * 16000 <= wf.getnframes() < 8 * 16000
+    with wave.open(tail.args[0], 'rb') as wf:
+        assert 2 * 16000 <= wf.getnframes() < 3 * 16000
+    assert recorder._segments_emitted == 1
+    assert recorder._segment_thread is None
+
+def test_segments_are_cut_off_the_gui_thread(mock_pyaudio, qtbot):
+    import threading
+
+    recorder = AudioRecorder(always_listening=False, speculative=True)
+    recorder._SEGMENT_POLL_MS = 10
+    recorder.stream = MagicMock()
+    tone = (np.sin(np.arange(16000 * 7) / 5.0) * 6000).astype(np.int16)
+    recorder._capture = _capture_of(np.concatenate((tone, np.zeros(16000, dtype=np.int16))))
+    recorder.is_recording = True
+    threads = []
+    recorder.segment_ready.connect(lambda audio: threads.append(threading.current_thread()))
+
+    recorder._start_segmenting()
+    qtbot.waitUntil(lambda: bool(threads), timeout=2000)
+    recorder.stop_recording()
+
+    assert threads == [threading.main_thread()]
+    assert recorder._segments_emitted == 1
+    assert recorder._segment_thread is None
+
+def test_speculative_silent_tail_still_finishes(mock_pyaudio, qtbot):
+    recorder = AudioRecorder(always_listening=False, speculative=True)
+    recorder.stream = MagicMock()
+    recorder.is_recording = True
+    recorder._start_segmenting()
+    tone = (np.sin(np.arange(16000 * 7) / 5.0) * 6000).astype(np.int16)
+    recorder._capture = _capture_of(np.concatenate((tone, np.zeros(32000))))
+    recorder._poll_segments()
+
+    with qtbot.waitSignal(recorder.recording_finished) as tail:
+        recorder.stop_recording()
+
+    assert tail.args[0].samples.shape[0] == 0
+
+def test_max_duration_stops_capture_and_signals_once(mock_pyaudio, qtbot):
+    recorder = AudioRecorder(always_listening=False, max_seconds=0.1)
+    recorder.is_recording = True
+    recorder._start_segmenting()
+    recorder._capture = _capture_of([])
+    chunk = np.ones(1024, dtype=np.int16).tobytes()
+    reached = MagicMock()
+    recorder.max_duration_reached.connect(reached)
+
+    for _ in range(5):
+        recorder._audio_callback(chunk, 1024, None, None)
+
+    assert len(recorder._capture) == 2048  # 0.128 s, then capture stops
+    assert recorder._ring.total == 5 * 1024
+    reached.assert_called_once()
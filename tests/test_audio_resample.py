@@ -0,0 +1,113 @@
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio_encoding import WavStreamEncoder
+from src.audio_resample import ResampledCapture, StreamingResampler
+
+
+def _reference_resample(signal: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """Ideal band-limited resampling via the FFT (whole-signal reference)."""
+    n = signal.shape[0]
+    m = -(-n * out_rate // in_rate)
+    spectrum = np.fft.rfft(signal)
+    target = np.zeros(m // 2 + 1, dtype=complex)
+    keep = min(spectrum.shape[0], target.shape[0])
+    target[:keep] = spectrum[:keep]
+    return np.fft.irfft(target, m) * (m / n)
+
+
+def _speech_like(seconds: float, rate: int) -> np.ndarray:
+    """Harmonic tone with a slow syllable envelope plus light noise."""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * rate)) / float(rate)
+    f0 = 140.0 + 30.0 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.0 * t) ** 2
+    signal = voice * envelope * 5000 + rng.normal(0, 150, t.shape[0])
+    return signal.astype(np.int16)
+
+
+def _run_chunked(resampler: StreamingResampler, signal: np.ndarray, chunk: int = 1024) -> np.ndarray:
+    parts = [resampler.process(signal[i:i + chunk]) for i in range(0, signal.shape[0], chunk)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def _passband(signal: np.ndarray, rate: int, cutoff: float = 7000.0) -> np.ndarray:
+    spectrum = np.fft.rfft(signal.astype(np.float64))
+    spectrum[np.fft.rfftfreq(signal.shape[0], 1.0 / rate) > cutoff] = 0
+    return np.fft.irfft(spectrum, signal.shape[0])
+
+
+def _snr_db(actual: np.ndarray, reference: np.ndarray, rate: int = 16000, edge: int = 800) -> float:
+    """SNR over the speech passband, ignoring the filter's transition band."""
+    actual = _passband(actual, rate)
+    reference = _passband(reference, rate)
+    window = slice(edge, -edge)
+    error = actual[window] - reference[window]
+    return 10.0 * np.log10(np.mean(reference[window] ** 2) / np.mean(error ** 2))
+
+
+@pytest.mark.parametrize("in_rate", [48000, 44100, 22050])
+def test_chunked_output_matches_single_pass(in_rate):
+    signal = _speech_like(0.5, in_rate)
+    chunked = _run_chunked(StreamingResampler(in_rate), signal, chunk=333)
+    whole = _run_chunked(StreamingResampler(in_rate), signal, chunk=signal.shape[0])
+
+    assert np.array_equal(chunked, whole)
+    assert chunked.shape[0] == -(-signal.shape[0] * 16000 // in_rate)
+
+
+def test_stereo_input_is_downmixed():
+    left = _speech_like(0.25, 48000)
+    stereo = np.stack([left, left], axis=1)
+
+    mono = _run_chunked(StreamingResampler(48000), left)
+    mixed = _run_chunked(StreamingResampler(48000), stereo)
+
+    assert mixed.ndim == 1
+    assert np.array_equal(mixed, mono)
+
+
+def test_same_rate_is_passthrough():
+    signal = _speech_like(0.1, 16000)
+    assert np.array_equal(_run_chunked(StreamingResampler(16000), signal), signal)
+
+
+def test_resampled_capture_finalizes_16k_wav():
+    capture = ResampledCapture(WavStreamEncoder(16000, initial_seconds=1), StreamingResampler(48000))
+    signal = _speech_like(0.3, 48000)
+    for i in range(0, signal.shape[0], 1024):
+        capture.write(signal[i:i + 1024])
+
+    audio = capture.finalize()
+
+    with wave.open(audio, "rb") as wf:
+        assert wf.getframerate() == 16000
+        assert wf.getnframes() == signal.shape[0] // 3
+    assert audio.nbytes < signal.nbytes / 2
+
+
+@pytest.mark.parametrize("in_rate", [48000, 44100])
+def test_benchmark_quality_and_throughput_against_reference(in_rate):
+    """SNR vs an ideal FFT resampler and realtime factor for 1024-frame chunks."""
+    seconds = 3.0
+    signal = _speech_like(seconds, in_rate)
+    reference = _reference_resample(signal.astype(np.float64), in_rate, 16000)
+
+    resampler = StreamingResampler(in_rate)
+    started = time.perf_counter()
+    output = _run_chunked(resampler, signal)
+    elapsed = time.perf_counter() - started
+
+    snr = _snr_db(output, reference)
+    print(
+        f"\n{in_rate} -> 16000 Hz: SNR {snr:.1f} dB vs FFT reference, "
+        f"{seconds / elapsed:.0f}x realtime, {elapsed / (signal.shape[0] / 1024) * 1e6:.0f} us/chunk"
+    )
+    assert output.shape[0] == reference.shape[0]
+    assert snr > 60.0
@@ -0,0 +1,140 @@
+import time
+import wave
+
+import numpy as np
+import pyaudio
+import pytest
+
+from src.audio_devices import DeviceCatalog
+from src.audio_recorder import AudioRecorder
+from src.audio_sources import (
+    FileSource,
+    SimulatedSource,
+    SyntheticSource,
+    parse_pattern,
+    render_pattern,
+)
+
+
+def _write_wav(path, samples, rate, channels=1):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+
+
+def test_parse_pattern_defaults_and_values():
+    steps = parse_pattern("tone:1.5:440, silence:0.5, noise:0.2:100")
+    assert steps == [("tone", 1.5, 440.0), ("silence", 0.5, 30.0), ("noise", 0.2, 100.0)]
+
+
+def test_render_pattern_lengths_and_levels():
+    signal = render_pattern([("tone", 0.5, 440.0), ("silence", 0.25, 0.0), ("noise", 0.25, 50.0)], 16000)
+    assert signal.dtype == np.int16
+    assert signal.shape[0] == 16000
+    assert np.abs(signal[:8000]).max() > 7000
+    assert not signal[8000:12000].any()
+    assert 20 < signal[12000:].std() < 100
+    with pytest.raises(ValueError):
+        render_pattern([("hum", 1.0, 0.0)], 16000)
+
+
+def test_source_answers_device_catalog_queries():
+    source = SyntheticSource("silence:0.1", rate=44100)
+    catalog = DeviceCatalog(source, pyaudio.paInt16)
+    assert catalog.list_devices() == [(0, "Synthetic input (Simulated)")]
+    assert catalog.native_rate(None) == 44100
+    assert catalog.supports(0, 16000)
+
+
+def test_fast_stream_delivers_whole_signal_then_stops():
+    source = SimulatedSource(np.arange(5000, dtype=np.int16), 16000, realtime=False)
+    received = []
+
+    def callback(in_data, frame_count, time_info, status):
+        received.append(np.frombuffer(in_data, dtype=np.int16))
+        return None, pyaudio.paContinue
+
+    stream = source.open(rate=16000, frames_per_buffer=1024, stream_callback=callback)
+    stream.start_stream()
+    assert source.drained.wait(2.0)
+    stream._thread.join(2.0)
+
+    data = np.concatenate(received)
+    assert data.shape[0] == 5 * 1024  # last chunk padded to a full buffer
+    assert np.array_equal(data[:5000], np.arange(5000))
+    assert not stream.is_active()
+
+
+def test_stream_stops_when_callback_completes():
+    source = SyntheticSource("tone:1.0:220", rate=16000, realtime=False, loop=True)
+    calls = []
+
+    def callback(in_data, frame_count, time_info, status):
+        calls.append(frame_count)
+        return None, pyaudio.paComplete if len(calls) == 3 else pyaudio.paContinue
+
+    stream = source.open(rate=16000, frames_per_buffer=256, stream_callback=callback)
+    stream.start_stream()
+    stream._thread.join(2.0)
+    assert calls == [256, 256, 256]
+
+
+def test_realtime_stream_paces_callbacks_like_a_device():
+    source = SyntheticSource("tone:1.0:220", rate=16000, realtime=True, loop=True)
+    stamps = []
+    statuses = []
+
+    def callback(in_data, frame_count, time_info, status):
+        stamps.append(time.perf_counter())
+        statuses.append(status)
+        return None, pyaudio.paContinue
+
+    stream = source.open(rate=16000, frames_per_buffer=320, stream_callback=callback)  # 20 ms
+    stream.start_stream()
+    time.sleep(0.25)
+    stream.stop_stream()
+
+    elapsed = stamps[-1] - stamps[0]
+    # No drift: N callbacks span ~(N - 1) periods.
+    assert abs(elapsed - (len(stamps) - 1) * 0.02) < 0.02
+    assert 8 <= len(stamps) <= 14
+    assert pyaudio.paInputOverflow not in statuses
+
+
+def test_slow_callback_is_flagged_as_overflow():
+    source = SyntheticSource("tone:1.0:220", rate=16000, realtime=True, loop=True)
+    statuses = []
+
+    def callback(in_data, frame_count, time_info, status):
+        statuses.append(status)
+        if len(statuses) == 2:
+            time.sleep(0.1)  # five periods late
+        return None, pyaudio.paContinue if len(statuses) < 4 else pyaudio.paComplete
+
+    stream = source.open(rate=16000, frames_per_buffer=320, stream_callback=callback)
+    stream.start_stream()
+    stream._thread.join(2.0)
+    assert statuses[2] == pyaudio.paInputOverflow
+    assert stream.overflows >= 1
+
+
+def test_recorder_records_file_through_source(tmp_path, qtbot):
+    tone = (np.sin(np.arange(48000) / 5.0) * 6000).astype(np.int16)
+    path = tmp_path / "clip.wav"
+    _write_wav(path, np.concatenate((tone, np.zeros(4800, dtype=np.int16))), 48000)
+    source = FileSource(str(path), realtime=False)
+
+    recorder = AudioRecorder(
+        always_listening=False, target_rate=16000, trim_silence=False, source_factory=source.factory()
+    )
+    recorder.start_recording()
+    assert source.drained.wait(2.0)
+    with qtbot.waitSignal(recorder.recording_finished) as blocker:
+        recorder.stop_recording()
+
+    with wave.open(blocker.args[0], "rb") as wf:
+        assert wf.getframerate() == 16000
+        frames = wf.getnframes()
+    assert abs(frames - (48000 + 4800) // 3) <= 1024
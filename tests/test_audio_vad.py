@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.audio_vad import VadStats, find_pause, find_speech_bounds, frame_energy_db
+
+RATE = 16000
+
+
+def _noise(seconds, level=30.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, level, int(seconds * RATE)).astype(np.int16)
+
+
+def _tone(seconds, amplitude=6000.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 220.0 * t) * amplitude).astype(np.int16)
+
+
+def test_frame_energy_db_levels():
+    silence = np.zeros(320, dtype=np.int16)
+    full_scale = np.full(320, 32767, dtype=np.int16)
+    energy = frame_energy_db(np.concatenate((silence, full_scale, silence[:100])), 320)
+
+    assert energy.shape == (2,)
+    assert energy[0] < -100
+    assert energy[1] == pytest.approx(0.0, abs=0.01)
+
+
+def test_bounds_trim_leading_and_trailing_silence_with_margin():
+    samples = np.concatenate((_noise(1.0), _tone(0.5), _noise(1.5, seed=1)))
+
+    bounds = find_speech_bounds(samples, RATE, margin_ms=250)
+
+    speech_start, speech_end = RATE, int(1.5 * RATE)
+    margin = RATE // 4
+    assert speech_start - margin - 320 <= bounds.start <= speech_start - margin + 320
+    assert speech_end + margin - 320 <= bounds.end <= speech_end + margin + 320
+
+
+def test_bounds_none_for_noise_only():
+    assert find_speech_bounds(_noise(2.0), RATE) is None
+    assert find_speech_bounds(np.zeros(RATE, dtype=np.int16), RATE) is None
+    assert find_speech_bounds(np.zeros(10, dtype=np.int16), RATE) is None
+
+
+def test_short_click_is_not_speech():
+    samples = _noise(1.0)
+    samples[8000:8100] = 20000
+
+    assert find_speech_bounds(samples, RATE) is None
+
+
+def test_recording_voiced_throughout_is_kept():
+    samples = _tone(2.0)
+
+    assert find_speech_bounds(samples, RATE) == (0, samples.shape[0])
+
+
+@pytest.mark.parametrize("level_db", [-40.0, -45.0, -50.0])
+def test_quiet_continuous_speech_is_kept(level_db):
+    samples = _tone(2.0, amplitude=32768.0 * np.sqrt(2) * 10 ** (level_db / 20.0))
+
+    assert find_speech_bounds(samples, RATE) == (0, samples.shape[0])
+    # Quiet speech between quieter pauses is still trimmed to its own extent.
+    padded = np.concatenate((_noise(1.0), samples, _noise(1.0, seed=1)))
+    bounds = find_speech_bounds(padded, RATE, margin_ms=0)
+    assert abs(bounds.start - RATE) <= 320 and abs(bounds.end - 3 * RATE) <= 320
+
+
+def test_find_pause_cuts_mid_pause_after_min_segment():
+    samples = np.concatenate((_tone(3.0), _noise(0.6), _tone(4.0), _noise(0.6), _tone(1.0)))
+
+    cut = find_pause(samples, RATE, min_segment_seconds=5.0, pause_ms=400)
+
+    # The first pause is too early; the cut lands inside the second one.
+    assert int(7.6 * RATE) < cut < int(8.2 * RATE)
+    assert find_pause(samples, RATE, start=cut, min_segment_seconds=5.0) is None
+
+
+def test_find_pause_ignores_short_gaps():
+    samples = np.concatenate((_tone(6.0), _noise(0.2), _tone(2.0)))
+
+    assert find_pause(samples, RATE, min_segment_seconds=5.0, pause_ms=400) is None
+
+
+def test_vad_stats_summary():
+    stats = VadStats()
+    stats.record_trim(8000, RATE)
+    stats.record_skip(16000, RATE)
+
+    assert stats.recordings == 2
+    assert stats.calls_avoided == 1
+    assert stats.trimmed_bytes == 48000
+    assert stats.trimmed_seconds == pytest.approx(1.5)
+    assert "1 API calls avoided" in stats.summary()
+
+
+def test_benchmark_vad_cost_for_five_minutes():
+    samples = np.concatenate((_noise(1.0), _tone(298.0), _noise(1.0)))
+    find_speech_bounds(samples, RATE)
+
+    start = time.perf_counter()
+    bounds = find_speech_bounds(samples, RATE)
+    elapsed = time.perf_counter() - start
+
+    assert bounds is not None
+    assert elapsed < 0.1
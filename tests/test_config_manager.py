@@ -177,3 +177,31 @@ def test_formatting_style_default_is_returned_when_key_missing():
 
     assert manager.get("formatting_style") == "Default"
     _cleanup_test_config_file(config_file)
+
+
+def test_key_pool_lives_in_secure_storage_one_account_per_key():
+    """Extra keys get their own credential accounts; config.json keeps placeholders."""
+    config_file = _new_test_config_file()
+
+    accounts = {}
+
+    def store_for(account_name="groq_api_key", **_):
+        return accounts.setdefault(account_name, FakeSecureStore(available=True))
+
+    with patch("src.config_manager.ApiKeyStore", side_effect=store_for):
+        manager = ConfigManager(config_file=config_file)
+        manager.set_key_pool("api_key", ["gsk_two", " ", "gsk_three"])
+        manager.save()
+
+        disk_data = json.loads(config_file.read_text(encoding="utf-8"))
+        assert disk_data["api_key_pool"] == ["", ""]
+        assert accounts["groq_api_key_3"].get_api_key() == "gsk_three"
+
+        reloaded = ConfigManager(config_file=config_file)
+        assert reloaded.get_key_pool("api_key") == ["gsk_two", "gsk_three"]
+        assert reloaded.get_key_pool("gemini_api_key") == []
+
+        reloaded.set_key_pool("api_key", ["gsk_three"])
+        assert accounts["groq_api_key_2"].get_api_key() == "gsk_three"
+        assert accounts["groq_api_key_3"].get_api_key() == ""
+    _cleanup_test_config_file(config_file)
@@ -16,7 +16,8 @@ def mock_deps():
          patch("src.controller.HotkeyManager") as mock_hotkey_package, \
          patch("src.controller.MainWindow") as mock_win_package, \
          patch("src.controller.AudioVisualizer") as mock_vis_package, \
-         patch("src.controller.QSystemTrayIcon") as mock_tray_package:
+         patch("src.controller.QSystemTrayIcon") as mock_tray_package, \
+         patch("src.controller.FormatCache"):
         
         # Setup Config defaults
         mock_cfg_inst = mock_cfg.return_value
@@ -122,19 +123,42 @@ def test_search_progress_signal_updates_processing_step(app, mock_deps):
 def test_search_stream_signal_shows_and_updates_streaming_answer(app, mock_deps):
     controller = WhisperAppController()
 
-    controller._on_search_stream_text("Hello")
-    controller._on_search_stream_text("Hello world")
+    controller._on_search_stream_delta(1, "Hello")
+    controller._on_search_stream_delta(2, " world")
+    controller.stream_coalescer.flush()
+    controller._on_search_stream_delta(3, "!")
+    controller.stream_coalescer.flush()
 
     mock_deps["visualizer"].begin_streaming_answer.assert_called_once_with(
         reason="first streamed answer chunk"
     )
-    assert mock_deps["visualizer"].update_streaming_answer.call_count == 2
+    assert mock_deps["visualizer"].append_streaming_answer.call_args_list == [
+        call("Hello world", seq=1, last_seq=2, reason="Gemini streamed answer chunk"),
+        call("!", seq=3, last_seq=3, reason="Gemini streamed answer chunk"),
+    ]
+    mock_deps["visualizer"].update_streaming_answer.assert_not_called()
+    assert controller.stream_coalescer.stats.merged == 1
+
+
+def test_search_stream_resyncs_visualizer_that_missed_a_delta(app, mock_deps):
+    controller = WhisperAppController()
+    controller.worker = MagicMock()
+    controller.worker.stream_snapshot.return_value = (3, "Hello big world")
+    mock_deps["visualizer"].append_streaming_answer.return_value = False
+
+    controller._on_search_stream_delta(3, " world")
+    controller.stream_coalescer.flush()
+
+    mock_deps["visualizer"].update_streaming_answer.assert_called_once_with(
+        "Hello big world", reason="Gemini stream resync", seq=3
+    )
 
 
 def test_search_thought_signal_updates_thinking_overlay(app, mock_deps):
     controller = WhisperAppController()
 
     controller._on_search_thought_text("I will compare the sources. ")
+    controller.stream_coalescer.flush()
 
     mock_deps["visualizer"].append_thinking_text.assert_called_once_with(
         "I will compare the sources. ",
@@ -374,6 +398,79 @@ def test_on_config_changed_stream_catch_up_updates_visualizer(app, mock_deps):
     mock_deps["visualizer"].set_stream_catch_up_enabled.assert_any_call(False)
 
 
+def test_on_config_changed_resample_updates_recorder_rate(app, mock_deps):
+    controller = WhisperAppController()
+
+    controller.on_config_changed("resample_to_16k", False)
+    mock_deps["config"].set.assert_any_call("resample_to_16k", False)
+    mock_deps["recorder"].set_target_rate.assert_called_with(None)
+
+    controller.on_config_changed("resample_to_16k", True)
+    mock_deps["recorder"].set_target_rate.assert_called_with(16000)
+
+
+def test_on_config_changed_upload_codec_updates_recorder(app, mock_deps):
+    controller = WhisperAppController()
+
+    controller.on_config_changed("upload_codec", "flac")
+
+    mock_deps["config"].set.assert_any_call("upload_codec", "flac")
+    mock_deps["recorder"].set_codec.assert_called_with("flac")
+
+
+def test_speculative_segments_only_for_dictation(app, mock_deps):
+    controller = WhisperAppController()
+    defaults = mock_deps["config"].get.side_effect
+    mock_deps["config"].get.side_effect = (
+        lambda key, default=None: True if key == "speculative_transcription" else defaults(key, default)
+    )
+
+    with patch.object(controller, "_position_visualizer_at_cursor"), \
+         patch.object(controller.connections, "warm"):
+        controller.set_recording(True, "search")
+        mock_deps["recorder"].set_speculative.assert_called_with(False)
+        controller.set_recording(True, "transcribe")
+        mock_deps["recorder"].set_speculative.assert_called_with(True)
+
+
+def test_segment_ready_starts_speculative_session_used_once(app, mock_deps):
+    controller = WhisperAppController()
+
+    controller.on_segment_ready("segment-1")
+    session = controller._speculative
+    controller.on_segment_ready("segment-2")
+
+    assert controller._speculative is session
+    assert session.pending == 2
+    assert controller._build_transcriber() is session
+    assert controller._speculative is None
+    assert controller._build_transcriber() is not session
+    session.cancel()
+
+
+def test_max_duration_auto_stop_ignores_later_release(app, mock_deps):
+    controller = WhisperAppController()
+    mock_deps["recorder"].is_recording = True
+
+    controller.on_max_duration_reached()
+    mock_deps["recorder"].stop_recording.assert_called_once()
+
+    mock_deps["recorder"].is_recording = False
+    mock_deps["visualizer"].set_processing_mode.reset_mock()
+    controller.set_recording(False)  # key finally released
+    mock_deps["recorder"].stop_recording.assert_called_once()
+    mock_deps["visualizer"].set_processing_mode.assert_not_called()
+
+
+def test_no_speech_detected_cancels_processing_without_error(app, mock_deps):
+    controller = WhisperAppController()
+
+    controller.on_no_speech_detected()
+
+    mock_deps["visualizer"].cancel_processing.assert_called_once()
+    mock_deps["window"].update_log.assert_called_with("No speech detected; skipped transcription.")
+
+
 def test_on_search_complete_non_stream_uses_paced_reveal_when_realtime_disabled(app, mock_deps):
     controller = WhisperAppController()
     controller._search_stream_started = False
@@ -454,30 +551,17 @@ def test_set_clipboard_text_on_windows_does_not_fallback_to_qt_or_pyperclip(app,
     mock_pyperclip_copy.assert_not_called()
 
 
-def test_quit_application_stops_active_worker(app, mock_deps):
-    """quit_application must call quit() and wait() on an active worker thread."""
+def test_quit_application_cancels_active_worker(app, mock_deps):
+    """quit_application must cancel an in-flight pipeline and stop the engine."""
     controller = WhisperAppController()
     mock_worker = MagicMock()
-    mock_worker.wait.return_value = True
     controller.worker = mock_worker
 
     controller.quit_application()
 
-    mock_worker.quit.assert_called_once()
-    mock_worker.wait.assert_called_once()
+    mock_worker.cancel.assert_called_once()
     assert controller.worker is None
-
-
-def test_quit_application_terminates_worker_if_wait_times_out(app, mock_deps):
-    """If worker.wait() returns False (timeout), terminate() must be called."""
-    controller = WhisperAppController()
-    mock_worker = MagicMock()
-    mock_worker.wait.side_effect = [False, None]  # first wait times out, second succeeds
-    controller.worker = mock_worker
-
-    controller.quit_application()
-
-    mock_worker.terminate.assert_called_once()
+    assert not controller.engine.running
 
 
 def test_record_toggled_signal_not_connected_to_set_recording(app, mock_deps):
@@ -491,3 +575,123 @@ def test_record_toggled_signal_not_connected_to_set_recording(app, mock_deps):
             assert c.args[0] is not controller.set_recording, (
                 "record_toggled must not be connected to set_recording; use hotkeys."
             )
+
+
+def test_retry_last_dictation_reuses_job(app, mock_deps):
+    controller = WhisperAppController()
+    controller.recording_mode = "transcribe"
+    mock_deps["recorder"].is_recording = False
+
+    with patch("src.controller.TranscriptionWorker") as worker_cls, \
+         patch("src.controller.get_active_window_title", return_value="Editor"):
+        controller.retry_last_dictation()
+        worker_cls.assert_not_called()
+
+        controller.start_transcription("dummy.wav")
+        controller.retry_last_dictation()
+
+    assert worker_cls.call_count == 2
+    first, second = worker_cls.call_args_list
+    assert first == second
+    assert first.kwargs["audio_file"] == "dummy.wav"
+    assert first.kwargs["stage_cache"] is controller.stage_cache
+
+
+def test_streamed_format_chunks_are_typed_then_clipboard_restored(app, mock_deps, qtbot):
+    controller = WhisperAppController()
+
+    with patch.object(controller, "_set_clipboard_text", return_value=True) as set_clip, \
+         patch.object(controller, "_snapshot_clipboard_backup", return_value=({"text/plain": b"old"}, "old")), \
+         patch.object(controller, "_schedule_clipboard_restore") as restore, \
+         patch.object(controller, "paste_text") as paste_text, \
+         patch("src.controller.keyboard.send") as send, \
+         patch("src.controller.time.sleep") as sleep:
+        controller.on_format_chunk("First sentence. ")
+        controller.on_transcription_complete("raw", "First sentence.")
+        # The keystroke follows on a timer; the GUI thread never sleeps.
+        send.assert_not_called()
+        qtbot.waitUntil(lambda: send.called, timeout=1000)
+
+    sleep.assert_not_called()
+
+    set_clip.assert_called_once_with("First sentence. ")
+    send.assert_called_once_with("ctrl+v")
+    paste_text.assert_not_called()
+    restore.assert_called_once_with({"text/plain": b"old"}, fallback_text="old", initial_delay_ms=550)
+    assert controller._stream_paste is None
+
+
+def test_cancelling_a_streamed_paste_restores_clipboard_and_next_paste_runs(app, mock_deps, qtbot):
+    controller = WhisperAppController()
+    controller.worker = MagicMock()
+
+    with patch.object(controller, "_set_clipboard_text", return_value=True) as set_clip, \
+         patch.object(controller, "_snapshot_clipboard_backup", return_value=({"text/plain": b"old"}, "old")), \
+         patch.object(controller, "_schedule_clipboard_restore") as restore, \
+         patch.object(controller, "paste_text") as paste_text, \
+         patch.object(controller, "_position_visualizer_at_cursor"), \
+         patch("src.controller.keyboard.send") as send, \
+         patch("src.controller.time.sleep"):
+        controller.on_format_chunk("First sentence. ")
+        controller.on_format_chunk("Second sentence. ")
+        paster = controller._stream_paste
+        controller.set_recording(True, "transcribe")
+        paster._on_timer()
+        controller.on_transcription_complete("raw", "Next dictation.")
+        qtbot.wait(100)
+
+    # The staged chunk's keystroke is dropped with the job.
+    send.assert_not_called()
+
+    set_clip.assert_called_once_with("First sentence. ")
+    restore.assert_called_once_with({"text/plain": b"old"}, fallback_text="old", initial_delay_ms=550)
+    assert controller._stream_paste is None
+    paste_text.assert_called_once_with("Next dictation.")
+
+
+def test_new_recording_cancels_in_flight_job(app, mock_deps):
+    controller = WhisperAppController()
+    old_worker = MagicMock()
+    controller.worker = old_worker
+
+    with patch.object(controller, "_position_visualizer_at_cursor"):
+        controller.set_recording(True, "search")
+
+    old_worker.cancel.assert_called_once()
+    assert controller.worker is None
+
+
+def test_results_of_a_superseded_job_are_dropped(app, mock_deps):
+    controller = WhisperAppController()
+    controller.recording_mode = "transcribe"
+
+    with patch("src.controller.TranscriptionWorker") as worker_cls, \
+         patch("src.controller.get_active_window_title", return_value=""), \
+         patch.object(controller, "on_transcription_complete") as complete:
+        first, second = MagicMock(job_id=1), MagicMock(job_id=2)
+        worker_cls.side_effect = [first, second]
+        controller.start_transcription("one.wav")
+        controller.start_transcription("two.wav")
+
+        first_finished = first.finished.connect.call_args.args[0]
+        second_finished = second.finished.connect.call_args.args[0]
+        first_finished("stale", "stale")
+        second_finished("raw", "fresh")
+
+    first.cancel.assert_called_once()
+    second.cancel.assert_not_called()
+    complete.assert_called_once_with("raw", "fresh")
+
+
+def test_dismissing_a_streaming_answer_cancels_the_search(app, mock_deps):
+    controller = WhisperAppController()
+    worker = MagicMock()
+    controller.worker = worker
+    controller.stream_coalescer.push_answer(1, "pending")
+
+    mock_deps["visualizer"].answer_dismissed.connect.assert_called_once_with(controller._on_answer_dismissed)
+    controller._on_answer_dismissed()
+
+    worker.cancel.assert_called_once()
+    assert controller.worker is None
+    assert controller.stream_coalescer.stats.dropped == 1
@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock
+
+from src import prompts
+from src.format_cache import FormatCache, cache_key, prompts_version
+from src.groq_client import GroqClient
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault("version", "v1")
+    return FormatCache(tmp_path / "cache.sqlite3", **kwargs)
+
+
+def test_hit_miss_and_persistence(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get("thanks  so much", "m", "prompt") is None
+    cache.put("thanks so much", "m", "prompt", "Thanks so much!")
+    assert cache.get(" thanks so much ", "m", "prompt") == "Thanks so much!"
+    assert cache.get("thanks so much", "other-model", "prompt") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+    reopened = _cache(tmp_path)
+    assert reopened.get("thanks so much", "m", "prompt") == "Thanks so much!"
+
+
+def test_window_context_is_part_of_the_key():
+    base = "FORMAT PROMPT"
+    with_context = base + '\n\nUNTRUSTED CONTEXT ...: Active window title: "Slack".'
+    assert cache_key("hi", "m", base) != cache_key("hi", "m", with_context)
+
+
+def test_ttl_expiry(tmp_path):
+    now = [1000.0]
+    cache = _cache(tmp_path, ttl_seconds=60, clock=lambda: now[0])
+    cache.put("a", "m", "p", "A.")
+    now[0] += 61
+    assert cache.get("a", "m", "p") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_count_and_size(tmp_path):
+    now = [0.0]
+    cache = _cache(tmp_path, max_entries=2, clock=lambda: now[0])
+    for text in ("a", "b"):
+        now[0] += 1
+        cache.put(text, "m", "p", text.upper())
+    now[0] += 1
+    cache.get("a", "m", "p")
+    now[0] += 1
+    cache.put("c", "m", "p", "C")
+    assert cache.get("b", "m", "p") is None
+    assert cache.get("a", "m", "p") == "A"
+    assert cache.evictions == 1
+
+    small = FormatCache(tmp_path / "small.sqlite3", max_bytes=10, version="v1", clock=lambda: now[0])
+    now[0] += 1
+    small.put("x", "m", "p", "12345678")
+    now[0] += 1
+    small.put("y", "m", "p", "12345678")
+    assert small.get("x", "m", "p") is None and small.get("y", "m", "p") == "12345678"
+
+
+def test_prompts_change_clears_cache(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("a", "m", "p", "A.")
+    cache.close()
+    assert _cache(tmp_path, version="v2").get("a", "m", "p") is None
+
+
+def test_prompt_constant_change_clears_cache(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite3"
+    cache = FormatCache(path)
+    cache.put("a", "m", "p", "A.")
+    cache.close()
+    assert FormatCache(path).get("a", "m", "p") == "A."
+
+    before = prompts_version()
+    monkeypatch.setattr(prompts, "SYSTEM_PROMPT_DEFAULT", prompts.SYSTEM_PROMPT_DEFAULT + " Be brief.")
+    assert prompts_version() != before
+    assert FormatCache(path).get("a", "m", "p") is None
+
+
+def test_groq_client_serves_repeats_from_cache(tmp_path):
+    client = GroqClient(None, format_cache=_cache(tmp_path))
+    client.client = MagicMock()
+    completion = client.client.chat.completions.create.return_value
+    completion.choices[0].message.content = "Best regards."
+
+    assert client.format_text("best regards", "m", "prompt") == "Best regards."
+    assert client.format_text("best regards", "m", "prompt") == "Best regards."
+    assert list(client.format_text_stream("best regards", "m", "prompt")) == ["Best regards."]
+    client.client.chat.completions.create.assert_called_once()
+    assert client.format_cache.hits == 2
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from src.gemini_client import GeminiClient, GeminiClientError
+from src.gemini_client import GeminiClient, GeminiClientError, SearchChunk
 
 
 class _FakeGenerateContentConfig:
@@ -221,6 +221,64 @@ def test_run_search_separates_thought_parts_from_answer_stream(fake_sdk_modules)
     assert thoughts == ["I will check the facts. "]
 
 
+def test_search_stream_yields_chunks_and_run_search_reports_deltas(fake_sdk_modules):
+    fake_genai, fake_types = fake_sdk_modules
+    sdk_client = fake_genai.Client.return_value
+    thought = pytypes.SimpleNamespace(
+        text=None,
+        candidates=[pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(
+            parts=[pytypes.SimpleNamespace(text="Thinking. ", thought=True)],
+        ))],
+    )
+    sdk_client.models.generate_content_stream.side_effect = lambda **_: iter([
+        thought,
+        pytypes.SimpleNamespace(text="Hello"),
+        pytypes.SimpleNamespace(text=" world"),
+    ])
+
+    class ClientUnderTest(GeminiClient):
+        def _load_sdk_modules(self):
+            return fake_genai, fake_types
+
+    client = ClientUnderTest(api_key="gem-key")
+
+    assert list(client.search_stream("q", "models/x")) == [
+        SearchChunk("Thinking. ", thought=True),
+        SearchChunk("Hello"),
+        SearchChunk(" world"),
+    ]
+    deltas = []
+    assert client.run_search("q", "models/x", delta_callback=deltas.append) == "Hello world"
+    assert deltas == ["Hello", " world"]
+
+
+def test_cancelling_a_search_closes_the_stream(fake_sdk_modules):
+    from src.cancellation import CancelToken
+
+    fake_genai, fake_types = fake_sdk_modules
+    closed = []
+
+    def stream(**_):
+        try:
+            yield pytypes.SimpleNamespace(text="Hello")
+            yield pytypes.SimpleNamespace(text=" world")
+        finally:
+            closed.append(True)
+
+    fake_genai.Client.return_value.models.generate_content_stream.side_effect = stream
+
+    class ClientUnderTest(GeminiClient):
+        def _load_sdk_modules(self):
+            return fake_genai, fake_types
+
+    client = ClientUnderTest(api_key="gem-key")
+    token = CancelToken()
+
+    with pytest.raises(GeminiClientError, match="cancelled"):
+        client.run_search("q", "models/x", delta_callback=lambda _delta: token.cancel(), cancel_token=token)
+    assert closed == [True]
+
+
 def test_run_search_includes_inline_image_bytes(fake_sdk_modules):
     fake_genai, fake_types = fake_sdk_modules
     sdk_client = fake_genai.Client.return_value
@@ -122,3 +122,40 @@ def test_run_search_is_stateless(mock_groq_package):
     msgs = kwargs["messages"]
     assert msgs[0]["role"] == "system"
     assert msgs[1] == {"role": "user", "content": "new question"}
+
+def test_cancelled_format_stream_closes_and_skips_further_requests(mock_groq_package):
+    from src.cancellation import CancelToken
+
+    client = GroqClient("key")
+    stream = MagicMock()
+    chunks = [MagicMock(), MagicMock()]
+    chunks[0].choices[0].delta.content = "Hello"
+    chunks[1].choices[0].delta.content = " world"
+    stream.__enter__.return_value = stream
+    stream.__iter__.return_value = iter(chunks)
+    create = mock_groq_package.return_value.chat.completions.create
+    create.return_value = stream
+    token = CancelToken()
+
+    deltas = client.format_text_stream("hello world", cancel_token=token)
+    assert next(deltas) == "Hello"
+    token.cancel()
+    with pytest.raises(GroqClientError, match="cancelled"):
+        next(deltas)
+    stream.__exit__.assert_called_once()
+
+    with pytest.raises(GroqClientError, match="cancelled"):
+        client.format_text("hello again", cancel_token=token)
+    assert create.call_count == 1
+
+
+def test_cancelled_transcription_sends_nothing(mock_groq_package):
+    from src.cancellation import CancelToken
+
+    client = GroqClient("key")
+    token = CancelToken()
+    token.cancel()
+    with patch("builtins.open", mock_open(read_data=b"audio")):
+        with pytest.raises(GroqClientError, match="cancelled"):
+            client.transcribe("dummy.wav", cancel_token=token)
+    mock_groq_package.return_value.audio.transcriptions.create.assert_not_called()
@@ -0,0 +1,143 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.gemini_client import GeminiClient
+from src.groq_client import GroqClient
+from src.http_transport import GEMINI_BASE_URL, ConnectionManager, origin_of
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, body=b""):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.server.methods.append("HEAD")
+        self._reply()
+
+    def do_GET(self):
+        self.server.methods.append("GET")
+        self._reply(b"x" * 64 * 1024)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.connections = 0
+    httpd.methods = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_origin_of():
+    assert origin_of("https://api.groq.com/openai/v1/models") == "https://api.groq.com"
+
+
+def test_clients_share_one_pool(server):
+    httpd, url = server
+    manager = ConnectionManager(http2=False)
+    first, second = manager.http_client(), manager.http_client()
+    try:
+        assert first.get(f"{url}/a").status_code == 200
+        second.close()  # one SDK closing its client must not drop the pool
+        assert first.get(f"{url}/b").status_code == 200
+        assert manager.http_client().get(f"{url}/c").status_code == 200
+    finally:
+        manager.close()
+    assert httpd.connections == 1
+    assert (manager.stats.cold, manager.stats.warm) == (1, 2)
+
+
+def test_warm_opens_connection_before_first_request(server):
+    httpd, url = server
+    manager = ConnectionManager(http2=False)
+    manager.register(f"{url}/openai/v1")
+    try:
+        manager.warm()
+        manager.wait_warm(5.0)
+        assert httpd.methods == ["HEAD"]
+        manager.warm()  # used recently: nothing to do
+        manager.wait_warm(5.0)
+        assert httpd.methods == ["HEAD"]
+
+        manager.http_client().get(f"{url}/openai/v1/models")
+    finally:
+        manager.close()
+    assert httpd.connections == 1
+    assert manager.stats.warm == 1  # the real request reused the warmed connection
+
+
+def test_idle_pool_expires_and_next_request_is_cold(server):
+    httpd, url = server
+    manager = ConnectionManager(idle_expiry_seconds=60, http2=False)
+    client = manager.http_client()
+    try:
+        client.get(f"{url}/a")
+        assert manager.expire_idle() is False
+        assert manager.is_open
+        assert manager.expire_idle(now=manager._last_activity + 61) is True
+        assert not manager.is_open
+        client.get(f"{url}/b")
+    finally:
+        manager.close()
+    assert httpd.connections == 2
+    assert manager.stats.cold == 2
+
+
+def test_streaming_response_holds_pool_open_until_closed(server):
+    _httpd, url = server
+    manager = ConnectionManager(idle_expiry_seconds=60, http2=False)
+    client = manager.http_client()
+    try:
+        with client.stream("GET", f"{url}/stream") as response:
+            assert manager.expire_idle(now=manager._last_activity + 61) is False
+            assert sum(len(chunk) for chunk in response.iter_bytes()) == 64 * 1024
+        assert manager.expire_idle(now=manager._last_activity + 61) is True
+    finally:
+        manager.close()
+
+
+def test_groq_client_uses_shared_pool():
+    manager = MagicMock()
+    with patch("src.groq_client.Groq") as groq_cls:
+        groq_cls.return_value.base_url = "https://api.groq.com/openai/v1/"
+        GroqClient("key", connections=manager)
+    groq_cls.assert_called_once_with(api_key="key", http_client=manager.http_client.return_value)
+    manager.register.assert_called_once_with("https://api.groq.com/openai/v1/")
+
+
+def test_gemini_client_uses_shared_pool():
+    manager = MagicMock()
+    genai = MagicMock()
+    types_mod = MagicMock()
+
+    class ClientUnderTest(GeminiClient):
+        def _load_sdk_modules(self):
+            return genai, types_mod
+
+    ClientUnderTest("gem-key", connections=manager)
+    types_mod.HttpOptions.assert_called_once_with(
+        httpx_client=manager.http_client.return_value,
+        httpx_async_client=manager.async_http_client.return_value,
+    )
+    genai.Client.assert_called_once_with(api_key="gem-key", http_options=types_mod.HttpOptions.return_value)
+    manager.register.assert_called_once_with(GEMINI_BASE_URL)
@@ -92,9 +92,10 @@ class TestIntegration(unittest.TestCase):
             model_id="models/gemma-4-31b-it",
             system_prompt=worker._system_prompt_for_request(),
             image_bytes=None,
-            stream_callback=worker._emit_stream_text,
             thought_callback=worker._emit_thought_text,
             with_search=True,
+            delta_callback=worker._emit_stream_delta,
+            cancel_token=worker.cancel_token,
         )
 
         # Verify signal emission
@@ -130,9 +131,10 @@ class TestIntegration(unittest.TestCase):
             model_id="models/gemma-4-31b-it",
             system_prompt=worker._system_prompt_for_request(),
             image_bytes=None,
-            stream_callback=worker._emit_stream_text,
             thought_callback=worker._emit_thought_text,
             with_search=True,
+            delta_callback=worker._emit_stream_delta,
+            cancel_token=worker.cancel_token,
         )
         result_signal.assert_called_once_with("Quixotic means extremely idealistic.")
         error_signal.assert_not_called()
@@ -224,9 +226,10 @@ class TestIntegration(unittest.TestCase):
             model_id="models/gemma-4-31b-it",
             system_prompt=worker._system_prompt_for_request(),
             image_bytes=None,
-            stream_callback=worker._emit_stream_text,
             thought_callback=worker._emit_thought_text,
             with_search=True,
+            delta_callback=worker._emit_stream_delta,
+            cancel_token=worker.cancel_token,
         )
         result_signal.assert_called_once_with("DNS maps names to IP addresses.")
         error_signal.assert_not_called()
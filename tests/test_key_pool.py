@@ -0,0 +1,169 @@
+import asyncio
+import io
+import types as pytypes
+from collections import defaultdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.gemini_client import GeminiClient
+from src.groq_client import GroqClient, GroqClientError
+from src.key_pool import KeyPool, call_with_failover, failover_reason, mask_key
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = pytypes.SimpleNamespace(headers=headers)
+
+
+def _clients_by_key(mock_class):
+    clients = defaultdict(MagicMock)
+
+    def build(api_key, **_):
+        return clients[api_key]
+
+    mock_class.side_effect = build
+    return clients
+
+
+def test_spreads_requests_until_a_key_is_throttled():
+    clock = _FakeClock()
+    pool = KeyPool(["a", "b", "c"], cooldown_seconds=30, clock=clock)
+    assert [pool.choose() for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+
+    pool.record_failure("a", "quota")
+    assert "a" not in {pool.choose() for _ in range(4)}
+    clock.now += 31
+    pool.record_failure("b", "quota")
+    # c was never throttled; a recovered and was throttled before b.
+    assert pool.choose() == "c"
+    assert pool.choose(exclude=["c"]) == "a"
+
+
+def test_cooldowns_for_quota_and_auth_failures():
+    clock = _FakeClock()
+    pool = KeyPool(["a", "b"], cooldown_seconds=10, auth_cooldown_seconds=600, clock=clock)
+    pool.record_failure("a", "quota", retry_after=45)
+    pool.record_failure("b", "auth")
+
+    # Everything is cooling down: the key that recovers first still goes out.
+    assert pool.choose() == "a"
+    usage = {item["key"]: item for item in pool.usage()}
+    assert usage["…a"]["cooling_down_seconds"] == 45
+    assert (usage["…b"]["last_error"], usage["…b"]["throttled"]) == ("auth", 0)
+
+    pool.record_success("b")
+    assert pool.choose() == "b"
+
+
+def test_failover_classification_and_masking():
+    assert failover_reason(_StatusError(401)) == "auth"
+    assert failover_reason(_StatusError(403)) == "auth"
+    assert failover_reason(_StatusError(429)) == "quota"
+    assert failover_reason(_StatusError(500)) is None
+    assert failover_reason(pytypes.SimpleNamespace(code=429)) == "quota"
+    assert mask_key("gsk_abcdefghijkl") == "gsk_…ijkl"
+
+
+def test_call_with_failover_stops_after_every_key_failed():
+    pool = KeyPool(["a", "b"])
+    calls = []
+
+    def call(key):
+        calls.append(key)
+        raise _StatusError(429)
+
+    with pytest.raises(_StatusError):
+        call_with_failover(pool, call)
+    assert calls == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        call_with_failover(pool, lambda key: (_ for _ in ()).throw(ValueError("not a key problem")))
+    assert sum(item["failures"] for item in pool.usage()) == 2
+
+
+def test_groq_client_fails_over_to_next_key():
+    with patch("src.groq_client.Groq") as groq_class:
+        clients = _clients_by_key(groq_class)
+        client = GroqClient("key-one", extra_keys=["key-two"])
+        clients["key-one"].chat.completions.create.side_effect = _StatusError(429, retry_after="20")
+        clients["key-one"].audio.transcriptions.create.side_effect = _StatusError(401)
+
+        assert client.format_text("hello").startswith("<MagicMock")
+        clients["key-two"].chat.completions.create.assert_called_once()
+
+        clients["key-two"].audio.transcriptions.create.return_value.text = "hello world"
+        audio = io.BytesIO(b"RIFF....")
+        assert client.transcribe(audio) == "hello world"
+        # key-one is cooling down, so the upload went straight to key-two.
+        clients["key-one"].audio.transcriptions.create.assert_not_called()
+
+    usage = client.pool.usage()
+    assert [item["throttled"] for item in usage] == [1, 0]
+    assert "key-two" not in client.pool.summary()
+
+
+def test_groq_client_raises_when_all_keys_are_rejected():
+    with patch("src.groq_client.Groq") as groq_class:
+        clients = _clients_by_key(groq_class)
+        client = GroqClient("key-one", extra_keys=["key-two"])
+        for sdk_client in (clients["key-one"], clients["key-two"]):
+            sdk_client.chat.completions.create.side_effect = _StatusError(401)
+
+        with pytest.raises(GroqClientError):
+            client.format_text("hello")
+
+
+def test_update_api_key_keeps_extra_keys():
+    with patch("src.groq_client.Groq"):
+        client = GroqClient("key-one", extra_keys=["key-two"])
+        client.update_api_key("key-new")
+        assert client.pool.keys == ["key-new", "key-two"]
+        client.update_api_key("key-new", extra_keys=[])
+        assert client.pool.keys == ["key-new"]
+
+
+def test_gemini_search_fails_over_to_next_key():
+    fake_genai = pytypes.SimpleNamespace(Client=MagicMock())
+    fake_types = pytypes.SimpleNamespace(
+        GenerateContentConfig=lambda **kwargs: kwargs,
+        ThinkingConfig=lambda **kwargs: kwargs,
+        Tool=lambda **kwargs: kwargs,
+        GoogleSearch=lambda: None,
+    )
+    clients = _clients_by_key(fake_genai.Client)
+
+    class ClientUnderTest(GeminiClient):
+        def _load_sdk_modules(self):
+            return fake_genai, fake_types
+
+    client = ClientUnderTest("gem-one", extra_keys=["gem-two"])
+    clients["gem-one"].models.generate_content_stream.side_effect = _StatusError(429)
+    clients["gem-two"].models.generate_content_stream.return_value = [pytypes.SimpleNamespace(text="answer")]
+    streamed = []
+
+    assert client.run_search("q", "models/x", stream_callback=streamed.append) == "answer"
+    assert streamed == ["answer"]
+
+    async def search_async():
+        stream = MagicMock()
+        stream.__aiter__.return_value = [pytypes.SimpleNamespace(text="again")]
+
+        async def open_stream(**_):
+            return stream
+
+        clients["gem-two"].aio.models.generate_content_stream = open_stream
+        return await client.run_search_async("q", "models/x")
+
+    assert asyncio.run(search_async()) == "again"
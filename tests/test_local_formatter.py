@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.groq_client import GroqClient
+from src.local_formatter import LocalFormatter, format_locally, llm_needed
+from src.services.groq_service import TranscriptionWorker
+
+CORPUS = json.loads((Path(__file__).parent / "formatter_parity_corpus.json").read_text(encoding="utf-8"))
+
+
+def test_local_output_matches_llm_whenever_llm_is_skipped():
+    local_cases = [case for case in CORPUS if llm_needed(case["raw"]) is None]
+    for case in local_cases:
+        assert format_locally(case["raw"]) == case["llm"], case["raw"]
+    # The fast path has to be worth having on ordinary dictation.
+    assert len(local_cases) >= len(CORPUS) // 2
+
+
+def test_classifier_routes_restructuring_to_llm():
+    assert llm_needed("Um, so I was thinking we could, uh, push the release.") == "fillers"
+    assert llm_needed("Send it to Mark, no wait, send it to Sarah.") == "self-correction"
+    assert llm_needed("Groceries bullet point milk bullet point eggs") == "structure"
+    assert llm_needed("x plus 1 whole square equals 4") == "math"
+    assert llm_needed("the the meeting is at noon") == "repetition"
+    assert llm_needed("word " * 50) == "long"
+    assert llm_needed("Sounds good, see you tomorrow.") is None
+
+
+def test_worker_skips_llm_and_reports_savings():
+    client = MagicMock(spec=GroqClient)
+    client.format_text.return_value = "Formatted by LLM."
+    local = LocalFormatter()
+
+    def run(raw):
+        client.transcribe.return_value = raw
+        worker = TranscriptionWorker(client, "a.wav", True, "fmt", local_formatter=local)
+        results = []
+        worker.finished.connect(lambda _raw, final: results.append(final))
+        worker.run()
+        return results[0]
+
+    assert run("Um, like, the thing is broken") == "Formatted by LLM."
+    assert run("ok thanks") == "Ok thanks."
+    client.format_text.assert_called_once()
+    assert (local.stats.dictations, local.stats.local, local.stats.llm_calls) == (2, 1, 1)
+    assert local.stats.local_fraction == 0.5
+    assert local.stats.saved_seconds >= 0.0
+    assert "1/2 dictations formatted locally (50%)" in local.stats.summary()
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.audio_encoding import WavStreamEncoder
+from src.groq_client import GroqClient
+from src.http_transport import ConnectionManager, _AsyncSharedTransport
+from src.pipeline_engine import PipelineEngine, call_stage
+from src.segmented_transcription import SegmentedTranscriber
+from src.services.groq_service import PipelineJob, SearchWorker, TranscriptionWorker
+
+
+class _AsyncClient:
+    """Sync and async transcribe/format surface with a per-call delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.threads = set()
+        self.active = 0
+        self.peak = 0
+
+    def transcribe(self, audio, prompt=None, cancel_token=None):
+        raise AssertionError("sync path used on the engine")
+
+    async def transcribe_async(self, audio, prompt=None, cancel_token=None):
+        self.threads.add(threading.current_thread().name)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return "raw text"
+
+    async def format_text_async(self, raw_text, model_id, prompt=None, cancel_token=None):
+        return raw_text.upper()
+
+
+@pytest.fixture
+def engine():
+    engine = PipelineEngine()
+    yield engine
+    engine.stop()
+
+
+def test_worker_runs_on_engine_and_delivers_on_gui_thread(qtbot, engine):
+    client = _AsyncClient()
+    worker = TranscriptionWorker(client, "audio.wav", True, "fmt-model", engine=engine)
+    received = []
+    worker.finished.connect(lambda raw, final: received.append((raw, final, threading.current_thread())))
+
+    with qtbot.waitSignal(worker.finished, timeout=2000):
+        worker.start()
+
+    assert received == [("raw text", "RAW TEXT", threading.main_thread())]
+    assert client.threads == {"api-pipeline"}
+
+
+def test_cancelled_worker_emits_nothing(qtbot, engine):
+    client = _AsyncClient(delay=5.0)
+    worker = TranscriptionWorker(client, "audio.wav", False, "fmt-model", engine=engine)
+    received = []
+    worker.finished.connect(lambda *args: received.append(args))
+    worker.error.connect(lambda *args: received.append(args))
+
+    worker.start()
+    qtbot.waitUntil(lambda: client.active == 1, timeout=2000)
+    worker.cancel()
+    qtbot.waitUntil(lambda: client.active == 0, timeout=2000)
+    qtbot.wait(50)
+
+    assert received == []
+    assert not worker.is_running()
+
+
+def test_job_cancelled_between_stages_reports_no_error():
+    client = MagicMock()
+    worker = TranscriptionWorker(client, "audio.wav", True, "fmt-model")
+    client.transcribe.side_effect = lambda *args, **kwargs: worker.cancel() or "raw text"
+    received = []
+    worker.finished.connect(lambda *args: received.append(args))
+    worker.error.connect(lambda *args: received.append(args))
+
+    worker.run()
+
+    client.format_text.assert_not_called()
+    assert client.transcribe.call_args.kwargs["cancel_token"] is worker.cancel_token
+    assert received == []
+    assert worker.cancel_token.cancelled
+
+
+def test_pipeline_job_requires_a_pipeline(qtbot):
+    with pytest.raises(TypeError):
+        PipelineJob()
+
+
+def test_search_worker_streams_through_bridge(qtbot, engine):
+    gemini = MagicMock()
+
+    async def run_search_async(query, delta_callback=None, **kwargs):
+        delta_callback("Par")
+        delta_callback("tial")
+        return "Partial answer"
+
+    gemini.run_search_async = run_search_async
+    worker = SearchWorker(MagicMock(), None, gemini_client=gemini, query_text="q", engine=engine)
+    streamed = []
+    worker.stream_delta.connect(lambda seq, delta: streamed.append((seq, delta)))
+
+    with qtbot.waitSignal(worker.finished, timeout=2000) as blocker:
+        worker.start()
+
+    assert blocker.args == ["Partial answer"]
+    assert streamed == [(1, "Par"), (2, "tial")]
+    assert worker.stream_snapshot() == (2, "Partial")
+
+
+def test_segments_upload_concurrently_on_one_loop(engine):
+    client = _AsyncClient(delay=0.2)
+    encoder = WavStreamEncoder(16000, initial_seconds=4)
+    encoder.write((np.sin(np.arange(16000 * 4) * 0.05) * 8000).astype(np.int16))
+    audio = encoder.finalize()
+    transcriber = SegmentedTranscriber(client, max_segment_seconds=1.0, concurrency=4, overlap_seconds=0.0)
+
+    text = engine.submit(transcriber.transcribe_async(audio)).result(timeout=5)
+
+    assert text.startswith("raw text")
+    assert client.peak > 1
+
+
+def test_call_stage_falls_back_to_sync_off_the_loop(engine):
+    sync_only = MagicMock(spec=["transcribe"])
+    sync_only.transcribe.side_effect = lambda audio, prompt=None: threading.current_thread().name
+
+    name = engine.submit(call_stage(sync_only, "transcribe", "a.wav", prompt="p")).result(timeout=2)
+
+    assert name != "api-pipeline"
+    sync_only.transcribe.assert_called_once_with("a.wav", prompt="p")
+
+
+def test_groq_client_async_uses_shared_async_pool():
+    manager = ConnectionManager(http2=False)
+    client = GroqClient("key", connections=manager)
+    async_client = client._async()
+    assert async_client is client._async()
+    assert isinstance(async_client._client._transport, _AsyncSharedTransport)
+    client.update_api_key("other")
+    assert client._async() is not async_client
+    manager.close()
+
+
+def test_stop_cancels_pending_tasks():
+    engine = PipelineEngine()
+    future = engine.submit(asyncio.sleep(10))
+    engine.stop()
+    assert future.cancelled()
+    assert not engine.running
@@ -0,0 +1,82 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from scripts.load_test import run_load_test
+from scripts.provider_simulator import ProviderSimulator, SimulatorProfile
+from src.audio_encoding import WavStreamEncoder
+from src.gemini_client import GeminiClient, GeminiClientError
+from src.groq_client import GroqClient, GroqClientError
+from src.request_policy import RequestPolicy
+
+FAST = dict(transcribe_ms=20, chat_ms=10, gemini_ms=10, jitter_ms=2, chunk_interval_ms=2, chunk_jitter_ms=0)
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    def start(**overrides):
+        sim = ProviderSimulator(SimulatorProfile(**dict(FAST, seed=7, **overrides))).start()
+        for name, value in sim.environment().items():
+            monkeypatch.setenv(name, value)
+        started.append(sim)
+        return sim
+
+    started = []
+    yield start
+    for sim in started:
+        sim.stop()
+
+
+def _recording():
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.arange(1600, dtype=np.int16))
+    return encoder.finalize()
+
+
+def test_real_sdk_clients_run_against_the_simulator(simulator):
+    sim = simulator(chunks=3)
+    groq = GroqClient("any-key")
+    gemini = GeminiClient("any-key")
+
+    assert groq.transcribe(_recording()).startswith("simulated dictation of")
+    assert groq.format_text("hello there") == "Hello there."
+    assert list(groq.format_text_stream("one two three four")) == ["One two", " three four."]
+    assert "whisper-large-v3" in groq.list_models()[0]
+
+    thoughts, streamed = [], []
+    answer = gemini.run_search("what is new", "models/gemini-sim",
+                               stream_callback=streamed.append, thought_callback=thoughts.append)
+    assert answer == "Simulated answer to: What is new."
+    assert thoughts == ["Considering the question."]
+    assert len(streamed) == 3 and streamed[-1] == answer
+    assert asyncio.run(gemini.run_search_async("again", "models/gemini-sim")).endswith("Again.")
+    assert "models/gemini-sim" in gemini.list_models()
+    assert sim.stats["gemini_streams"] == 2
+
+
+def test_injected_faults_reach_the_clients(simulator):
+    sim = simulator(rate_429=1.0, retry_after_seconds=0.1)
+    with pytest.raises(GroqClientError, match="429"):
+        GroqClient("any-key", policy=RequestPolicy(max_attempts=1)).format_text("hi")
+    with pytest.raises(GeminiClientError, match="429"):
+        GeminiClient("any-key").run_search("q", "models/gemini-sim")
+    assert sim.stats["injected_429"] == 2
+
+
+def test_stalled_stream_is_cut_by_the_request_timeout(simulator):
+    simulator(stall_rate=1.0, stall_seconds=5)
+    client = GroqClient("any-key", policy=RequestPolicy(timeout_seconds=0.5, max_attempts=1))
+    with pytest.raises(GroqClientError):
+        client.transcribe(_recording())
+
+
+def test_load_test_runs_concurrent_dictations_and_searches():
+    report = run_load_test(
+        dictations=6, searches=2, profile=SimulatorProfile(**dict(FAST, seed=3)),
+        recording_seconds=0.5, deadline_seconds=30,
+    )
+    assert report["completed"] == 8
+    assert (report["errors"], report["timed_out"]) == ([], 0)
+    assert report["dictation"]["count"] == 6 and report["search"]["count"] == 2
+    assert report["simulator"]["groq_transcriptions"] == 8
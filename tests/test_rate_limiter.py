@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.rate_limiter import BACKGROUND, INTERACTIVE, RateLimitScheduler, TokenBucket, parse_reset
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _headers(resource, limit, remaining, reset):
+    return {
+        f"x-ratelimit-limit-{resource}": str(limit),
+        f"x-ratelimit-remaining-{resource}": str(remaining),
+        f"x-ratelimit-reset-{resource}": reset,
+    }
+
+
+def test_parse_reset_formats():
+    assert parse_reset("7.66s") == pytest.approx(7.66)
+    assert parse_reset("2m59.56s") == pytest.approx(179.56)
+    assert parse_reset("120ms") == pytest.approx(0.12)
+    assert parse_reset("1h") == pytest.approx(3600)
+    assert parse_reset("3") == 3.0
+    assert parse_reset("") is None
+    assert parse_reset("soon") is None
+
+
+def test_bucket_refills_at_the_rate_the_server_reports():
+    bucket = TokenBucket(100, 0.0, now=0.0)
+    bucket.sync(limit=100, remaining=10, reset_seconds=9.0, now=0.0)
+    assert bucket.refill_per_second == pytest.approx(10.0)
+    assert bucket.wait_for(30, now=0.0) == pytest.approx(2.0)
+    assert bucket.wait_for(30, now=2.0) == 0.0
+    bucket.take(30, now=2.0)
+    assert bucket.level == pytest.approx(0.0)
+
+
+def test_headers_create_one_bucket_per_resource():
+    clock = _FakeClock()
+    scheduler = RateLimitScheduler(clock=clock)
+    headers = _headers("requests", 14400, 14000, "2m59.56s")
+    headers.update(_headers("tokens", 6000, 1500, "45s"))
+    headers.update(_headers("audio-seconds", 7200, 7000, "1m"))
+    headers["x-request-id"] = "req_1"
+    scheduler.observe(headers)
+
+    headroom = scheduler.headroom()
+    assert set(headroom) == {"requests", "tokens", "audio_seconds"}
+    assert headroom["tokens"] == {"remaining": 1500.0, "limit": 6000.0, "fraction": 0.25}
+
+
+def test_acquire_waits_for_tokens_to_refill():
+    clock = _FakeClock()
+    scheduler = RateLimitScheduler(clock=clock)
+    scheduler.observe(_headers("tokens", 6000, 100, "59s"))  # refills 100 tokens/s
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.rate_limiter.time.sleep", fake_sleep)
+        waited = scheduler.acquire({"requests": 1, "tokens": 300})
+
+    assert waited == pytest.approx(2.0)
+    assert sum(sleeps) == pytest.approx(2.0)
+    assert (scheduler.waits, scheduler.headroom()["tokens"]["remaining"]) == (1, 0.0)
+
+
+def test_wait_is_capped_then_the_request_goes_out():
+    clock = _FakeClock()
+    scheduler = RateLimitScheduler(max_wait_seconds=1.0, clock=clock)
+    scheduler.observe(_headers("tokens", 6000, 0, "1h"))
+
+    def fake_sleep(seconds):
+        clock.now += seconds
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.rate_limiter.time.sleep", fake_sleep)
+        assert scheduler.acquire({"tokens": 1000}) == pytest.approx(1.0)
+
+
+def test_retry_after_holds_every_request():
+    clock = _FakeClock()
+    scheduler = RateLimitScheduler(clock=clock)
+    scheduler.observe({"retry-after": "3"}, status_code=429)
+    assert scheduler.rate_limited == 1
+    assert scheduler.blocked_seconds() == pytest.approx(3.0)
+    clock.now += 3
+    assert scheduler.blocked_seconds() == 0.0
+    # retry-after on a success is informational only.
+    scheduler.observe({"retry-after": "5"}, status_code=200)
+    assert scheduler.blocked_seconds() == 0.0
+
+
+def test_background_keeps_a_reserve_for_dictation():
+    clock = _FakeClock()
+    scheduler = RateLimitScheduler(background_reserve=0.2, clock=clock)
+    scheduler.observe(_headers("requests", 100, 15, "85s"))  # refills 1 request/s
+
+    assert scheduler._delay({"requests": 1}, INTERACTIVE, clock.now) == 0.0
+    assert scheduler._delay({"requests": 1}, BACKGROUND, clock.now) == pytest.approx(6.0)
+
+
+def test_background_yields_to_waiting_interactive_request():
+    scheduler = RateLimitScheduler(max_wait_seconds=2.0)
+    scheduler.observe({"retry-after": "0.3"}, status_code=429)
+    order = []
+
+    def interactive():
+        scheduler.acquire({"requests": 1}, INTERACTIVE)
+        order.append("interactive")
+
+    thread = threading.Thread(target=interactive)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.acquire({"requests": 1}, BACKGROUND)
+    order.append("background")
+    thread.join()
+
+    assert order == ["interactive", "background"]
+
+
+def test_acquire_async_waits_on_the_loop():
+    scheduler = RateLimitScheduler()
+    scheduler.observe({"retry-after": "0.2"}, status_code=429)
+
+    waited = asyncio.run(scheduler.acquire_async({"requests": 1}))
+
+    assert waited >= 0.19
+    assert "1 requests held" in scheduler.summary()
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.audio_encoding import WavStreamEncoder
+from src.groq_client import GroqClient, GroqClientError
+from src.rate_limiter import RateLimitScheduler
+from src.request_policy import AttemptTimeout, RequestPolicy, is_retryable
+
+
+class _StubGroqHandler(BaseHTTPRequestHandler):
+    """Groq-shaped endpoints that play back a script of injected faults."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.server.lock:
+            self.server.bodies.append(body)
+            action = self.server.script.pop(0) if self.server.script else ("ok",)
+        if action[0] == "delay":
+            time.sleep(action[1])
+        if action[0] == "status":
+            headers = action[2] if len(action) > 2 else {}
+            return self._send(action[1], {"error": {"message": f"injected {action[1]}"}}, headers)
+        if self.path.endswith("/audio/transcriptions"):
+            return self._send(200, {"text": "hello world"})
+        if json.loads(body).get("stream"):
+            return self._send_events(["Format", "ted."])
+        return self._send(200, {
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Formatted."}}],
+        })
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass  # client gave up on this attempt
+
+    def _send_events(self, deltas):
+        events = [
+            {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "stub",
+             "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+            for delta in deltas
+        ]
+        data = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubGroqHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.script = []
+    httpd.bodies = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("GROQ_BASE_URL", f"http://127.0.0.1:{httpd.server_address[1]}")
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("backoff_base_seconds", 0.01)
+    return RequestPolicy(**kwargs)
+
+
+def _recording():
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.arange(1600, dtype=np.int16))
+    return encoder.finalize()
+
+
+def test_transient_5xx_is_retried_with_full_upload(stub_server):
+    stub_server.script = [("status", 503)]
+    policy = _policy()
+    client = GroqClient("key", policy=policy)
+
+    assert client.transcribe(_recording()) == "hello world"
+
+    assert len(stub_server.bodies) == 2
+    assert len(stub_server.bodies[0]) == len(stub_server.bodies[1])
+    assert (policy.stats.attempts, policy.stats.retries) == (2, 1)
+
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.script = [("status", 400)]
+    policy = _policy()
+    client = GroqClient("key", policy=policy)
+
+    with pytest.raises(GroqClientError):
+        client.transcribe(_recording())
+    assert len(stub_server.bodies) == 1
+    assert policy.stats.retries == 0
+
+
+def test_gives_up_after_max_attempts(stub_server):
+    stub_server.script = [("status", 502)] * 5
+    client = GroqClient("key", policy=_policy(max_attempts=3))
+
+    with pytest.raises(GroqClientError):
+        client.transcribe(_recording())
+    assert len(stub_server.bodies) == 3
+
+
+def test_stalled_attempt_times_out_and_retries(stub_server):
+    stub_server.script = [("delay", 2.0)]
+    policy = _policy(timeout_seconds=0.3)
+    client = GroqClient("key", policy=policy)
+
+    started = time.monotonic()
+    assert client.transcribe(_recording()) == "hello world"
+    assert time.monotonic() - started < 1.5
+    assert policy.stats.retries == 1
+
+
+def test_hedge_wins_when_first_attempt_is_slow(stub_server):
+    stub_server.script = [("delay", 2.0)]
+    policy = _policy(hedge=True, hedge_min_samples=10)
+    for _ in range(10):
+        policy.latency("transcription").record(0.05)
+    client = GroqClient("key", policy=policy)
+
+    started = time.monotonic()
+    assert client.transcribe(_recording()) == "hello world"
+    assert time.monotonic() - started < 1.0
+    assert (policy.stats.hedges, policy.stats.hedges_won, policy.stats.retries) == (1, 1, 0)
+    assert len(stub_server.bodies[0]) == len(stub_server.bodies[1])
+
+
+def test_losing_hedge_response_is_closed(stub_server):
+    from src.http_transport import ConnectionManager
+
+    stub_server.script = [("delay", 0.8)]
+    policy = _policy(hedge=True, hedge_min_samples=10)
+    for _ in range(10):
+        # Late enough that the first copy reached the server before the hedge.
+        policy.latency("format_stream").record(0.2)
+    manager = ConnectionManager(idle_expiry_seconds=60, http2=False)
+    client = GroqClient("key", policy=policy, connections=manager)
+    try:
+        assert list(client.format_text_stream("raw text")) == ["Format", "ted."]
+        assert policy.stats.hedges_won == 1
+        # The slow copy's stream arrives later on its worker thread, unread.
+        deadline = time.monotonic() + 3
+        while manager._in_flight and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert manager._in_flight == 0
+    finally:
+        manager.close()
+
+
+def test_format_text_honours_retry_after(stub_server):
+    stub_server.script = [("status", 429, {"Retry-After": "0.2"})]
+    policy = _policy()
+    client = GroqClient("key", policy=policy)
+
+    started = time.monotonic()
+    assert client.format_text("raw text") == "Formatted."
+    assert time.monotonic() - started >= 0.2
+    assert policy.stats.retries == 1
+
+
+def test_async_transcribe_retries_and_cancels_stalled_attempt(stub_server):
+    stub_server.script = [("delay", 2.0), ("status", 503)]
+    policy = _policy(timeout_seconds=0.3)
+    client = GroqClient("key", policy=policy)
+
+    started = time.monotonic()
+    assert asyncio.run(client.transcribe_async(_recording())) == "hello world"
+    assert time.monotonic() - started < 1.5
+    assert (policy.stats.attempts, policy.stats.timeouts, policy.stats.retries) == (3, 1, 2)
+
+
+def test_format_text_stream_retries_opening_the_stream(stub_server):
+    stub_server.script = [("status", 503)]
+    policy = _policy()
+    client = GroqClient("key", policy=policy)
+
+    assert list(client.format_text_stream("raw text")) == ["Format", "ted."]
+    assert policy.stats.retries == 1
+
+    async def collect():
+        return [delta async for delta in client.format_text_stream_async("raw text")]
+
+    assert asyncio.run(collect()) == ["Format", "ted."]
+
+
+def test_scheduler_learns_limits_from_response_headers(stub_server):
+    stub_server.script = [("status", 429, {
+        "Retry-After": "0.2",
+        "x-ratelimit-limit-tokens": "6000",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "100ms",
+    })]
+    scheduler = RateLimitScheduler()
+    client = GroqClient("key", policy=_policy(), scheduler=scheduler)
+
+    assert client.format_text("raw text") == "Formatted."
+    assert scheduler.rate_limited == 1
+    assert scheduler.headroom()["tokens"]["limit"] == 6000.0
+
+    async def format_async():
+        return await client.format_text_async("other text")
+
+    stub_server.script = [("status", 429, {"Retry-After": "0.2"})]
+    assert asyncio.run(format_async()) == "Formatted."
+    assert scheduler.rate_limited == 2
+
+
+def test_no_hedge_until_enough_samples():
+    policy = RequestPolicy(hedge=True, hedge_min_samples=3)
+    assert policy.hedge_delay("format") is None
+    for seconds in (0.1, 0.2, 0.3):
+        policy.latency("format").record(seconds)
+    assert policy.hedge_delay("format") == 0.3
+    policy.configure(hedge=False)
+    assert policy.hedge_delay("format") is None
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RequestPolicy(backoff_base_seconds=0.5, backoff_max_seconds=2.0)
+    delays = [policy.backoff(5) for _ in range(200)]
+    assert all(0.0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 100
+
+
+def test_retry_classification():
+    assert is_retryable(AttemptTimeout("slow"))
+    assert is_retryable(MagicMock(spec=Exception, status_code=503))
+    assert not is_retryable(MagicMock(spec=Exception, status_code=401))
+    assert not is_retryable(ValueError("bad input"))
@@ -0,0 +1,285 @@
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio_encoding import WavStreamEncoder
+from src.segmented_transcription import (
+    SegmentedTranscriber,
+    SpeculativeTranscriber,
+    merge_overlap,
+    plan_segments,
+)
+
+RATE = 16000
+
+
+def _speech_with_pauses(seconds, pause_every=7.0, pause_len=0.4):
+    t = np.arange(int(seconds * RATE)) / RATE
+    signal = np.sin(2 * np.pi * 220.0 * t) * 6000.0
+    signal[(t % pause_every) > pause_every - pause_len] = 0
+    return signal.astype(np.int16)
+
+
+def _recording(samples):
+    encoder = WavStreamEncoder(RATE, initial_seconds=samples.shape[0] / RATE)
+    encoder.write(samples)
+    return encoder.finalize()
+
+
+class StubClient:
+    """Records each uploaded segment and answers after a fixed delay."""
+
+    def __init__(self, delay=0.0, texts=None):
+        self.delay = delay
+        self.texts = texts
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, prompt=None, cancel_token=None):
+        with wave.open(audio, "rb") as wf:
+            frames = wf.getnframes()
+        with self._lock:
+            index = len(self.calls)
+            self.calls.append(frames)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return self.texts[index] if self.texts else f"part{index}"
+
+
+def test_plan_segments_cuts_in_pauses_within_limit():
+    samples = _speech_with_pauses(40.0)
+
+    segments = plan_segments(samples, RATE, max_seconds=10.0)
+
+    assert segments[0].start == 0 and segments[-1].end == samples.shape[0]
+    for previous, following in zip(segments, segments[1:]):
+        assert previous.end == following.start
+        assert not previous.overlaps_next
+        # Each cut lands inside a pause.
+        assert not samples[previous.end - 100:previous.end + 100].any()
+    assert all(s.end - s.start <= 10 * RATE for s in segments)
+
+
+def test_plan_segments_overlaps_when_no_pause():
+    samples = _speech_with_pauses(25.0, pause_every=1000.0)
+
+    segments = plan_segments(samples, RATE, max_seconds=10.0, overlap_seconds=0.5)
+
+    assert len(segments) == 3
+    assert segments[0].overlaps_next
+    assert segments[0].end - segments[1].start == RATE // 2
+    assert all(s.end - s.start <= 10 * RATE for s in segments)
+
+
+def test_merge_overlap_drops_repeated_words():
+    assert merge_overlap("we should ship the", "Ship the release today.") == "we should ship the release today."
+    assert merge_overlap("hello there", "general kenobi") == "hello there general kenobi"
+    assert merge_overlap("", "only") == "only"
+
+
+def test_short_recording_is_one_call():
+    client = StubClient()
+    audio = _recording(_speech_with_pauses(5.0))
+
+    assert SegmentedTranscriber(client, max_segment_seconds=10).transcribe(audio) == "part0"
+    assert client.calls == [5 * RATE]
+
+
+def test_sources_without_pcm_pass_through():
+    client = StubClient()
+    client.transcribe = lambda audio, prompt=None, cancel_token=None: f"path:{audio}"
+
+    assert SegmentedTranscriber(client).transcribe("clip.wav") == "path:clip.wav"
+
+
+def test_segments_are_stitched_in_order():
+    class FrameCounting(StubClient):
+        # Earlier calls answer last, so completion order is reversed.
+        def transcribe(self, audio, prompt=None, cancel_token=None):
+            with wave.open(audio, "rb") as wf:
+                frames = wf.getnframes()
+            with self._lock:
+                self.calls.append(frames)
+                delay = 0.05 / len(self.calls)
+            time.sleep(delay)
+            return str(frames)
+
+    client = FrameCounting()
+    samples = _speech_with_pauses(40.0)
+
+    text = SegmentedTranscriber(client, max_segment_seconds=10, concurrency=4).transcribe(_recording(samples))
+
+    expected = [str(s.end - s.start) for s in plan_segments(samples, RATE, 10.0)]
+    assert text == " ".join(expected)
+    assert sum(client.calls) == 40 * RATE
+
+
+def test_segment_failure_propagates():
+    class Failing(StubClient):
+        def transcribe(self, audio, prompt=None, cancel_token=None):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        SegmentedTranscriber(Failing(), max_segment_seconds=10).transcribe(_recording(_speech_with_pauses(30.0)))
+
+
+@pytest.mark.parametrize("seconds", [20.0, 40.0, 80.0])
+def test_benchmark_wall_clock_scales_with_concurrency(seconds):
+    delay = 0.15
+    audio = _recording(_speech_with_pauses(seconds))
+
+    serial_client = StubClient(delay=delay)
+    start = time.perf_counter()
+    SegmentedTranscriber(serial_client, max_segment_seconds=10, concurrency=1).transcribe(audio)
+    serial = time.perf_counter() - start
+
+    parallel_client = StubClient(delay=delay)
+    start = time.perf_counter()
+    SegmentedTranscriber(parallel_client, max_segment_seconds=10, concurrency=16).transcribe(audio)
+    parallel = time.perf_counter() - start
+
+    segments = len(parallel_client.calls)
+    assert segments >= 2
+    assert serial >= segments * delay
+    # Segments are in flight together, so wall clock stays near one call.
+    assert parallel_client.peak > segments // 2
+    assert parallel < 2.5 * delay
+
+
+def test_cancel_token_stops_remaining_segments():
+    from src.cancellation import CancelToken
+
+    token = CancelToken()
+    client = StubClient()
+    real_transcribe = client.transcribe
+
+    def transcribe(audio, prompt=None, cancel_token=None):
+        assert cancel_token is token
+        token.cancel()
+        return real_transcribe(audio, prompt=prompt)
+
+    client.transcribe = transcribe
+    transcriber = SegmentedTranscriber(client, max_segment_seconds=10.0, concurrency=1)
+
+    with pytest.raises(Exception, match="cancelled"):
+        transcriber.transcribe(_recording(_speech_with_pauses(40.0)), cancel_token=token)
+    assert len(client.calls) == 1
+
+
+def test_cancelling_speculative_session_cancels_phrase_in_flight():
+    tokens = []
+    started = threading.Event()
+    client = StubClient()
+
+    def transcribe(audio, prompt=None, cancel_token=None):
+        tokens.append(cancel_token)
+        started.set()
+        time.sleep(0.05)
+        cancel_token.raise_if_cancelled()
+        return "late"
+
+    client.transcribe = transcribe
+    session = SpeculativeTranscriber(client, concurrency=1)
+    session.submit(_recording(_speech_with_pauses(2.0)))
+    started.wait(1)
+    session.cancel()
+
+    assert tokens == [session.cancel_token]
+    assert session.cancel_token.cancelled
+
+
+def test_speculative_joins_segments_before_tail():
+    client = StubClient()
+    client.transcribe = lambda audio, prompt=None, cancel_token=None: f"{audio.duration:g}s"
+    session = SpeculativeTranscriber(client, prompt="p", concurrency=1)
+    session.submit(_recording(_speech_with_pauses(2.0)))
+    session.submit(_recording(_speech_with_pauses(3.0)))
+
+    assert session.transcribe(_recording(_speech_with_pauses(1.0))) == "2s 3s 1s"
+    assert session.pending == 0
+
+
+def test_speculative_skips_empty_tail():
+    client = StubClient(texts=["only"])
+    session = SpeculativeTranscriber(client)
+    session.submit(_recording(_speech_with_pauses(2.0)))
+
+    empty = WavStreamEncoder(RATE, initial_seconds=0).finalize()
+    assert session.transcribe(empty) == "only"
+    assert len(client.calls) == 1
+
+
+class FlakyClient(StubClient):
+    """Fails the first upload of each recording whose length is in ``fail_seconds``."""
+
+    def __init__(self, fail_seconds):
+        super().__init__()
+        self.fail_frames = {int(seconds * RATE) for seconds in fail_seconds}
+
+    def transcribe(self, audio, prompt=None, cancel_token=None):
+        with wave.open(audio, "rb") as wf:
+            frames = wf.getnframes()
+        audio.seek(0)
+        with self._lock:
+            failing = frames in self.fail_frames
+            self.fail_frames.discard(frames)
+        if failing:
+            raise RuntimeError("upload failed")
+        return f"{frames / RATE:g}s"
+
+
+def test_speculative_retry_after_failed_tail_returns_every_phrase():
+    client = FlakyClient(fail_seconds=[1.0])
+    session = SpeculativeTranscriber(client, concurrency=1)
+    session.submit(_recording(_speech_with_pauses(2.0)))
+    session.submit(_recording(_speech_with_pauses(3.0)))
+
+    tail = _recording(_speech_with_pauses(1.0))
+    with pytest.raises(RuntimeError):
+        session.transcribe(tail)
+    assert session.transcribe(tail) == "2s 3s 1s"
+
+
+def test_speculative_retry_uploads_failed_phrase_again():
+    client = FlakyClient(fail_seconds=[2.0])
+    session = SpeculativeTranscriber(client, concurrency=1)
+    session.submit(_recording(_speech_with_pauses(2.0)))
+    session.submit(_recording(_speech_with_pauses(3.0)))
+
+    tail = _recording(_speech_with_pauses(1.0))
+    with pytest.raises(RuntimeError):
+        session.transcribe(tail)
+    assert session.transcribe(tail) == "2s 3s 1s"
+
+
+def test_benchmark_release_latency_of_long_dictation_matches_short_one():
+    delay = 0.2
+
+    def phrase():
+        return _recording(_speech_with_pauses(6.0))
+
+    short_client = StubClient(delay=delay)
+    start = time.perf_counter()
+    SpeculativeTranscriber(short_client).transcribe(phrase())
+    short = time.perf_counter() - start
+
+    # 60 s dictation: ten phrases were handed over while the key was held.
+    long_client = StubClient(delay=delay)
+    session = SpeculativeTranscriber(long_client, concurrency=4)
+    for _ in range(10):
+        session.submit(phrase())
+    time.sleep(3 * delay)  # user still talking
+    start = time.perf_counter()
+    session.transcribe(phrase())
+    long = time.perf_counter() - start
+
+    assert len(long_client.calls) == 11
+    assert long < short + delay
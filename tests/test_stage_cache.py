@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.audio_encoding import WavStreamEncoder
+from src.groq_client import GroqClient, GroqClientError
+from src.services.groq_service import TranscriptionWorker
+from src.stage_cache import StageCache, audio_digest, stage_key
+
+
+def _recording(seed=0):
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.random.default_rng(seed).integers(-2000, 2000, 1600).astype(np.int16))
+    return encoder.finalize()
+
+
+def _worker(client, audio, cache):
+    worker = TranscriptionWorker(client, audio, True, "fmt-model", stage_cache=cache)
+    results, errors = [], []
+    worker.finished.connect(lambda raw, final: results.append((raw, final)))
+    worker.error.connect(errors.append)
+    return worker, results, errors
+
+
+def test_lru_evicts_least_recently_used():
+    cache = StageCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.get(None) is None
+
+
+def test_digest_and_keys(tmp_path):
+    audio = _recording()
+    path = tmp_path / "clip.wav"
+    path.write_bytes(audio.getvalue())
+    assert audio_digest(audio) == audio_digest(str(path))
+    assert audio_digest(_recording(seed=1)) != audio_digest(audio)
+    assert audio_digest(MagicMock(spec=["read"])) is None
+    assert stage_key("format", "hi", "m") != stage_key("translate", "hi", "m")
+
+
+def test_retry_resumes_at_failed_formatter():
+    client = MagicMock(spec=GroqClient)
+    client.transcribe.return_value = "raw words"
+    client.format_text.side_effect = [GroqClientError("Formatting failed: 503"), "Formatted words."]
+    cache = StageCache()
+    audio = _recording()
+
+    worker, results, errors = _worker(client, audio, cache)
+    worker.run()
+    assert results == [] and errors == ["Formatting failed: 503"]
+
+    worker, results, errors = _worker(client, audio, cache)
+    worker.run()
+    assert results == [("raw words", "Formatted words.")]
+    client.transcribe.assert_called_once()
+    assert client.format_text.call_count == 2
+
+    # An identical re-submission is served entirely from the cache.
+    worker, results, _ = _worker(client, audio, cache)
+    worker.run()
+    assert results == [("raw words", "Formatted words.")]
+    assert (client.transcribe.call_count, client.format_text.call_count) == (1, 2)
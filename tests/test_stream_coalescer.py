@@ -0,0 +1,76 @@
+from src.stream_coalescer import StreamCoalescer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _coalescer(fps=50, clock=None):
+    answers, thoughts = [], []
+    coalescer = StreamCoalescer(
+        lambda first, last, text: answers.append((first, last, text)),
+        thoughts.append,
+        fps=fps,
+        clock=clock or _Clock(),
+    )
+    return coalescer, answers, thoughts
+
+
+def test_updates_within_a_frame_arrive_as_one_delivery(qtbot):
+    coalescer, answers, thoughts = _coalescer()
+
+    coalescer.push_thought("Checking sources.")
+    coalescer.push_thought("Comparing.")
+    for seq, delta in enumerate(["The ", "answer ", "is ", "42."], start=1):
+        coalescer.push_answer(seq, delta)
+    assert answers == [] and thoughts == []
+
+    qtbot.waitUntil(lambda: bool(answers), timeout=1000)
+
+    # Chunks keep their own boundaries; the marquee spaces them out.
+    assert thoughts == ["Checking sources.", "Comparing."]
+    assert answers == [(1, 4, "The answer is 42.")]
+    stats = coalescer.stats
+    assert (stats.updates, stats.deliveries, stats.merged, stats.max_batch) == (6, 1, 5, 6)
+
+
+def test_next_delivery_waits_for_the_frame_to_end(qtbot):
+    clock = _Clock()
+    coalescer, answers, _ = _coalescer(fps=50, clock=clock)
+
+    coalescer.push_answer(1, "one")
+    assert coalescer._timer.interval() == 0
+    coalescer.flush()
+    clock.now += 0.005
+    coalescer.push_answer(2, " two")
+
+    assert 10 <= coalescer._timer.interval() <= 15
+    qtbot.waitUntil(lambda: len(answers) == 2, timeout=1000)
+    assert answers == [(1, 1, "one"), (2, 2, " two")]
+
+
+def test_out_of_order_delta_is_not_merged_across_the_gap():
+    coalescer, answers, _ = _coalescer()
+
+    coalescer.push_answer(1, "a")
+    coalescer.push_answer(3, "c")
+    coalescer.flush()
+
+    assert answers == [(1, 1, "a"), (3, 3, "c")]
+
+
+def test_discard_drops_pending_updates_and_counts_them():
+    coalescer, answers, thoughts = _coalescer()
+
+    coalescer.push_thought("stale")
+    coalescer.push_answer(1, "stale answer")
+    coalescer.discard()
+    coalescer.flush()
+
+    assert answers == [] and thoughts == []
+    assert coalescer.reset_stats().dropped == 2
+    assert coalescer.stats.updates == 0
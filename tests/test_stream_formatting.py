@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+from src.groq_client import GroqClient
+from src.math_formatting import normalize_math_dictation
+from src.services.groq_service import TranscriptionWorker
+from src.stage_cache import StageCache
+from src.stream_formatting import IncrementalPaster, SentenceChunker
+
+
+def _feed_all(chunker, deltas):
+    chunks = []
+    for delta in deltas:
+        chunks.extend(chunker.feed(delta))
+    return chunks + chunker.flush()
+
+
+def test_chunker_emits_whole_sentences():
+    chunker = SentenceChunker()
+    assert chunker.feed("  Hello wor") == []
+    assert chunker.feed("ld. It costs 3") == ["Hello world. "]
+    assert chunker.feed(".5 dollars!\nNext") == ["It costs 3.5 dollars!\n"]
+    assert chunker.flush() == ["Next"]
+
+
+def test_math_normalization_never_sees_a_split_expression():
+    text = "Solve this. x plus y whole squared equals z. Done."
+    deltas = [text[i:i + 3] for i in range(0, len(text), 3)]
+
+    chunks = _feed_all(SentenceChunker(normalize_math_dictation), deltas)
+
+    assert chunks == ["Solve this. ", "(x + y)² = z. ", "Done."]
+    assert "".join(chunks) == "Solve this. " + normalize_math_dictation("x plus y whole squared equals z.") + " Done."
+
+
+def test_paster_spaces_pastes_and_joins_backlog():
+    now = [0.0]
+    timers = []
+    pasted = []
+    paster = IncrementalPaster(
+        lambda text: pasted.append(text) or True,
+        lambda ms, fn: timers.append((ms, fn)),
+        min_interval_ms=100,
+        clock=lambda: now[0],
+    )
+    paster.push("One. ")
+    paster.push("Two. ")
+    paster.push("Three.")
+    assert pasted == ["One. "]
+    assert timers[0][0] == 100
+
+    done = []
+    paster.finish(done.append)
+    assert done == []
+    now[0] = 0.1
+    timers.pop()[1]()
+    assert pasted == ["One. ", "Two. Three."]
+    assert done == [True]
+
+
+def test_paster_reports_failure():
+    paster = IncrementalPaster(lambda text: False, lambda ms, fn: None)
+    paster.push("One.")
+    done = []
+    paster.finish(done.append)
+    assert done == [False] and paster.pasted == ""
+
+
+def test_worker_streams_formatter_sentences_and_caches_result():
+    client = MagicMock(spec=GroqClient)
+    client.transcribe.return_value = "raw"
+    client.format_text_stream.side_effect = lambda *args, **kwargs: iter(["First sen", "tence. Second", " one."])
+    cache = StageCache()
+
+    def run():
+        worker = TranscriptionWorker(client, "a.wav", True, "fmt", stage_cache=cache, stream_format=True)
+        partial, finished = [], []
+        worker.partial_text.connect(partial.append)
+        worker.finished.connect(lambda raw, final: finished.append(final))
+        worker.run()
+        return partial, finished
+
+    assert run() == (["First sentence. ", "Second one."], ["First sentence. Second one."])
+    # A cache hit has nothing to stream: the controller pastes the final text.
+    assert run() == ([], ["First sentence. Second one."])
+    client.format_text_stream.assert_called_once()
+    client.format_text.assert_not_called()
+
+
+def test_paster_abort_drops_pending_text():
+    timers = []
+    pasted = []
+    paster = IncrementalPaster(
+        lambda text: pasted.append(text) or True,
+        lambda ms, fn: timers.append((ms, fn)),
+        min_interval_ms=100,
+        clock=lambda: 0.0,
+    )
+    paster.push("One. ")
+    paster.push("Two.")
+    done = []
+    paster.finish(done.append)
+    paster.abort()
+    timers.pop()[1]()
+    paster.push("Three.")
+    assert pasted == ["One. "] and done == [] and timers == []
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.audio_encoding import WavStreamEncoder
+from src.transcription_backends import (
+    BackendCapabilities,
+    BackendRouter,
+    GroqBackend,
+    OpenAICompatibleBackend,
+    TranscriptionBackend,
+    TranscriptionBackendError,
+)
+
+
+class _StubWhisperHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /v1/audio/transcriptions; /down/... always fails."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.server.lock:
+            self.server.requests.append((self.path, self.headers.get("Authorization"), body))
+        if self.path.startswith("/down/"):
+            return self._send(503, {"error": {"message": "model loading"}})
+        return self._send(200, {"text": "hello from the lan"})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubWhisperHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", httpd.requests
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _recording():
+    encoder = WavStreamEncoder(16000, initial_seconds=1)
+    encoder.write(np.arange(1600, dtype=np.int16))
+    return encoder.finalize()
+
+
+def test_openai_compatible_backend_posts_multipart(stub_url):
+    url, requests = stub_url
+    backend = OpenAICompatibleBackend(f"{url}/v1/", model_id="large-v3", api_key="lan-token")
+
+    assert backend.transcribe(_recording(), prompt="Proper nouns") == "hello from the lan"
+    assert asyncio.run(backend.transcribe_async(_recording())) == "hello from the lan"
+
+    path, auth, body = requests[0]
+    assert (path, auth) == ("/v1/audio/transcriptions", "Bearer lan-token")
+    assert b'name="model"\r\n\r\nlarge-v3' in body
+    assert b'name="prompt"\r\n\r\nProper nouns' in body
+    assert b"RIFF" in body
+    backend.close()
+
+
+def test_close_releases_the_async_client_on_its_loop(stub_url):
+    url, _ = stub_url
+    backend = OpenAICompatibleBackend(f"{url}/v1")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        future = asyncio.run_coroutine_threadsafe(backend.transcribe_async(_recording()), loop)
+        assert future.result(timeout=5) == "hello from the lan"
+        async_client = backend._async_client
+
+        backend.close()
+        deadline = time.monotonic() + 2
+        while not async_client.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert async_client.is_closed
+        assert backend._async_client is None
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1.0)
+        loop.close()
+
+
+def test_router_fails_over_and_cools_down_the_failed_backend(stub_url):
+    url, requests = stub_url
+    down = OpenAICompatibleBackend(f"{url}/down/v1", name="primary")
+    lan = OpenAICompatibleBackend(f"{url}/v1", name="lan")
+    router = BackendRouter([down, lan], cooldown_seconds=60)
+
+    assert router.transcribe(_recording()) == "hello from the lan"
+    assert router.stats.failovers == 1
+    assert router.stats.failover_seconds < 1.0
+
+    # The failed backend is tried last until its cool-down ends.
+    assert asyncio.run(router.transcribe_async(_recording())) == "hello from the lan"
+    assert [path.split("/")[1] for path, _, _ in requests] == ["down", "v1", "v1"]
+    assert router.stats.by_backend == {"lan": 2}
+    assert "2 transcriptions" in router.stats.summary()
+
+
+def test_router_raises_the_last_error_when_every_backend_fails(stub_url):
+    url, _ = stub_url
+    router = BackendRouter([OpenAICompatibleBackend(f"{url}/down/v1")])
+
+    with pytest.raises(TranscriptionBackendError) as excinfo:
+        router.transcribe(_recording())
+    assert excinfo.value.status_code == 503
+    assert router.stats.failovers == 0
+
+
+def test_router_stops_instead_of_failing_over_when_cancelled():
+    from src.cancellation import CancelToken, JobCancelled
+
+    token = CancelToken()
+
+    def cancel_midway(*args, **kwargs):
+        token.cancel()
+        raise TranscriptionBackendError("connection closed")
+
+    first = MagicMock(capabilities=BackendCapabilities())
+    first.name = "first"
+    first.transcribe.side_effect = cancel_midway
+    second = MagicMock(capabilities=BackendCapabilities())
+    second.name = "second"
+    router = BackendRouter([first, second])
+    audio = _recording()
+
+    with pytest.raises(JobCancelled):
+        router.transcribe(audio, cancel_token=token)
+
+    first.transcribe.assert_called_once_with(audio, prompt=None, cancel_token=token)
+    second.transcribe.assert_not_called()
+    assert router.stats.failovers == 0
+    # A cancelled job says nothing about the backend's health.
+    assert router.candidates(audio)[0] is first
+
+
+def test_router_skips_backends_that_cannot_take_the_recording():
+    wav_only = MagicMock(capabilities=BackendCapabilities(codecs=frozenset({"wav"})))
+    wav_only.name = "wav-only"
+    small = MagicMock(capabilities=BackendCapabilities(max_payload_bytes=10))
+    small.name = "small"
+    anything = MagicMock(capabilities=BackendCapabilities())
+    anything.name = "anything"
+    router = BackendRouter([wav_only, small, anything])
+
+    audio = _recording()
+    audio.codec = "opus"
+    assert router.candidates(audio) == [anything]
+    audio.codec = "wav"
+    assert router.candidates(audio) == [wav_only, anything]
+
+    with pytest.raises(TranscriptionBackendError):
+        BackendRouter([small]).candidates(_recording())
+    assert router.capabilities.max_payload_bytes == 25 * 1024 * 1024
+
+
+def test_selection_overhead_is_negligible():
+    backends = []
+    for index in range(4):
+        backend = MagicMock(capabilities=BackendCapabilities())
+        backend.name = f"backend-{index}"
+        backend.transcribe.return_value = "text"
+        backends.append(backend)
+    router = BackendRouter(backends)
+    audio = _recording()
+
+    started = time.perf_counter()
+    for _ in range(200):
+        router.transcribe(audio)
+    elapsed = time.perf_counter() - started
+
+    assert router.stats.selection_seconds / router.stats.requests < 0.001
+    assert elapsed < 1.0
+
+
+def test_groq_backend_uses_configured_model():
+    client = MagicMock()
+    client.transcribe.return_value = "groq text"
+    backend = GroqBackend(client, "whisper-large-v3-turbo")
+
+    assert isinstance(backend, TranscriptionBackend)
+    assert backend.transcribe("clip.wav", prompt="p") == "groq text"
+    client.transcribe.assert_called_once_with("clip.wav", "whisper-large-v3-turbo", prompt="p", cancel_token=None)
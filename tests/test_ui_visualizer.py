@@ -352,6 +352,58 @@ def test_streaming_answer_normalizes_malformed_bold_spacing(app, qtbot):
     assert "**" not in vis._answer_label.text()
 
 
+def test_streaming_answer_deltas_split_like_the_full_text(app, qtbot):
+    vis = AudioVisualizer()
+    qtbot.addWidget(vis)
+    vis.show()
+    vis.set_stream_realtime_enabled(False)
+    deltas = ["  Par", "is is", " the cap", "ital", " of\n", "France. ", "**Bold", "** end"]
+
+    vis.begin_streaming_answer()
+    for seq, delta in enumerate(deltas, start=1):
+        assert vis.append_streaming_answer(delta, seq=seq) is True
+
+    full = "".join(deltas)
+    assert vis._streaming_arrived_segments == AudioVisualizer._split_streaming_segments(full)
+    assert vis._streaming_arrived_text() == full
+
+
+def test_streaming_answer_delta_gap_asks_for_resync(app, qtbot):
+    vis = AudioVisualizer()
+    qtbot.addWidget(vis)
+    vis.show()
+    vis.set_stream_realtime_enabled(False)
+
+    vis.begin_streaming_answer()
+    assert vis.append_streaming_answer("Hello", seq=1) is True
+    assert vis.append_streaming_answer(" there", seq=3) is False
+    assert vis._streaming_arrived_text() == "Hello"
+
+    vis.update_streaming_answer("Hello big there", seq=3)
+    assert vis.append_streaming_answer(" there", seq=3) is True  # already included
+    assert vis.append_streaming_answer(" friend", seq=4) is True
+    assert vis.append_streaming_answer(" and you", seq=5, last_seq=6) is True
+    assert vis.append_streaming_answer(" again", seq=6) is True  # already included
+    vis._tick_streaming_answer_frame()
+
+    assert vis._streaming_arrived_text() == "Hello big there friend and you"
+    assert vis._streaming_arrived_segments == ["Hello ", "big ", "there ", "friend ", "and ", "you"]
+
+
+def test_streaming_benchmark_modes_arrive_at_the_same_answer(app, qtbot):
+    from scripts.streaming_benchmark import answer_chunks, replay
+
+    chunks = answer_chunks(words=300, chunk_words=3)
+    reports = []
+    for mode in ("full", "delta"):
+        vis = AudioVisualizer()
+        qtbot.addWidget(vis)
+        reports.append(replay(chunks, mode, vis, frame_every=10))
+
+    assert [report["chunks"] for report in reports] == [len(chunks), len(chunks)]
+    assert reports[0]["arrived_text"] == reports[1]["arrived_text"] == "".join(chunks)
+
+
 def test_streaming_answer_dismiss_ignores_future_updates(app, qtbot):
     vis = AudioVisualizer()
     qtbot.addWidget(vis)
@@ -15,6 +15,7 @@ for pkg in (
     "google.genai",
     "openai",
     "numpy",
+    "soundfile",
     "pyperclip",
 ):
     try: